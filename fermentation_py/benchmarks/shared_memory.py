@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Worker memory benchmark.
+
+Forks worker processes the way a pre-forking server does. Each worker loads
+the predictor from the same model directory and answers one prediction of
+every target. This runs once with the full (unpickled) models and once with
+the shared, memory-mapped compact models. Reports each worker's private memory
+(USS) and proportional set size (PSS) from /proc/<pid>/smaps_rollup, so Linux
+only.
+
+    python benchmarks/shared_memory.py --workers 8 --model-dir models
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.predictor import FermentationPredictor  # noqa: E402  (imported before forking, like a server)
+
+QUERIES = [
+    {'temperature': 15.0, 'yeast_concentration': 0.1},
+    {'fermentation_time': 20.0, 'yeast_concentration': 0.1},
+    {'fermentation_time': 20.0, 'temperature': 20.0}
+]
+
+def memory_kb() -> dict:
+    """USS and PSS of this process in kB."""
+    fields = {}
+    for line in Path('/proc/self/smaps_rollup').read_text().splitlines()[1:]:
+        name, value = line.split(':', 1)
+        fields[name] = int(value.split()[0])
+    return {'uss': fields['Private_Clean'] + fields['Private_Dirty'], 'pss': fields['Pss']}
+
+def worker(data_path: str, model_dir: str, shared: bool, loaded, release, results):
+    predictor = FermentationPredictor(data_path, model_dir, shared_models=shared)
+    for query in QUERIES:
+        predictor.predict(**query)
+    loaded.wait()   # Measure once all workers are up, so shared pages are split
+    results.put(memory_kb())
+    release.wait()
+
+def measure(data_path: str, model_dir: str, shared: bool, n_workers: int) -> list:
+    context = multiprocessing.get_context('fork')
+    loaded, release = context.Barrier(n_workers), context.Barrier(n_workers + 1)
+    results = context.Queue()
+    processes = [context.Process(target=worker,
+                                 args=(data_path, model_dir, shared, loaded, release, results))
+                 for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+    usage = [results.get() for _ in processes]
+    release.wait()
+    for process in processes:
+        process.join()
+    return usage
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-worker memory')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes')
+    parser.add_argument('--data-path', type=str, default=str(ROOT / 'data' / 'fermentation_analysis.csv'))
+    parser.add_argument('--model-dir', type=str, default=None,
+                        help='Trained model directory (trained into a temporary one if omitted)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = args.model_dir
+        if model_dir is None:
+            model_dir = str(Path(tmp) / 'models')
+            print(f"Training models into {model_dir}...")
+            subprocess.run([sys.executable, 'main.py', '--train', '--model-dir', model_dir,
+                            '--data-path', args.data_path],
+                           cwd=ROOT, check=True, capture_output=True)
+
+        print(f"{'models':<8} {'workers':>7} {'USS/worker':>11} {'PSS/worker':>11} {'PSS total':>10}")
+        for shared in (False, True):
+            usage = measure(args.data_path, model_dir, shared, args.workers)
+            uss = statistics.median(u['uss'] for u in usage) / 1024
+            pss = statistics.median(u['pss'] for u in usage) / 1024
+            total = sum(u['pss'] for u in usage) / 1024
+            print(f"{'shared' if shared else 'full':<8} {args.workers:>7} {uss:>9.1f}MB "
+                  f"{pss:>9.1f}MB {total:>8.1f}MB")
+
+if __name__ == "__main__":
+    main()
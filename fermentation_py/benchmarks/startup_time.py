@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark.
+
+Runs main.py the way station scripts do, one fresh interpreter per call, and
+reports wall times for --help, a single prediction through the compact path
+and the same prediction with the full models (--no-compact). Also lists which
+heavy libraries each scenario imported.
+
+    python benchmarks/startup_time.py --repeat 10 --model-dir models
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'joblib')
+
+SCENARIOS = {
+    'help': ['--help'],
+    'predict (compact)': ['--temp', '15', '--yeast', '0.1'],
+    'predict (full)': ['--temp', '15', '--yeast', '0.1', '--no-compact']
+}
+
+# Runs main() in-process, then prints which heavy modules got imported
+PROBE = (
+    "import sys, runpy; sys.argv = ['main.py'] + sys.argv[1:]\n"
+    "try:\n"
+    "    runpy.run_path('main.py', run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    f"print('LOADED', [m for m in {HEAVY_MODULES!r} if m in sys.modules], file=sys.stderr)\n"
+)
+
+def run(args, model_dir: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', *args, '--model-dir', model_dir],
+                   cwd=ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def loaded_modules(args, model_dir: str) -> str:
+    result = subprocess.run([sys.executable, '-c', PROBE, *args, '--model-dir', model_dir],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    lines = [line for line in result.stderr.splitlines() if line.startswith('LOADED')]
+    return lines[-1][len('LOADED '):] if lines else '?'
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup time')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per scenario')
+    parser.add_argument('--model-dir', type=str, default=None,
+                        help='Trained model directory (trained into a temporary one if omitted)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = args.model_dir
+        if model_dir is None:
+            model_dir = str(Path(tmp) / 'models')
+            print(f"Training models into {model_dir}...")
+            subprocess.run([sys.executable, 'main.py', '--train', '--model-dir', model_dir],
+                           cwd=ROOT, check=True, capture_output=True)
+
+        print(f"{'scenario':<20} {'median':>8} {'min':>8}  heavy imports")
+        for name, scenario in SCENARIOS.items():
+            times = [run(scenario, model_dir) for _ in range(args.repeat)]
+            print(f"{name:<20} {statistics.median(times):>7.3f}s {min(times):>7.3f}s  "
+                  f"{loaded_modules(scenario, model_dir)}")
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,12 @@ import argparse
 import sys
 import logging
 from pathlib import Path
+from typing import Optional
 import json
 
-from src.predictor import FermentationPredictor
+# The predictor pulls in pandas and scikit-learn, so it is imported only once
+# an action needs it: --help, --data-summary and compact single predictions
+# never load them
 
 def setup_logging(verbose: bool = False):
     """Setup logging configuration."""
@@ -44,6 +47,12 @@ Examples:
   
   # Show model performance
   python main.py --performance
+  
+  # Fill a temperature x yeast table of fermentation times
+  python main.py --sweep --temp-range 2 35 0.5 --yeast-range 0.005 0.5 0.005 --output times.csv
+  
+  # Retrain in the background whenever the data file changes
+  python main.py --watch --debounce 60
         """
     )
     
@@ -62,6 +71,30 @@ Examples:
                        help='Show model performance metrics')
     parser.add_argument('--data-summary', action='store_true',
                        help='Show summary of training data')
+    parser.add_argument('--sweep', action='store_true',
+                       help='Predict over the full grid of two parameter ranges')
+    parser.add_argument('--watch', action='store_true',
+                       help='Retrain in the background whenever the data file changes')
+    
+    # Sweep parameters
+    parser.add_argument('--temp-range', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                       help='Temperature range for --sweep')
+    parser.add_argument('--yeast-range', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                       help='Yeast concentration range for --sweep')
+    parser.add_argument('--time-range', type=float, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                       help='Fermentation time range for --sweep')
+    parser.add_argument('--output', type=str, default='sweep.csv',
+                       help='Sweep output file (.csv wide table or .npz)')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                       help='Grid cells predicted at once during --sweep')
+    
+    # Watch parameters
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                       help='Seconds between data file checks during --watch')
+    parser.add_argument('--debounce', type=float, default=30.0,
+                       help='Seconds the data file must stay unchanged before retraining')
+    parser.add_argument('--max-rmse-increase', type=float, default=0.25,
+                       help='Reject retrained models whose RMSE is worse by more than this fraction')
     
     # Configuration parameters
     parser.add_argument('--data-path', type=str, 
@@ -73,6 +106,15 @@ Examples:
     parser.add_argument('--output-format', choices=['text', 'json'], 
                        default='text',
                        help='Output format')
+    parser.add_argument('--inverse-mode', choices=['model', 'inversion'],
+                       default='model',
+                       help='Predict temperature/yeast with inverse models or by inverting the time model')
+    parser.add_argument('--surrogate-tolerance', type=float, default=None,
+                       help='Serve lookup-table surrogates whose relative error bound is within this')
+    parser.add_argument('--aggregate-duplicates', action='store_true',
+                       help='Train on distinct input settings weighted by their counts')
+    parser.add_argument('--no-compact', dest='compact', action='store_false',
+                       help='Always load the full models, even for single predictions')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
     
@@ -100,6 +142,10 @@ def format_prediction_output(result: dict, output_format: str) -> str:
         ci_low, ci_high = result['confidence_interval']
         lines.append(f"Confidence Interval: [{ci_low:.2f}, {ci_high:.2f}] {unit}")
     
+    if result.get('extrapolation'):
+        lines.append("⚠️  Inputs are far from any training observation; "
+                     "prediction is an extrapolation")
+    
     # Input parameters
     lines.append("\nInput Parameters:")
     for key, value in result.items():
@@ -117,6 +163,8 @@ def format_performance_output(performance: dict, output_format: str) -> str:
     if output_format == 'json':
         return json.dumps(performance, indent=2)
     
+    from src.validator import selection_rmse
+    
     # Text format
     lines = []
     lines.append("📊 MODEL PERFORMANCE METRICS")
@@ -126,12 +174,14 @@ def format_performance_output(performance: dict, output_format: str) -> str:
         lines.append(f"\n{target.upper()} PREDICTION:")
         lines.append("-" * 30)
         
-        # Sort models by RMSE
-        sorted_models = sorted(models.items(), key=lambda x: x[1]['rmse'])
+        # Sort models by cross-validated RMSE, as they are selected
+        sorted_models = sorted(models.items(), key=lambda x: selection_rmse(x[1]))
         
         for model_name, metrics in sorted_models:
             lines.append(f"\n{model_name}:")
             lines.append(f"  RMSE: {metrics['rmse']:.4f}")
+            if 'cv_rmse' in metrics:
+                lines.append(f"  CV-RMSE: {metrics['cv_rmse']:.4f}")
             lines.append(f"  R²:   {metrics['r2']:.4f}")
             lines.append(f"  MAE:  {metrics['mae']:.4f}")
         
@@ -165,6 +215,38 @@ def format_data_summary(summary: dict, output_format: str) -> str:
     
     return "\n".join(lines)
 
+def format_retrain_record(record: dict, output_format: str) -> str:
+    """Format the outcome of a background retrain."""
+    if output_format == 'json':
+        return json.dumps(record, default=str)
+    
+    icon = {'published': '✅', 'rejected': '⚠️ ', 'failed': '❌'}[record['outcome']]
+    return (f"{icon} Retrain {record['outcome']} after {record['duration_s']:.1f}s "
+            f"(model version {record['model_version']}): {record['reason']}")
+
+def compact_prediction(args) -> Optional[dict]:
+    """Single prediction from the compact model artifact, or None if it can't serve it.
+    
+    Uses only NumPy, so it skips the pandas and scikit-learn imports and the
+    model unpickling that dominate the full predictor's startup.
+    """
+    from src.compact import CompactPredictor
+    
+    inputs = {
+        'temperature': args.temperature,
+        'yeast_concentration': args.yeast_concentration,
+        'fermentation_time': args.fermentation_time
+    }
+    try:
+        predictor = CompactPredictor(args.model_dir, inverse_mode=args.inverse_mode,
+                                     surrogate_tolerance=args.surrogate_tolerance)
+    except FileNotFoundError:
+        return None
+    
+    if not predictor.can_predict(CompactPredictor.target_for(**inputs)):
+        return None
+    return predictor.predict(**inputs)
+
 def main():
     """Main entry point."""
     parser = create_parser()
@@ -180,11 +262,50 @@ def main():
         print("Please ensure the fermentation data CSV file exists.")
         sys.exit(1)
     
+    # Count provided parameters
+    params_provided = sum([
+        args.temperature is not None,
+        args.yeast_concentration is not None,
+        args.fermentation_time is not None
+    ])
+    
+    # Single predictions from the compact artifact when it covers the target
+    single_prediction = params_provided == 2 and not (
+        args.train or args.performance or args.data_summary or args.sweep or args.watch
+    )
+    if single_prediction and args.compact:
+        try:
+            result = compact_prediction(args)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        if result is not None:
+            print("🔮 Making prediction...")
+            print(format_prediction_output(result, args.output_format))
+            return
+    
+    # The data summary needs no models, so it is read with the NumPy-only loader
+    if args.data_summary and not (args.train or args.watch or args.performance):
+        from src.data_loader import FermentationDataLoader
+        
+        try:
+            summary = FermentationDataLoader(str(data_path), engine='numpy').get_data_summary()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print(format_data_summary(summary, args.output_format))
+        return
+    
+    from src.predictor import FermentationPredictor
+    
     # Initialize predictor
     try:
         predictor = FermentationPredictor(
             data_path=str(data_path),
-            model_dir=args.model_dir
+            model_dir=args.model_dir,
+            inverse_mode=args.inverse_mode,
+            surrogate_tolerance=args.surrogate_tolerance,
+            aggregate_training=args.aggregate_duplicates
         )
     except Exception as e:
         print(f"❌ Error initializing predictor: {e}")
@@ -198,6 +319,22 @@ def main():
             print("✅ Models trained successfully!")
             return
         
+        if args.watch:
+            from src.watcher import RetrainWatcher
+            
+            watcher = RetrainWatcher(
+                predictor, poll_interval=args.poll_interval, debounce=args.debounce,
+                max_rmse_increase=args.max_rmse_increase,
+                on_retrain=lambda record: print(format_retrain_record(record, args.output_format),
+                                                flush=True)
+            )
+            print(f"👀 Watching {data_path} for changes (Ctrl+C to stop)...", flush=True)
+            try:
+                watcher.run()
+            except KeyboardInterrupt:
+                watcher.stop(wait=False)
+            return
+        
         if args.performance:
             print("📊 Calculating model performance...")
             performance = predictor.get_model_performance()
@@ -211,16 +348,33 @@ def main():
             print(output)
             return
         
-        # Count provided parameters
-        params_provided = sum([
-            args.temperature is not None,
-            args.yeast_concentration is not None,
-            args.fermentation_time is not None
-        ])
+        if args.sweep:
+            from src.sweep import parameter_grid
+            
+            ranges = {
+                parameter: parameter_grid(*bounds)
+                for parameter, bounds in [('temperature', args.temp_range),
+                                          ('yeast_concentration', args.yeast_range),
+                                          ('fermentation_time', args.time_range)]
+                if bounds is not None
+            }
+            if len(ranges) != 2:
+                print("❌ Error: --sweep needs exactly 2 of --temp-range, --yeast-range, --time-range")
+                sys.exit(1)
+            
+            sweep = predictor.grid_sweep(chunk_size=args.chunk_size, **ranges)
+            print(f"🧮 Sweeping {sweep.shape[0]} x {sweep.shape[1]} grid for "
+                  f"{sweep.predicted_parameter.replace('_', ' ')}...")
+            if Path(args.output).suffix == '.npz':
+                sweep.to_npz(args.output)
+            else:
+                sweep.to_csv(args.output)
+            print(f"✅ Saved to {args.output}")
+            return
         
         if params_provided == 0:
             print("❌ Error: No action specified.")
-            print("Provide 2 parameters for prediction, or use --train, --performance, or --data-summary")
+            print("Provide 2 parameters for prediction, or use --train, --performance, --data-summary, --sweep or --watch")
             parser.print_help()
             sys.exit(1)
         
@@ -0,0 +1,79 @@
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Single-file container of named arrays that can be memory-mapped as a whole.
+# Layout: magic, header length (uint64), JSON header of dtype/shape/offset per
+# array, then the raw arrays, each aligned to ALIGNMENT bytes.
+MAGIC = b'NPARENA1'
+ALIGNMENT = 64
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def save_arena(path: str, arrays: Dict[str, np.ndarray]) -> Path:
+    """Write named arrays into one arena file.
+
+    The file is written next to its destination and renamed into place, so
+    processes that have the previous file mapped keep their (unchanged) view.
+
+    Args:
+        path: Destination file
+        arrays: Arrays by name; object arrays are not supported
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    contiguous = {key: np.asarray(value, order='C') for key, value in arrays.items()}
+
+    index, offset = {}, 0
+    for key, value in contiguous.items():
+        if value.dtype.hasobject:
+            raise TypeError(f"Cannot store object array {key!r} in an arena")
+        index[key] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+        offset = _align(offset + value.nbytes)
+    header = json.dumps(index).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for key, value in contiguous.items():
+            f.seek(data_start + index[key]['offset'])
+            f.write(value.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return path
+
+def load_arena(path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Read-only arrays of an arena file.
+
+    With ``mmap`` the arrays are views into one read-only memory map of the
+    file, so the pages are shared by every process that loads the same file
+    and nothing is read until it is used.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an array arena: {path}")
+        header_length = int.from_bytes(f.read(8), 'little')
+        index = json.loads(f.read(header_length))
+    data_start = _align(len(MAGIC) + 8 + header_length)
+
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+        buffer.flags.writeable = False
+    return {
+        key: np.ndarray(tuple(entry['shape']), dtype=np.dtype(entry['dtype']), buffer=buffer,
+                        offset=data_start + entry['offset'])
+        for key, entry in index.items()
+    }
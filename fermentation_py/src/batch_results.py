@@ -0,0 +1,176 @@
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+import logging
+
+from .input_validation import FLAG_EXTRAPOLATION, PREDICTION_TARGETS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Target ids stored per row; -1 marks rows without a prediction
+TARGETS = tuple(PREDICTION_TARGETS)
+
+class PredictionBatch:
+    """Columnar results of a batch prediction.
+
+    Each field is one array over all rows instead of one dict per row:
+    float32 ``value``, ``lower``, ``upper`` and ``distance``, int8 ``target``
+    (index into ``TARGETS``) and ``flags``, and int16 ``model`` (index into
+    ``model_names``). Input columns are kept as given and error messages only
+    for failed rows.
+
+    ``to_frame`` wraps the arrays in a DataFrame without copying them, and
+    ``result`` builds the single-prediction dict for one row on demand.
+    """
+
+    def __init__(self, inputs: Dict[str, np.ndarray], flags: Optional[np.ndarray] = None,
+                 index: Optional['pd.Index'] = None):
+        n_rows = len(next(iter(inputs.values()))) if inputs else 0
+        self.inputs = inputs
+        if index is None:
+            import pandas as pd
+            index = pd.RangeIndex(n_rows)
+        self.index = index
+        self.target = np.full(n_rows, -1, dtype=np.int8)
+        self.value = np.full(n_rows, np.nan, dtype=np.float32)
+        self.lower = np.full(n_rows, np.nan, dtype=np.float32)
+        self.upper = np.full(n_rows, np.nan, dtype=np.float32)
+        self.distance = np.full(n_rows, np.nan, dtype=np.float32)
+        self.model = np.full(n_rows, -1, dtype=np.int16)
+        self.flags = flags if flags is not None else np.zeros(n_rows, dtype=np.int8)
+        self.model_names: List[str] = []
+        self.errors: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    @classmethod
+    def concat(cls, batches: List['PredictionBatch']) -> 'PredictionBatch':
+        """Join batches of consecutive rows, merging their model ids and errors."""
+        batches = list(batches)
+        if not batches:
+            return cls({})
+        columns = batches[0].inputs.keys()
+        merged = cls({column: np.concatenate([b.inputs[column] for b in batches])
+                      for column in columns},
+                     np.concatenate([b.flags for b in batches]),
+                     batches[0].index.append([b.index for b in batches[1:]]))
+
+        offset = 0
+        for batch in batches:
+            rows = slice(offset, offset + len(batch))
+            merged.target[rows] = batch.target
+            merged.value[rows], merged.lower[rows], merged.upper[rows] = \
+                batch.value, batch.lower, batch.upper
+            merged.distance[rows] = batch.distance
+
+            # Translate model ids into the merged name list (-1 stays -1)
+            for name in batch.model_names:
+                if name not in merged.model_names:
+                    merged.model_names.append(name)
+            ids = np.array([merged.model_names.index(n) for n in batch.model_names] + [-1],
+                           dtype=np.int16)
+            merged.model[rows] = ids[batch.model]
+
+            merged.errors.update((row + offset, message) for row, message in batch.errors.items())
+            offset += len(batch)
+        return merged
+
+    def set_predictions(self, rows: np.ndarray, target: str, values: np.ndarray,
+                        lower: np.ndarray, upper: np.ndarray, model_name: str):
+        """Store predictions of one target for the given row positions."""
+        if model_name not in self.model_names:
+            self.model_names.append(model_name)
+        self.target[rows] = TARGETS.index(target)
+        self.value[rows] = values
+        self.lower[rows] = lower
+        self.upper[rows] = upper
+        self.model[rows] = self.model_names.index(model_name)
+
+    def set_error(self, rows: np.ndarray, message: str):
+        """Record an error for the given row positions."""
+        for row in np.atleast_1d(rows):
+            self.errors[int(row)] = message
+
+    @property
+    def failed(self) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        mask[list(self.errors)] = True
+        return mask
+
+    def _categorical(self, codes: np.ndarray, categories: List[str]) -> 'pd.Categorical':
+        import pandas as pd
+        return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+
+    def to_frame(self, interval_tuples: bool = False) -> 'pd.DataFrame':
+        """DataFrame view of the results.
+
+        Numeric columns share memory with the batch; parameter, unit and model
+        columns are categoricals over the stored ids.
+
+        Args:
+            interval_tuples: Return intervals as a single ``confidence_interval``
+                column of (lower, upper) tuples instead of ``confidence_lower``
+                and ``confidence_upper``; this builds one Python tuple per row
+        """
+        columns = {
+            'row_index': self.index,
+            'predicted_parameter': self._categorical(
+                self.target, [PREDICTION_TARGETS[t][0] for t in TARGETS]),
+            'predicted_value': self.value,
+            'unit': self._categorical(self.target, [PREDICTION_TARGETS[t][1] for t in TARGETS])
+        }
+        if interval_tuples:
+            columns['confidence_interval'] = list(zip(self.lower.tolist(), self.upper.tolist()))
+        else:
+            columns['confidence_lower'] = self.lower
+            columns['confidence_upper'] = self.upper
+        for parameter, values in self.inputs.items():
+            columns[f'input_{parameter}'] = values
+
+        errors = np.full(len(self), None, dtype=object)
+        for row, message in self.errors.items():
+            errors[row] = message
+
+        columns.update({
+            'model_used': self._categorical(self.model, self.model_names),
+            'distance_to_nearest_observation': self.distance,
+            'extrapolation': (self.flags & FLAG_EXTRAPOLATION) != 0,
+            'input_flags': self.flags,
+            'error': errors
+        })
+        import pandas as pd
+        return pd.DataFrame(columns, copy=False)
+
+    def result(self, row: int) -> Dict[str, Any]:
+        """Single-prediction dict for one row, in the schema of ``predict``."""
+        if row in self.errors:
+            return {'row_index': self.index[row], 'error': self.errors[row]}
+        if self.target[row] < 0:
+            raise ValueError(f"No prediction for row {row}")
+
+        target = TARGETS[self.target[row]]
+        parameter, unit, input_columns, _ = PREDICTION_TARGETS[target]
+        distance = float(self.distance[row])
+
+        result = {
+            'predicted_parameter': parameter,
+            'predicted_value': float(self.value[row]),
+            'unit': unit,
+            'confidence_interval': (float(self.lower[row]), float(self.upper[row]))
+        }
+        for column in input_columns:
+            result[f'input_{column}'] = float(self.inputs[column][row])
+        result.update({
+            'model_used': self.model_names[self.model[row]],
+            'distance_to_nearest_observation': None if np.isnan(distance) else distance,
+            'extrapolation': bool(self.flags[row] & FLAG_EXTRAPOLATION)
+        })
+        return result
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over per-row dicts, converting lazily."""
+        for row in range(len(self)):
+            yield self.result(row)
@@ -0,0 +1,261 @@
+import numpy as np
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+from .input_validation import PREDICTION_TARGETS
+
+logger = logging.getLogger(__name__)
+
+# Quantization step of each input. Inputs are snapped to these before
+# prediction, so every input in a cell gets the same (cached) answer.
+CACHE_RESOLUTIONS = {
+    'temperature': 0.01,
+    'yeast_concentration': 1e-5,
+    'fermentation_time': 0.01
+}
+
+TARGET_IDS = {target: i for i, target in enumerate(PREDICTION_TARGETS)}
+
+# Keys pack the target id and two quantized inputs into one int64
+_INPUT_BITS = 30
+_INPUT_LIMIT = 1 << (_INPUT_BITS - 1)
+_INPUT_MASK = (1 << _INPUT_BITS) - 1
+
+# Approximate bytes per entry: the int64 key and six float64/int64 columns,
+# int16 model id and bool flag, plus the key dict's slot and int objects
+ENTRY_BYTES = 7 * 8 + 2 + 1 + 96
+
+# Batches up to this size are looked up in the key dict instead of the sorted index
+_DICT_LOOKUP_ROWS = 16
+
+class PredictionCache:
+    """Bounded cache of predictions keyed by target, quantized inputs and model version.
+
+    Entries live in preallocated NumPy columns (value, interval bounds,
+    distance, extrapolation flag, model id), sized to fit ``max_bytes``. A
+    dict maps packed int64 keys to slots for single lookups; batches are
+    looked up with ``searchsorted`` on a sorted copy of the keys, rebuilt
+    only after the cache changed.
+
+    When full, the least recently used eighth of the entries is evicted at
+    once. With ``ttl`` set, entries older than ``ttl`` seconds count as
+    misses. Entries belong to one model version: a newer version clears the
+    cache, and lookups or stores for an older one are ignored, so threads
+    still predicting with a replaced model cannot mix in stale entries.
+    Public methods are safe to call from several threads.
+    """
+
+    def __init__(self, max_bytes: int = 32 << 20, ttl: Optional[float] = None,
+                 resolutions: Optional[Dict[str, float]] = None):
+        if max_bytes < ENTRY_BYTES:
+            raise ValueError(f"Cache budget must hold at least one entry ({ENTRY_BYTES} bytes)")
+        self.max_bytes = max_bytes
+        self.capacity = max_bytes // ENTRY_BYTES
+        self.ttl = ttl
+        self.resolutions = dict(CACHE_RESOLUTIONS, **(resolutions or {}))
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        n = self.capacity
+        self.keys = np.zeros(n, dtype=np.int64)
+        self.values = np.zeros(n, dtype=np.float64)
+        self.lower = np.zeros(n, dtype=np.float64)
+        self.upper = np.zeros(n, dtype=np.float64)
+        self.distance = np.zeros(n, dtype=np.float64)
+        self.extrapolation = np.zeros(n, dtype=bool)
+        self.model = np.zeros(n, dtype=np.int16)
+        self.inserted = np.zeros(n, dtype=np.float64)
+        self.last_used = np.zeros(n, dtype=np.int64)
+        self.model_names = []
+        self._slots: Dict[int, int] = {}
+        self._size = 0
+        self._tick = 0
+        self._index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._size * ENTRY_BYTES
+
+    def check_version(self, version) -> bool:
+        """Move to a newer model version, clearing the cache.
+
+        Returns:
+            Whether entries of ``version`` may be used (False for an older version)
+        """
+        with self._lock:
+            if self.version is None or version > self.version:
+                if self._size:
+                    logger.info(f"Model version changed, dropping {self._size} cached predictions")
+                self.clear()
+                self.version = version
+            return version == self.version
+
+    def quantize(self, target: str, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Snap inputs to the cache grid.
+
+        Args:
+            target: Prediction target
+            X: Inputs in the target's feature order
+
+        Returns:
+            Tuple of snapped inputs, packed keys and a mask of cacheable rows
+            (finite inputs within the packable range)
+        """
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        steps = np.array([self.resolutions[c] for c in PREDICTION_TARGETS[target][2]])
+        with np.errstate(invalid='ignore'):
+            scaled = np.rint(X / steps)
+            cacheable = np.isfinite(scaled).all(axis=1) & (np.abs(scaled) < _INPUT_LIMIT).all(axis=1)
+        q = np.where(cacheable[:, None], scaled, 0).astype(np.int64) & _INPUT_MASK
+        keys = (TARGET_IDS[target] << (2 * _INPUT_BITS)) | (q[:, 0] << _INPUT_BITS) | q[:, 1]
+        snapped = np.where(cacheable[:, None], scaled * steps, X)
+        return snapped, keys, cacheable
+
+    def lookup(self, keys: np.ndarray, cacheable: Optional[np.ndarray] = None,
+               version=None) -> np.ndarray:
+        """Slots of cached entries for each key, -1 for misses. Updates counters.
+
+        Slots are only stable until the next store; use ``fetch`` to read
+        entries while other threads use the cache.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        with self._lock:
+            if self._size == 0 or (version is not None and not self.check_version(version)):
+                slots = np.full(len(keys), -1, dtype=np.intp)
+            elif len(keys) <= _DICT_LOOKUP_ROWS:
+                slots = np.array([self._slots.get(key, -1) for key in keys.tolist()], dtype=np.intp)
+            else:
+                sorted_keys, sorted_slots = self._sorted_index()
+                position = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+                slots = np.where(sorted_keys[position] == keys, sorted_slots[position], -1)
+
+            if cacheable is not None:
+                slots[~cacheable] = -1
+            if self.ttl is not None:
+                expired = slots >= 0
+                expired[expired] = self.inserted[slots[expired]] < time.monotonic() - self.ttl
+                slots[expired] = -1
+
+            hit = slots >= 0
+            self._tick += 1
+            self.last_used[slots[hit]] = self._tick
+            n_hits = int(np.count_nonzero(hit))
+            self.hits += n_hits
+            self.misses += len(keys) - n_hits
+            return slots
+
+    def fetch(self, keys: np.ndarray, cacheable: Optional[np.ndarray] = None,
+              version=None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Look up keys and copy out the hit entries in one step.
+
+        Returns:
+            Tuple of the hit mask and a dict of the hits' value, lower, upper,
+            distance, extrapolation and model columns, plus ``model_names``
+            to resolve model ids
+        """
+        with self._lock:
+            slots = self.lookup(keys, cacheable, version)
+            hit = slots >= 0
+            slots = slots[hit]
+            entries = {
+                'value': self.values[slots],
+                'lower': self.lower[slots],
+                'upper': self.upper[slots],
+                'distance': self.distance[slots],
+                'extrapolation': self.extrapolation[slots],
+                'model': self.model[slots],
+                'model_names': list(self.model_names)
+            }
+            return hit, entries
+
+    def _sorted_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._index is None:
+            order = np.argsort(self.keys[:self._size], kind='stable')
+            self._index = (self.keys[order], order)
+        return self._index
+
+    def _model_id(self, model_name: str) -> int:
+        if model_name not in self.model_names:
+            self.model_names.append(model_name)
+        return self.model_names.index(model_name)
+
+    def _evict(self, needed: int):
+        """Evict least recently used entries until ``needed`` slots are free."""
+        free = self.capacity - self._size
+        if free >= needed:
+            return
+        n_evict = min(self._size, max(needed - free, self.capacity // 8))
+        victims = np.argpartition(self.last_used[:self._size], n_evict - 1)[:n_evict] \
+            if n_evict < self._size else np.arange(self._size)
+
+        keep = np.ones(self._size, dtype=bool)
+        keep[victims] = False
+        for column in (self.keys, self.values, self.lower, self.upper, self.distance,
+                       self.extrapolation, self.model, self.inserted, self.last_used):
+            kept = column[:self._size][keep]
+            column[:len(kept)] = kept
+        self._size = int(np.count_nonzero(keep))
+        self._slots = dict(zip(self.keys[:self._size].tolist(), range(self._size)))
+        self._index = None
+        self.evictions += n_evict
+
+    def store(self, keys: np.ndarray, values: np.ndarray, lower: np.ndarray,
+              upper: np.ndarray, distance: np.ndarray, extrapolation: np.ndarray,
+              model_name: str, version=None):
+        """Insert or refresh entries for the given keys (ignored for an outdated ``version``)."""
+        with self._lock:
+            if version is not None and not self.check_version(version):
+                return
+            keys, first = np.unique(np.asarray(keys, dtype=np.int64), return_index=True)
+            keys = keys[:self.capacity]
+            first = first[:self.capacity]
+            columns = [np.broadcast_to(np.asarray(c), (len(first),)) if np.ndim(c) == 0
+                       else np.asarray(c)[first]
+                       for c in (values, lower, upper, distance, extrapolation)]
+
+            existing = np.array([self._slots.get(key, -1) for key in keys.tolist()], dtype=np.intp)
+            new = existing < 0
+            self._evict(int(np.count_nonzero(new)))
+            # Eviction may have moved or dropped existing entries
+            existing = np.array([self._slots.get(key, -1) for key in keys.tolist()], dtype=np.intp)
+            new = existing < 0
+
+            slots = existing.copy()
+            slots[new] = self._size + np.arange(np.count_nonzero(new))
+            self._size += int(np.count_nonzero(new))
+            self._slots.update(zip(keys[new].tolist(), slots[new].tolist()))
+
+            self._tick += 1
+            self.keys[slots] = keys
+            self.values[slots], self.lower[slots], self.upper[slots] = columns[:3]
+            self.distance[slots], self.extrapolation[slots] = columns[3:]
+            self.model[slots] = self._model_id(model_name)
+            self.inserted[slots] = time.monotonic()
+            self.last_used[slots] = self._tick
+            if np.any(new):
+                self._index = None
+
+    def stats(self) -> Dict[str, float]:
+        """Hit and miss counters, hit rate, entries and bytes used."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': self._size,
+                'bytes': self.nbytes,
+                'max_bytes': self.max_bytes
+            }
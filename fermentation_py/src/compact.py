@@ -0,0 +1,283 @@
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+from .arena import load_arena, save_arena
+from .intervals import ConformalIntervals
+from .coverage import CoverageIndex
+from .input_validation import PREDICTION_TARGETS, warn_out_of_range
+
+logger = logging.getLogger(__name__)
+
+COMPACT_FILENAME = "compact_models.arena"
+
+GAS_CONSTANT = 8.314  # J/(mol*K)
+
+# NumPy-only prediction kernels. The model classes in models.py that have no
+# sklearn estimator predict through these too, so both paths agree exactly.
+
+def linear(X: np.ndarray, coef: np.ndarray, intercept: np.ndarray) -> np.ndarray:
+    return X @ coef + intercept
+
+def polynomial(X: np.ndarray, powers: np.ndarray, coef: np.ndarray,
+               intercept: np.ndarray) -> np.ndarray:
+    return np.prod(X[:, None, :] ** powers[None, :, :], axis=2) @ coef + intercept
+
+def arrhenius(X: np.ndarray, A: float, Ea: float, n: float,
+              R: float = GAS_CONSTANT) -> np.ndarray:
+    """Time = A * exp(Ea/(R*T)) * (Yeast%)^(-n), inputs clamped at 0°C and 0.001%."""
+    temp_kelvin = np.maximum(X[:, 0] + 273.15, 273.15)
+    yeast_pct = np.maximum(X[:, 1], 0.001)
+    return A * np.exp(Ea / (R * temp_kelvin)) * (yeast_pct ** (-n))
+
+def power_law(X: np.ndarray, log_a: np.ndarray, exponent: np.ndarray) -> np.ndarray:
+    return np.exp(np.polyval(log_a, X[:, 0]) -
+                  np.polyval(exponent, X[:, 0]) * np.log(np.maximum(X[:, 1], 1e-12)))
+
+def _bilinear(table: np.ndarray, i: np.ndarray, j: np.ndarray,
+              f0: np.ndarray, f1: np.ndarray) -> np.ndarray:
+    return ((1 - f0) * ((1 - f1) * table[i, j] + f1 * table[i, j + 1]) +
+            f0 * ((1 - f1) * table[i + 1, j] + f1 * table[i + 1, j + 1]))
+
+def grid_interpolation(X: np.ndarray, temperatures: np.ndarray, log_yeast: np.ndarray,
+                       log_time: np.ndarray) -> np.ndarray:
+    """Bilinear interpolation of log-time on sorted, unevenly spaced axes."""
+    points = (X[:, 0], np.log(np.maximum(X[:, 1], 1e-12)))
+    index, frac = [], []
+    for axis, values in zip((temperatures, log_yeast), points):
+        i = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+        index.append(i)
+        frac.append(np.clip((values - axis[i]) / (axis[i + 1] - axis[i]), 0.0, 1.0))
+    return np.exp(_bilinear(log_time, index[0], index[1], frac[0], frac[1]))
+
+def table_interpolation(X: np.ndarray, table: np.ndarray, lower: np.ndarray,
+                        upper: np.ndarray, log_features: np.ndarray) -> np.ndarray:
+    """Bilinear interpolation on an evenly spaced table, axes optionally in log space."""
+    U = np.array(X, dtype=np.float64, ndmin=2)
+    for col, use_log in enumerate(log_features):
+        if use_log:
+            U[:, col] = np.log(np.maximum(U[:, col], 1e-6))
+
+    n_0, n_1 = table.shape
+    position = (U - lower) / (upper - lower) * np.array([n_0 - 1, n_1 - 1])
+    position = np.clip(np.nan_to_num(position), 0, [n_0 - 1, n_1 - 1])
+    index = np.minimum(position.astype(np.intp), [n_0 - 2, n_1 - 2])
+    frac = position - index
+    return _bilinear(table, index[:, 0], index[:, 1], frac[:, 0], frac[:, 1])
+
+# Row-tree pairs per forest traversal block, small enough to stay in cache
+_FOREST_BLOCK = 1 << 16
+
+def forest(X: np.ndarray, roots: np.ndarray, children: np.ndarray, feature: np.ndarray,
+           threshold: np.ndarray, value: np.ndarray, depth: np.ndarray) -> np.ndarray:
+    """Mean prediction of regression trees stored as flat node arrays.
+
+    Trees are concatenated; ``roots`` holds each tree's first node and
+    ``children`` the right children followed by the left ones. Leaves point
+    to themselves with an infinite threshold, so all trees are descended
+    together for ``depth`` levels without bookkeeping. Inputs are compared in
+    float32, as scikit-learn does.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    n_trees, n_features = len(roots), X.shape[1]
+    n_nodes = len(feature)
+    predictions = np.empty(len(X), dtype=np.float64)
+    block = max(1, _FOREST_BLOCK // n_trees)
+    for start in range(0, len(X), block):
+        flat_rows = X[start:start + block].ravel()
+        n = len(flat_rows) // n_features
+        node = np.tile(roots, n)
+        row_start = np.repeat(np.arange(n, dtype=np.int32) * n_features, n_trees)
+        for _ in range(int(depth)):
+            go_left = flat_rows[row_start + feature[node]] <= threshold[node]
+            node = children[node + go_left * n_nodes]
+        predictions[start:start + n] = value[node].reshape(n, n_trees).mean(axis=1)
+    return predictions
+
+KERNELS = {
+    'linear': linear,
+    'polynomial': polynomial,
+    'arrhenius': arrhenius,
+    'power_law': power_law,
+    'grid_interpolation': grid_interpolation,
+    'table_interpolation': table_interpolation,
+    'forest': forest
+}
+
+class CompactModel:
+    """A fitted model reduced to a kernel name and its parameter arrays."""
+
+    def __init__(self, name: str, kind: str, arrays: Dict[str, np.ndarray]):
+        if kind not in KERNELS:
+            raise ValueError(f"Unknown compact model kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.arrays = arrays
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return KERNELS[self.kind](np.asarray(X, dtype=np.float64), **self.arrays)
+
+def save_compact_models(model_manager, intervals: ConformalIntervals, directory: str) -> Path:
+    """Export the calibrated model of each target, and its surrogate, for the compact path.
+
+    All arrays go into one arena file, which ``load_compact_models``
+    memory-maps: every process serving from the same model directory shares
+    one copy of the tree nodes, coefficients and tables. Targets whose model
+    has no compact form are left out, so predictions for them go through
+    the full predictor.
+
+    Args:
+        model_manager: Trained ``ModelManager``
+        intervals: Calibrated intervals; their model names pick the exported models
+        directory: Model directory
+
+    Returns:
+        Path of the written file
+    """
+    arrays = {}
+    for target in PREDICTION_TARGETS:
+        model_name = intervals.model_names.get(target)
+        model = model_manager.models.get(target, {}).get(model_name)
+        exported = model.compact() if model is not None else None
+        if exported is None:
+            continue
+
+        slots = {'model': (model.name, exported)}
+        surrogate = model_manager.surrogates.get(target)
+        if surrogate is not None and surrogate.source_name == model_name:
+            slots['surrogate'] = (surrogate.name, surrogate.compact())
+            arrays[f"{target}__relative_error_bound"] = np.array(surrogate.relative_error_bound)
+
+        for slot, (name, (kind, params)) in slots.items():
+            arrays[f"{target}__{slot}__name"] = np.array(name)
+            arrays[f"{target}__{slot}__kind"] = np.array(kind)
+            for key, value in params.items():
+                arrays[f"{target}__{slot}__{key}"] = np.asarray(value)
+
+    filepath = save_arena(Path(directory) / COMPACT_FILENAME, arrays)
+    logger.info(f"Compact models saved to {filepath}")
+    return filepath
+
+def load_compact_models(directory: str, mmap: bool = True) -> Tuple[
+        Dict[str, CompactModel], Dict[str, CompactModel], Dict[str, float]]:
+    """Load compact models, surrogates and surrogate error bounds keyed by target.
+
+    With ``mmap`` the parameter arrays are read-only views of the mapped file.
+    """
+    filepath = Path(directory) / COMPACT_FILENAME
+    if not filepath.exists():
+        raise FileNotFoundError(f"No compact models in {directory}")
+
+    grouped: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+    bounds = {}
+    for key, value in load_arena(filepath, mmap).items():
+        parts = key.split('__')
+        if len(parts) == 2:
+            bounds[parts[0]] = float(value)
+        else:
+            grouped.setdefault((parts[0], parts[1]), {})[parts[2]] = value
+
+    models: Dict[str, CompactModel] = {}
+    surrogates: Dict[str, CompactModel] = {}
+    for (target, slot), params in grouped.items():
+        name, kind = str(params.pop('name')), str(params.pop('kind'))
+        (models if slot == 'model' else surrogates)[target] = CompactModel(name, kind, params)
+    return models, surrogates, bounds
+
+class CompactPredictor:
+    """Single predictions from compact artifacts, without pandas or scikit-learn.
+
+    Loads the exported models together with the conformal intervals and
+    coverage index saved next to them and reproduces
+    ``FermentationPredictor.predict`` for targets whose calibrated model has
+    a compact form. ``can_predict`` tells whether a target is covered;
+    callers fall back to the full predictor otherwise.
+    """
+
+    def __init__(self, model_dir: str, confidence_level: float = 0.95,
+                 inverse_mode: str = 'model', surrogate_tolerance: Optional[float] = None):
+        self.confidence_level = confidence_level
+        models, surrogates, bounds = load_compact_models(model_dir)
+
+        # Same rule as ModelManager.select_surrogates
+        self.models = {}
+        self.source_names = {}
+        for target, model in models.items():
+            self.source_names[target] = model.name
+            if (surrogate_tolerance is not None and target in surrogates
+                    and bounds[target] <= surrogate_tolerance):
+                model = surrogates[target]
+            self.models[target] = model
+
+        # Inversion solves the full time model, which this path does not do
+        if inverse_mode != 'model':
+            self.models = {t: m for t, m in self.models.items() if t == 'time'}
+
+        self.intervals = ConformalIntervals()
+        self.intervals.load(model_dir)
+        self.coverage = CoverageIndex()
+        self.coverage.load(model_dir)
+
+    def can_predict(self, target: str) -> bool:
+        """Whether the target's calibrated model is available in compact form."""
+        return (target in self.models and self.intervals.is_fitted(target)
+                and self.intervals.model_names[target] == self.source_names[target])
+
+    @staticmethod
+    def target_for(temperature: Optional[float] = None,
+                   yeast_concentration: Optional[float] = None,
+                   fermentation_time: Optional[float] = None) -> str:
+        """Prediction target for the missing parameter."""
+        missing = [target for target, value in zip(
+            ('temperature', 'yeast', 'time'),
+            (temperature, yeast_concentration, fermentation_time)) if value is None]
+        if len(missing) != 1:
+            raise ValueError("Exactly 2 of 3 parameters must be provided")
+        return missing[0]
+
+    def predict(self, temperature: Optional[float] = None,
+                yeast_concentration: Optional[float] = None,
+                fermentation_time: Optional[float] = None) -> Dict[str, Any]:
+        """Predict the missing parameter; same result as ``FermentationPredictor.predict``."""
+        provided = {
+            'temperature': temperature,
+            'yeast_concentration': yeast_concentration,
+            'fermentation_time': fermentation_time
+        }
+        target = self.target_for(temperature, yeast_concentration, fermentation_time)
+        if not self.can_predict(target):
+            raise ValueError(f"No compact model for {target}")
+
+        warn_out_of_range(**provided)
+
+        parameter, unit, input_columns, non_negative = PREDICTION_TARGETS[target]
+        X = np.array([[provided[column] for column in input_columns]], dtype=np.float64)
+        model = self.models[target]
+        prediction = float(model.predict(X)[0])
+
+        distance, extrapolation, widening = None, False, 1.0
+        if self.coverage.is_fitted(target):
+            distances, flags = self.coverage.query(target, X)
+            distance, extrapolation = float(distances[0]), bool(flags[0])
+            widening = float(self.coverage.widening_factor(distances)[0])
+
+        lower, upper = self.intervals.interval(target, np.array([prediction]),
+                                               self.confidence_level)
+        confidence_interval = (float(prediction - (prediction - lower[0]) * widening),
+                               float(prediction + (upper[0] - prediction) * widening))
+
+        result = {
+            'predicted_parameter': parameter,
+            'predicted_value': max(0.0, prediction) if non_negative else prediction,
+            'unit': unit,
+            'confidence_interval': confidence_interval
+        }
+        for column in input_columns:
+            result[f'input_{column}'] = provided[column]
+        result.update({
+            'model_used': model.name,
+            'distance_to_nearest_observation': distance,
+            'extrapolation': extrapolation
+        })
+        return result
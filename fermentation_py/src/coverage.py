@@ -0,0 +1,147 @@
+import numpy as np
+from pathlib import Path
+from typing import Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Queries with at most this many point pairs are answered by brute force,
+# which avoids building a KD-tree (and importing scipy) for single predictions
+BRUTE_FORCE_PAIRS = 1 << 16
+
+# Which input features of each target are compared in log space. Yeast
+# concentrations and fermentation times are spaced geometrically in the data.
+LOG_FEATURES = {
+    'time': (False, True),         # temperature, yeast
+    'temperature': (True, True),   # time, yeast
+    'yeast': (True, False)         # time, temperature
+}
+
+class CoverageIndex:
+    """Nearest-observation index over the training inputs of each target.
+
+    Inputs are log-transformed where appropriate and each axis is scaled by
+    its typical step between observed values, then indexed with a KD-tree.
+    A query returns the distance to the nearest training observation in units
+    of the typical spacing between observations, so a distance of 1 means
+    "as far from the data as neighbouring grid points are from each other".
+    Small queries skip the tree and compare against every point directly.
+    """
+
+    FILENAME = "coverage_index.npz"
+
+    def __init__(self, threshold: float = 2.0):
+        self.threshold = threshold
+        self.points: Dict[str, np.ndarray] = {}
+        self.offsets: Dict[str, np.ndarray] = {}
+        self.scales: Dict[str, np.ndarray] = {}
+        self.spacing: Dict[str, float] = {}
+        self._trees: Dict[str, 'cKDTree'] = {}
+
+    def _transform(self, target: str, X: np.ndarray) -> np.ndarray:
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        for col, use_log in enumerate(LOG_FEATURES.get(target, (False, False))):
+            if use_log:
+                X[:, col] = np.log(np.maximum(X[:, col], 1e-6))
+        return X
+
+    def fit(self, target: str, X: np.ndarray):
+        """Build the index for a target from its training inputs."""
+        X = self._transform(target, X)
+        X = np.unique(X, axis=0)
+
+        # Scale each axis by its typical step between distinct values, so a
+        # grid step counts the same along temperature and along yeast
+        offsets = X.min(axis=0)
+        scales = np.ones(X.shape[1])
+        for col in range(X.shape[1]):
+            steps = np.diff(np.unique(X[:, col]))
+            if len(steps):
+                scales[col] = np.median(steps)
+        points = (X - offsets) / scales
+
+        from scipy.spatial import cKDTree
+        tree = cKDTree(points)
+        if len(points) > 1:
+            nearest, _ = tree.query(points, k=2)
+            spacing = float(np.median(nearest[:, 1]))
+        else:
+            spacing = 1.0
+
+        self.points[target] = points
+        self.offsets[target] = offsets
+        self.scales[target] = scales
+        self.spacing[target] = spacing if spacing > 0 else 1.0
+        self._trees[target] = tree
+
+        logger.info(f"Built coverage index for {target} over {len(points)} observations")
+
+    def input_minimums(self) -> Dict[str, float]:
+        """Smallest training value of each input column over the indexed targets."""
+        from .models import TARGET_COLUMNS
+
+        minimums = {}
+        for target, offsets in self.offsets.items():
+            for column, offset, use_log in zip(TARGET_COLUMNS[target][0], offsets,
+                                               LOG_FEATURES[target]):
+                value = float(np.exp(offset)) if use_log else float(offset)
+                minimums[column] = min(value, minimums.get(column, np.inf))
+        return minimums
+
+    def is_fitted(self, target: str) -> bool:
+        return target in self.points
+
+    def _tree(self, target: str) -> 'cKDTree':
+        tree = self._trees.get(target)
+        if tree is None:
+            from scipy.spatial import cKDTree
+            tree = cKDTree(self.points[target])
+            self._trees[target] = tree
+        return tree
+
+    def query(self, target: str, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Distance to the nearest observation (in spacing units) and extrapolation flags."""
+        points = (self._transform(target, X) - self.offsets[target]) / self.scales[target]
+        indexed = self.points[target]
+        if target not in self._trees and len(points) * len(indexed) <= BRUTE_FORCE_PAIRS:
+            differences = points[:, None, :] - indexed[None, :, :]
+            distances = np.sqrt((differences ** 2).sum(axis=2).min(axis=1))
+        else:
+            distances, _ = self._tree(target).query(points, k=1)
+        distances = distances / self.spacing[target]
+        return distances, distances > self.threshold
+
+    def widening_factor(self, distances: np.ndarray) -> np.ndarray:
+        """Interval widening factor: 1 inside the data, growing linearly with distance."""
+        return np.maximum(1.0, np.asarray(distances, dtype=np.float64))
+
+    def save(self, directory: str):
+        """Save indexed points and scaling."""
+        filepath = Path(directory) / self.FILENAME
+        arrays = {'threshold': np.array(self.threshold)}
+        for target in self.points:
+            arrays[f"{target}__points"] = self.points[target]
+            arrays[f"{target}__offsets"] = self.offsets[target]
+            arrays[f"{target}__scales"] = self.scales[target]
+            arrays[f"{target}__spacing"] = np.array(self.spacing[target])
+        np.savez(filepath, **arrays)
+        logger.info(f"Coverage index saved to {filepath}")
+
+    def load(self, directory: str) -> bool:
+        """Load a saved index if present. Trees are rebuilt lazily on first query."""
+        filepath = Path(directory) / self.FILENAME
+        if not filepath.exists():
+            return False
+
+        with np.load(filepath) as data:
+            self.threshold = float(data['threshold'])
+            targets = {key.split('__')[0] for key in data.files if '__' in key}
+            for target in targets:
+                self.points[target] = data[f"{target}__points"]
+                self.offsets[target] = data[f"{target}__offsets"]
+                self.scales[target] = data[f"{target}__scales"]
+                self.spacing[target] = float(data[f"{target}__spacing"])
+                self._trees.pop(target, None)
+
+        logger.info(f"Coverage index loaded from {filepath}")
+        return True
@@ -1,21 +1,59 @@
-import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Dict, Any, TYPE_CHECKING
 import logging
 
+from .grid_csv import iqr_inliers, parse_grid_csv
+from .observation_store import FEATURE_COLUMNS, ObservationStore, is_store_path
+
+# pandas is imported where a DataFrame is built, so the NumPy engine never loads it
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Filters the CSV table can answer; it has no strain or observation times
+CSV_FILTERS = ('temperature_range', 'yeast_range', 'time_range')
+
+ENGINES = ('pandas', 'numpy')
+
 class FermentationDataLoader:
-    """Load and preprocess fermentation data from CSV."""
+    """Load and preprocess fermentation data from CSV or an SQLite observation store.
+    
+    Paths ending in .sqlite, .sqlite3 or .db are read through an
+    ``ObservationStore``; ``filters`` (see ``ObservationStore.query``)
+    restrict the observations used, and are then evaluated by the database.
     
-    def __init__(self, data_path: str):
+    With ``engine='numpy'`` the feature arrays and summary are built without
+    pandas: the CSV grid is parsed straight into arrays (``parse_grid_csv``)
+    and outliers are found with NumPy percentiles. The observations are the
+    same as with the default pandas engine.
+    """
+    
+    def __init__(self, data_path: str, filters: Optional[Dict[str, Any]] = None,
+                 engine: str = 'pandas'):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Expected one of {ENGINES}")
         self.data_path = Path(data_path)
+        self.filters = dict(filters or {})
+        self.engine = engine
+        self.store = ObservationStore(data_path) if is_store_path(data_path) else None
+        if self.store is None:
+            self._check_csv_filters(self.filters)
         self.raw_data = None
         self.clean_data = None
+        self.features: Optional[Dict[str, np.ndarray]] = None
+        self._grid: Optional[Dict[str, np.ndarray]] = None
+        
+    def load_data(self) -> 'pd.DataFrame':
+        """Load raw CSV data, or the filtered observations of the store."""
+        import pandas as pd
+        
+        if self.store is not None:
+            self.raw_data = pd.DataFrame(self.store.query(**self.filters))
+            logger.info(f"Loaded {len(self.raw_data)} observations from {self.data_path}")
+            return self.raw_data
         
-    def load_data(self) -> pd.DataFrame:
-        """Load raw CSV data."""
         if not self.data_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
             
@@ -23,13 +61,37 @@ class FermentationDataLoader:
         logger.info(f"Loaded data with shape: {self.raw_data.shape}")
         return self.raw_data
     
-    def preprocess_data(self) -> pd.DataFrame:
+    def preprocess_data(self) -> 'pd.DataFrame':
         """Clean and preprocess the fermentation data."""
+        if self.engine == 'numpy':
+            import pandas as pd
+            
+            self.clean_data = pd.DataFrame(self._clean_features())
+            return self.clean_data
+        
+        if self.raw_data is None:
+            self.load_data()
+        
+        if self.store is not None:
+            observations = self.raw_data
+        else:
+            observations = self._filter_frame(self.expand_table(), self.filters)
+        
+        # Remove outliers using IQR method
+        self.clean_data = self._remove_outliers(observations)
+        
+        logger.info(f"Cleaned data shape: {self.clean_data.shape}")
+        return self.clean_data
+    
+    def expand_table(self) -> 'pd.DataFrame':
+        """One row per positive time of the wide CSV table, outliers included."""
+        import pandas as pd
+        
         if self.raw_data is None:
             self.load_data()
             
         # Extract temperature column (first column after row identifier)
-        temp_col = self.raw_data.iloc[:, 0].str.replace('°C', '').str.extract(r'(\d+\.?\d*)')[0]
+        temp_col = self.raw_data.iloc[:, 0].astype(str).str.replace('°C', '').str.extract(r'(\d+\.?\d*)')[0]
         temperatures = pd.to_numeric(temp_col, errors='coerce')
         
         # Extract yeast concentration columns (header row)
@@ -63,20 +125,29 @@ class FermentationDataLoader:
                         except (IndexError, ValueError):
                             continue
         
-        # Create clean DataFrame
-        self.clean_data = pd.DataFrame({
+        return pd.DataFrame({
             'temperature': temps_expanded,
             'yeast_concentration': yeast_concentrations,
             'fermentation_time': fermentation_times
         })
-        
-        # Remove outliers using IQR method
-        self.clean_data = self._remove_outliers(self.clean_data)
-        
-        logger.info(f"Cleaned data shape: {self.clean_data.shape}")
-        return self.clean_data
     
-    def _remove_outliers(self, df: pd.DataFrame, columns: Optional[list] = None) -> pd.DataFrame:
+    @staticmethod
+    def _check_csv_filters(filters: Dict[str, Any]):
+        unsupported = set(filters) - set(CSV_FILTERS)
+        if unsupported:
+            raise ValueError(f"Filters {sorted(unsupported)} need an observation store; "
+                             f"CSV data supports {list(CSV_FILTERS)}")
+    
+    @staticmethod
+    def _filter_frame(df: 'pd.DataFrame', filters: Dict[str, Any]) -> 'pd.DataFrame':
+        """Apply inclusive range filters to the expanded CSV table."""
+        for column, key in zip(FEATURE_COLUMNS, CSV_FILTERS):
+            if filters.get(key) is not None:
+                low, high = filters[key]
+                df = df[df[column].between(low, high)]
+        return df
+    
+    def _remove_outliers(self, df: 'pd.DataFrame', columns: Optional[list] = None) -> 'pd.DataFrame':
         """Remove outliers using IQR method."""
         if columns is None:
             columns = ['fermentation_time']
@@ -99,19 +170,81 @@ class FermentationDataLoader:
         
         return df_clean
     
-    def get_feature_matrices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Get feature matrices for model training."""
-        if self.clean_data is None:
-            self.preprocess_data()
+    def _feature_arrays(self, filters: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """NumPy engine: filtered observations with outliers removed, as arrays."""
+        if self.store is not None:
+            data = self.store.query(**filters)
+        else:
+            self._check_csv_filters(filters)
+            if self._grid is None:
+                self._grid = dict(zip(FEATURE_COLUMNS, parse_grid_csv(self.data_path)))
+            keep = np.ones(len(self._grid['temperature']), dtype=bool)
+            for column, key in zip(FEATURE_COLUMNS, CSV_FILTERS):
+                if filters.get(key) is not None:
+                    low, high = filters[key]
+                    keep &= (self._grid[column] >= low) & (self._grid[column] <= high)
+            data = {column: values[keep] for column, values in self._grid.items()}
+        
+        inliers = iqr_inliers(data['fermentation_time'])
+        removed_count = len(inliers) - np.count_nonzero(inliers)
+        if removed_count > 0:
+            logger.info(f"Removed {removed_count} outliers from fermentation_time")
+        return {column: data[column][inliers] for column in FEATURE_COLUMNS}
+    
+    def _clean_features(self) -> Dict[str, np.ndarray]:
+        if self.features is None:
+            self.features = self._feature_arrays(self.filters)
+        return self.features
+    
+    def get_feature_matrices(self, **filters) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get feature matrices for model training.
+        
+        Args:
+            **filters: Narrow the loader's ``filters`` for this call, e.g.
+                ``last_days=90, temperature_range=(20, 28)``; an observation
+                store answers them with an indexed query, touching only the
+                matching rows. Outliers are removed within the selected rows.
+        """
+        if self.engine == 'numpy':
+            data = self._feature_arrays({**self.filters, **filters}) if filters \
+                else self._clean_features()
+            return data['temperature'], data['yeast_concentration'], data['fermentation_time']
+        
+        if not filters:
+            if self.clean_data is None:
+                self.preprocess_data()
+            data = self.clean_data
+        else:
+            filters = {**self.filters, **filters}
+            if self.store is not None:
+                import pandas as pd
+                
+                data = pd.DataFrame(self.store.query(**filters))
+            else:
+                self._check_csv_filters(filters)
+                data = self._filter_frame(self.expand_table(), filters)
+            data = self._remove_outliers(data)
             
-        temp = self.clean_data['temperature'].values
-        yeast = self.clean_data['yeast_concentration'].values
-        time = self.clean_data['fermentation_time'].values
+        temp = data['temperature'].values
+        yeast = data['yeast_concentration'].values
+        time = data['fermentation_time'].values
         
         return temp, yeast, time
     
     def get_data_summary(self) -> dict:
         """Get summary statistics of the cleaned data."""
+        if self.engine == 'numpy':
+            data = self._clean_features()
+            ranges = {column: (data[column].min(), data[column].max()) if len(data[column])
+                      else (np.nan, np.nan) for column in FEATURE_COLUMNS}
+            return {
+                'total_samples': len(data['temperature']),
+                'temperature_range': ranges['temperature'],
+                'yeast_range': ranges['yeast_concentration'],
+                'time_range': ranges['fermentation_time'],
+                'missing_values': {column: 0 for column in FEATURE_COLUMNS}
+            }
+        
         if self.clean_data is None:
             self.preprocess_data()
             
@@ -0,0 +1,68 @@
+import csv
+import re
+import numpy as np
+from pathlib import Path
+from typing import Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# NumPy-only reader for the wide fermentation table: temperatures (°C) in the
+# first column, yeast percentages in the header, fermentation times in the
+# cells. Produces the same observations as FermentationDataLoader's pandas
+# path without importing pandas.
+
+_NUMBER = re.compile(r'(\d+\.?\d*)')
+
+def _cell_value(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return np.nan
+
+def parse_grid_csv(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read a wide table into one entry per positive fermentation time.
+
+    Temperatures are the first number in the first column (a '°C' suffix is
+    allowed), yeast concentrations come from header cells ending in '%'.
+    Columns without '%', rows without a temperature and blank, non-numeric
+    or non-positive cells are skipped.
+
+    Returns:
+        Tuple of temperature, yeast concentration and fermentation time
+        arrays, row by row through the table
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {path}")
+
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [row for row in reader if row]
+
+    yeast = np.array([_cell_value(h.replace('%', '')) if '%' in h else np.nan
+                      for h in header[1:]])
+    temperature = np.full(len(rows), np.nan)
+    table = np.full((len(rows), len(yeast)), np.nan)
+    for i, row in enumerate(rows):
+        match = _NUMBER.search(row[0].replace('°C', ''))
+        if match:
+            temperature[i] = float(match.group(1))
+        cells = [_cell_value(cell) for cell in row[1:len(yeast) + 1]]
+        table[i, :len(cells)] = cells
+
+    with np.errstate(invalid='ignore'):
+        keep = (table > 0) & ~np.isnan(temperature)[:, None] & ~np.isnan(yeast)[None, :]
+    rows_kept, columns_kept = np.nonzero(keep)
+    logger.info(f"Parsed {len(rows_kept)} observations from {path}")
+    return temperature[rows_kept], yeast[columns_kept], table[rows_kept, columns_kept]
+
+def iqr_inliers(values: np.ndarray, k: float = 1.5) -> np.ndarray:
+    """Mask of values within ``k`` interquartile ranges of the quartiles."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    q1, q3 = np.percentile(values, [25, 75])
+    iqr = q3 - q1
+    return (values >= q1 - k * iqr) & (values <= q3 + k * iqr)
@@ -0,0 +1,164 @@
+import numpy as np
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Smallest value the clip policy leaves for parameters with an exclusive
+# lower bound, unless the training minimum is given: the lowest yeast
+# concentration of the measured table and a one-hour fermentation
+CLIP_MINIMUMS = {'yeast_concentration': 0.004, 'fermentation_time': 1.0}
+
+# Typical input ranges: (low, high, low_inclusive, unit)
+TYPICAL_RANGES = {
+    'temperature': (0.0, 50.0, True, '°C'),
+    'yeast_concentration': (0.0, 1.0, False, '%'),
+    'fermentation_time': (0.0, 1000.0, False, 'h')
+}
+
+# Output parameter, unit, input columns (in model feature order) and whether
+# predictions are clipped at zero, for each prediction target
+PREDICTION_TARGETS = {
+    'time': ('fermentation_time', 'hours', ('temperature', 'yeast_concentration'), True),
+    'temperature': ('temperature', 'Celsius', ('fermentation_time', 'yeast_concentration'), False),
+    'yeast': ('yeast_concentration', 'percentage', ('fermentation_time', 'temperature'), True)
+}
+
+# Per-row flag bits attached to batch prediction output
+FLAG_TEMPERATURE_RANGE = 1
+FLAG_YEAST_RANGE = 2
+FLAG_TIME_RANGE = 4
+FLAG_EXTRAPOLATION = 8
+FLAG_CLIPPED = 16
+FLAG_REJECTED = 32
+
+RANGE_FLAGS = {
+    'temperature': FLAG_TEMPERATURE_RANGE,
+    'yeast_concentration': FLAG_YEAST_RANGE,
+    'fermentation_time': FLAG_TIME_RANGE
+}
+
+VALIDATION_POLICIES = ('warn', 'clip', 'reject')
+
+def out_of_range_mask(parameter: str, values: np.ndarray) -> np.ndarray:
+    """Boolean mask of provided (non-NaN) values outside the typical range."""
+    low, high, low_inclusive, _ = TYPICAL_RANGES[parameter]
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        below = values < low if low_inclusive else values <= low
+        return below | (values > high)
+
+def format_range(parameter: str) -> str:
+    low, high, _, unit = TYPICAL_RANGES[parameter]
+    return f"{low:g}-{high:g}{unit}"
+
+def warn_out_of_range(**inputs: Optional[float]):
+    """Log a warning for each provided scalar input outside its typical range."""
+    for parameter, value in inputs.items():
+        if value is not None and out_of_range_mask(parameter, value):
+            name = parameter.replace('_', ' ').capitalize()
+            unit = TYPICAL_RANGES[parameter][3]
+            logger.warning(f"{name} {value}{unit} is outside typical range "
+                           f"({format_range(parameter)})")
+
+class BatchInputValidator:
+    """Vectorized range validation for batch predictions.
+
+    Computes out-of-range masks over whole input columns and applies a policy:
+
+    - ``warn``: keep values, flag rows
+    - ``clip``: clip values into the typical range, flag rows; yeast and
+      time values below a usable minimum (by default ``CLIP_MINIMUMS``),
+      including zero, are raised to it
+    - ``reject``: flag rows as rejected so no prediction is made for them
+
+    Instead of one log record per bad value, at most one aggregated summary is
+    logged per batch, and summaries are rate-limited to one every
+    ``warning_interval`` seconds; suppressed summaries are counted and
+    reported with the next one. Validators can be shared between threads.
+    """
+
+    def __init__(self, policy: str = 'warn', warning_interval: float = 60.0,
+                 clip_minimums: Optional[Dict[str, float]] = None):
+        if policy not in VALIDATION_POLICIES:
+            raise ValueError(f"Unknown validation policy: {policy}. "
+                             f"Expected one of {VALIDATION_POLICIES}")
+        self.policy = policy
+        self.warning_interval = warning_interval
+        self.clip_minimums = {**CLIP_MINIMUMS, **(clip_minimums or {})}
+        self._last_warning = None
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def validate(self, inputs: Dict[str, np.ndarray], policy: Optional[str] = None,
+                 clip_minimums: Optional[Dict[str, float]] = None
+                 ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Validate input columns.
+
+        Args:
+            inputs: Mapping of parameter name to float array, NaN where not provided
+            policy: Override the validator's policy for this batch
+            clip_minimums: Override ``clip_minimums`` per parameter (e.g. with
+                the smallest training values)
+
+        Returns:
+            Tuple of (possibly clipped) input columns and per-row int8 flags
+        """
+        policy = policy or self.policy
+        if policy not in VALIDATION_POLICIES:
+            raise ValueError(f"Unknown validation policy: {policy}")
+        minimums = {**self.clip_minimums, **(clip_minimums or {})}
+
+        n_rows = len(next(iter(inputs.values()))) if inputs else 0
+        flags = np.zeros(n_rows, dtype=np.int8)
+        counts = {}
+        validated = {}
+
+        for parameter, values in inputs.items():
+            values = np.asarray(values, dtype=np.float64)
+            mask = out_of_range_mask(parameter, values)
+            counts[parameter] = int(np.count_nonzero(mask))
+
+            if counts[parameter]:
+                flags[mask] |= RANGE_FLAGS[parameter]
+            if policy == 'clip':
+                low, high, low_inclusive, _ = TYPICAL_RANGES[parameter]
+                if not low_inclusive:
+                    low = max(low, minimums[parameter])
+                with np.errstate(invalid='ignore'):
+                    clipped = mask | (values < low)
+                values = np.clip(values, low, high)
+                flags[clipped] |= FLAG_CLIPPED
+
+            validated[parameter] = values
+
+        if policy == 'reject':
+            flags[flags != 0] |= FLAG_REJECTED
+
+        if any(counts.values()):
+            self._warn_summary(counts, n_rows, policy)
+
+        return validated, flags
+
+    def _warn_summary(self, counts: Dict[str, int], n_rows: int, policy: str):
+        """Log one aggregated summary, rate-limited."""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_warning is not None and now - self._last_warning < self.warning_interval:
+                self._suppressed += 1
+                return
+            suppressed = self._suppressed
+            self._last_warning = now
+            self._suppressed = 0
+
+        details = ", ".join(
+            f"{parameter}: {count} outside {format_range(parameter)}"
+            for parameter, count in counts.items() if count
+        )
+        message = f"Batch input validation ({policy}) on {n_rows} rows - {details}"
+        if suppressed:
+            message += f" ({suppressed} earlier summaries suppressed)"
+
+        logger.warning(message)
@@ -0,0 +1,111 @@
+import numpy as np
+from pathlib import Path
+from typing import Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ConformalIntervals:
+    """Split-conformal prediction intervals calibrated on out-of-fold residuals.
+
+    Nonconformity scores are residuals scaled by the prediction magnitude,
+    ``|y - y_hat| / (|y_hat| + floor)``, so interval width follows the
+    prediction the same way the old fixed-percentage intervals did. Scores are
+    sorted once at train time; any confidence level then maps to a single
+    index into the sorted array and is cached.
+    """
+
+    FILENAME = "conformal_intervals.npz"
+
+    def __init__(self):
+        self.scores: Dict[str, np.ndarray] = {}
+        self.scale_floors: Dict[str, float] = {}
+        self.model_names: Dict[str, str] = {}
+        self._quantiles: Dict[Tuple[str, float], float] = {}
+
+    def fit(self, target: str, y_true: np.ndarray, y_pred: np.ndarray,
+            model_name: str, scale_floor: float = 0.0):
+        """Calibrate intervals for a target from out-of-fold predictions."""
+        y_true = np.asarray(y_true, dtype=np.float64)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+
+        scores = np.abs(y_true - y_pred) / (np.abs(y_pred) + scale_floor)
+        self.scores[target] = np.sort(scores[np.isfinite(scores)])
+        self.scale_floors[target] = float(scale_floor)
+        self.model_names[target] = model_name
+        self._clear_cache(target)
+
+        logger.info(f"Calibrated conformal intervals for {target} "
+                    f"({model_name}, {len(self.scores[target])} residuals)")
+
+    def is_fitted(self, target: str) -> bool:
+        return target in self.scores and len(self.scores[target]) > 0
+
+    def quantile(self, target: str, confidence_level: float = 0.95) -> float:
+        """Conformal score quantile for a confidence level."""
+        key = (target, confidence_level)
+        q = self._quantiles.get(key)
+        if q is None:
+            if not 0 < confidence_level < 1:
+                raise ValueError("Confidence level must be between 0 and 1")
+            scores = self.scores[target]
+            n = len(scores)
+            # Finite-sample corrected rank: ceil((n + 1) * level)
+            rank = int(np.ceil((n + 1) * confidence_level))
+            q = float(scores[rank - 1]) if rank <= n else float('inf')
+            self._quantiles[key] = q
+        return q
+
+    def interval(self, target: str, predictions: np.ndarray,
+                 confidence_level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized interval bounds for an array of predictions."""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        half_width = self.quantile(target, confidence_level) * \
+            (np.abs(predictions) + self.scale_floors[target])
+        return predictions - half_width, predictions + half_width
+
+    def prediction_range(self, target: str, observed: np.ndarray,
+                         confidence_level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """Range of non-negative predictions whose interval contains the observed values.
+
+        Inverts ``interval``: solves ``|y - p| <= q * (p + floor)`` for ``p``.
+        The upper end is infinite when the score quantile is at least 1.
+        """
+        observed = np.asarray(observed, dtype=np.float64)
+        q = self.quantile(target, confidence_level)
+        floor = self.scale_floors[target]
+        lower = np.maximum((observed - q * floor) / (1.0 + q), 0.0)
+        if q >= 1:
+            return lower, np.full_like(observed, np.inf)
+        return lower, (observed + q * floor) / (1.0 - q)
+
+    def save(self, directory: str):
+        """Save calibration scores."""
+        filepath = Path(directory) / self.FILENAME
+        arrays = {}
+        for target, scores in self.scores.items():
+            arrays[f"{target}__scores"] = scores
+            arrays[f"{target}__scale_floor"] = np.array(self.scale_floors[target])
+            arrays[f"{target}__model_name"] = np.array(self.model_names[target])
+        np.savez(filepath, **arrays)
+        logger.info(f"Conformal intervals saved to {filepath}")
+
+    def load(self, directory: str) -> bool:
+        """Load calibration scores if present. Returns True if loaded."""
+        filepath = Path(directory) / self.FILENAME
+        if not filepath.exists():
+            return False
+
+        with np.load(filepath) as data:
+            targets = {key.split('__')[0] for key in data.files}
+            for target in targets:
+                self.scores[target] = data[f"{target}__scores"]
+                self.scale_floors[target] = float(data[f"{target}__scale_floor"])
+                self.model_names[target] = str(data[f"{target}__model_name"])
+                self._clear_cache(target)
+
+        logger.info(f"Conformal intervals loaded from {filepath}")
+        return True
+
+    def _clear_cache(self, target: str):
+        self._quantiles = {k: v for k, v in self._quantiles.items() if k[0] != target}
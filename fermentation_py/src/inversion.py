@@ -0,0 +1,128 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+import logging
+
+from .models import FermentationModel
+
+logger = logging.getLogger(__name__)
+
+# Search interval and whether to bisect in log space, for each solvable input
+SEARCH_BOUNDS = {
+    'temperature': (0.0, 50.0, False),
+    'yeast': (1e-3, 1.0, True)
+}
+
+class TimeModelInverter:
+    """Solve time(temperature, yeast) = target for temperature or yeast.
+
+    Instead of separately trained inverse models, the trained time model is
+    inverted numerically, so answers are always consistent with forward time
+    predictions. Every query is handled at once:
+
+    1. Time is predicted on a grid of ``grid_size`` points across the search
+       interval for all queries in one ``predict`` call. The grid is used to
+       check that time decreases with the solved input and to find the first
+       grid cell whose end points bracket the target.
+    2. All brackets are then halved together, one ``predict`` call per
+       iteration, until they are narrower than ``xtol``. Yeast is bisected in
+       log space, so its tolerance is relative.
+
+    Targets outside the range of times the model reaches are reported as not
+    converged, with the solution at the closest end of the search interval.
+    """
+
+    def __init__(self, time_model: FermentationModel, grid_size: int = 64,
+                 temperature_xtol: float = 1e-3, yeast_xtol: float = 1e-4,
+                 monotonic_tolerance: float = 1e-3,
+                 bounds: Optional[Dict[str, Tuple[float, float, bool]]] = None):
+        self.time_model = time_model
+        self.grid_size = grid_size
+        self.xtol = {'temperature': temperature_xtol, 'yeast': yeast_xtol}
+        self.monotonic_tolerance = monotonic_tolerance
+        self.bounds = dict(SEARCH_BOUNDS, **(bounds or {}))
+
+    def _features(self, target: str, u: np.ndarray, fixed: np.ndarray) -> np.ndarray:
+        """Time model inputs for search coordinates ``u`` and the fixed input."""
+        values = np.exp(u) if self.bounds[target][2] else u
+        if target == 'temperature':
+            return np.column_stack([values.ravel(), np.broadcast_to(fixed, u.shape).ravel()])
+        return np.column_stack([np.broadcast_to(fixed, u.shape).ravel(), values.ravel()])
+
+    def _time(self, target: str, u: np.ndarray, fixed: np.ndarray) -> np.ndarray:
+        return self.time_model.predict(self._features(target, u, fixed)).reshape(u.shape)
+
+    def solve(self, target: str, fermentation_time: np.ndarray,
+              fixed: np.ndarray, max_iter: int = 100) -> Dict[str, np.ndarray]:
+        """Solve for temperature or yeast concentration.
+
+        Args:
+            target: 'temperature' (fixed input is yeast concentration) or
+                'yeast' (fixed input is temperature)
+            fermentation_time: Target fermentation times in hours
+            fixed: The other input, broadcastable against ``fermentation_time``
+            max_iter: Maximum number of bisection steps
+
+        Returns:
+            Dictionary of arrays: 'value' (solution), 'tolerance' (width of the
+            final bracket in the solved input's units), 'residual' (predicted
+            minus target time at the solution), 'converged' and 'monotonic'
+        """
+        if target not in self.bounds:
+            raise ValueError(f"Cannot invert the time model for {target}")
+
+        fermentation_time, fixed = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(fermentation_time, dtype=np.float64)),
+            np.atleast_1d(np.asarray(fixed, dtype=np.float64))
+        )
+        fermentation_time, fixed = fermentation_time.ravel(), fixed.ravel()
+        n = len(fermentation_time)
+
+        low, high, log_scale = self.bounds[target]
+        if log_scale:
+            low, high = np.log(low), np.log(high)
+        grid = np.linspace(low, high, self.grid_size)
+
+        # Coarse grid: monotonicity check and initial brackets
+        times = self._time(target, np.broadcast_to(grid, (n, self.grid_size)), fixed[:, None])
+        increases = np.diff(times, axis=1) > self.monotonic_tolerance * np.abs(times[:, :-1])
+        monotonic = ~increases.any(axis=1)
+
+        excess = times - fermentation_time[:, None]
+        crossing = (excess[:, :-1] >= 0) & (excess[:, 1:] <= 0)
+        converged = crossing.any(axis=1)
+        cell = crossing.argmax(axis=1)
+
+        lo = grid[cell]
+        hi = grid[cell + 1]
+
+        # Unreachable targets: closest end of the search interval
+        closest = np.where(np.abs(excess[:, 0]) <= np.abs(excess[:, -1]), low, high)
+        lo[~converged] = hi[~converged] = closest[~converged]
+
+        xtol = self.xtol[target]
+        active = np.flatnonzero(converged & (hi - lo > xtol))
+        for _ in range(max_iter):
+            if len(active) == 0:
+                break
+            mid = 0.5 * (lo[active] + hi[active])
+            above = self._time(target, mid, fixed[active]) >= fermentation_time[active]
+            lo[active[above]] = mid[above]
+            hi[active[~above]] = mid[~above]
+            active = active[hi[active] - lo[active] > xtol]
+
+        u = 0.5 * (lo + hi)
+        value = np.exp(u) if log_scale else u
+        tolerance = (np.exp(hi) - np.exp(lo)) if log_scale else hi - lo
+        residual = self._time(target, u, fixed) - fermentation_time
+
+        logger.debug(f"Inverted time model for {target}: {n} targets, "
+                     f"{np.count_nonzero(~converged)} unreachable, "
+                     f"{np.count_nonzero(~monotonic)} non-monotonic")
+
+        return {
+            'value': value,
+            'tolerance': tolerance,
+            'residual': residual,
+            'converged': converged,
+            'monotonic': monotonic
+        }
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from joblib import Parallel, delayed
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Model directories are written completely into a sibling staging directory,
+# checksummed into MANIFEST_FILENAME and then swapped into place, so a crash
+# never leaves a mix of old and new artifacts under the model directory.
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+_HASH_BLOCK = 1 << 20
+
+def run_parallel(tasks: Sequence[Callable[[], Any]], n_jobs: Optional[int] = None) -> List[Any]:
+    """Run independent I/O-bound tasks on a thread pool, returning their results in order."""
+    if not tasks:
+        return []
+    n_jobs = n_jobs or min(len(tasks), os.cpu_count() or 1, 8)
+    return Parallel(n_jobs=n_jobs, prefer='threads')(delayed(task)() for task in tasks)
+
+def _file_entry(path: Path) -> Dict[str, Any]:
+    """Size and content hash of a file, flushed to disk on the way."""
+    hasher = hashlib.blake2b(digest_size=16)
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(_HASH_BLOCK)
+            if not block:
+                break
+            hasher.update(block)
+            size += len(block)
+        os.fsync(f.fileno())
+    return {'size': size, 'blake2b': hasher.hexdigest()}
+
+def _sync_directory(directory: Path):
+    """Flush a directory's entries (renames) to disk where the platform allows it."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_manifest(directory: str, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+    """Checksum every file of ``directory`` into its manifest.
+
+    Returns:
+        The manifest
+    """
+    directory = Path(directory)
+    paths = sorted(path for path in directory.iterdir()
+                   if path.is_file() and path.name != MANIFEST_FILENAME)
+    entries = run_parallel([lambda path=path: _file_entry(path) for path in paths], n_jobs)
+    manifest = {'format': MANIFEST_FORMAT,
+                'files': {path.name: entry for path, entry in zip(paths, entries)}}
+
+    tmp_path = directory / f".{MANIFEST_FILENAME}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, directory / MANIFEST_FILENAME)
+    return manifest
+
+def verify_manifest(directory: str, n_jobs: Optional[int] = None,
+                    checksums: bool = True) -> bool:
+    """Check a model directory against its manifest.
+
+    Every listed file must exist with the recorded size. With ``checksums``
+    the files are also hashed, which reads all of them; without, the check
+    catches missing and truncated files only.
+
+    Returns:
+        True if verified, False if the directory has no manifest (written
+        before manifests existed)
+
+    Raises:
+        ValueError: If a listed file is missing or its size or checksum differs
+    """
+    directory = Path(directory)
+    manifest_path = directory / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        logger.debug(f"No manifest in {directory}, loading unverified")
+        return False
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"Unsupported manifest format in {directory}: {manifest.get('format')}")
+
+    files = manifest['files']
+    for name, expected in files.items():
+        path = directory / name
+        if not path.is_file():
+            raise ValueError(f"Model directory {directory} is missing {name}")
+        if path.stat().st_size != expected['size']:
+            raise ValueError(f"Size of {name} in {directory} does not match the manifest")
+    if not checksums:
+        return True
+
+    names = list(files)
+    entries = run_parallel([lambda name=name: _file_entry(directory / name) for name in names], n_jobs)
+    for name, entry in zip(names, entries):
+        if entry['blake2b'] != files[name]['blake2b']:
+            raise ValueError(f"Checksum of {name} in {directory} does not match the manifest")
+    return True
+
+def _backup_path(directory: Path) -> Path:
+    return directory.with_name(f".{directory.name}.previous")
+
+def recover_directory(directory: str) -> bool:
+    """Restore the previous model directory if a commit was interrupted between its renames.
+
+    Returns:
+        True if a directory was restored
+    """
+    directory = Path(directory)
+    backup = _backup_path(directory)
+    if directory.exists() or not backup.is_dir():
+        return False
+    os.rename(backup, directory)
+    logger.warning(f"Restored {directory} from an interrupted save")
+    return True
+
+def commit_directory(staging: str, directory: str):
+    """Replace ``directory`` with the complete ``staging`` directory.
+
+    The old directory is renamed aside, the staging directory renamed into
+    its place and the old one removed. Processes that have old files open or
+    memory-mapped keep reading them. If the process dies between the two
+    renames, ``recover_directory`` brings the old directory back.
+    """
+    staging, directory = Path(staging), Path(directory)
+    recover_directory(directory)
+    backup = _backup_path(directory)
+    shutil.rmtree(backup, ignore_errors=True)
+
+    if directory.exists():
+        os.rename(directory, backup)
+    os.rename(staging, directory)
+    _sync_directory(directory.resolve().parent)
+    shutil.rmtree(backup, ignore_errors=True)
+
+@contextmanager
+def staged_directory(directory: str, n_jobs: Optional[int] = None) -> Iterator[Path]:
+    """Write a model directory atomically.
+
+    Yields a fresh staging directory next to ``directory``. When the block
+    completes, the staged files are checksummed into a manifest and the
+    staging directory replaces ``directory``; if it raises, the staging
+    directory is removed and ``directory`` is left untouched.
+    """
+    directory = Path(directory)
+    directory.resolve().parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.staging-",
+                                    dir=directory.resolve().parent))
+    try:
+        yield staging
+        write_manifest(staging, n_jobs)
+        commit_directory(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
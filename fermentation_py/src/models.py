@@ -1,28 +1,89 @@
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.pipeline import Pipeline
-from scipy.optimize import curve_fit
 import joblib
 from pathlib import Path
 import logging
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, List, NamedTuple, Optional, Callable
+import functools
 import warnings
 
+from . import compact
+from .coverage import LOG_FEATURES
+from .model_store import run_parallel
+
+# scikit-learn and scipy.optimize are imported where estimators are built or
+# fitted, so loading this module (and the compact prediction path) stays cheap
+
 logger = logging.getLogger(__name__)
 
+# Input columns (in feature order) and output column for each prediction target
+TARGET_COLUMNS = {
+    'time': (['temperature', 'yeast_concentration'], 'fermentation_time'),
+    'temperature': (['fermentation_time', 'yeast_concentration'], 'temperature'),
+    'yeast': (['fermentation_time', 'temperature'], 'yeast_concentration')
+}
+
+def prepare_datasets(temp: np.ndarray, yeast: np.ndarray,
+                     time: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Build (X, y) pairs for each prediction target."""
+    return {
+        'time': (np.column_stack([temp, yeast]), time),  # Predict time from temp, yeast
+        'temperature': (np.column_stack([time, yeast]), temp),  # Predict temp from time, yeast
+        'yeast': (np.column_stack([time, temp]), yeast)  # Predict yeast from time, temp
+    }
+
+class AggregatedDataset(NamedTuple):
+    """Training rows with duplicate inputs merged.
+    
+    ``X`` holds each distinct input row once (float32 when that keeps every
+    row distinct), ``y`` the mean target of its observations, ``counts`` how
+    many observations it stands for and ``variance`` their (population)
+    variance. Fitting on ``X``, ``y`` with ``counts`` as sample weights gives
+    the same least-squares fit as the full data.
+    """
+    X: np.ndarray
+    y: np.ndarray
+    counts: np.ndarray
+    variance: np.ndarray
+    
+    @property
+    def n_observations(self) -> int:
+        return int(self.counts.sum())
+
+def aggregate_dataset(X: np.ndarray, y: np.ndarray) -> AggregatedDataset:
+    """Merge observations with identical input rows (see AggregatedDataset)."""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    unique, rows, counts = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+    rows = rows.ravel()
+    
+    means = np.bincount(rows, weights=y) / counts
+    deviations = y - means[rows]
+    variance = np.bincount(rows, weights=deviations * deviations) / counts
+    
+    narrow = unique.astype(np.float32)
+    if len(np.unique(narrow, axis=0)) == len(unique):
+        unique = narrow
+    return AggregatedDataset(unique, means, counts.astype(np.int32), variance.astype(np.float32))
+
+def prepare_aggregated_datasets(temp: np.ndarray, yeast: np.ndarray,
+                                time: np.ndarray) -> Dict[str, AggregatedDataset]:
+    """Aggregated training rows for each prediction target."""
+    return {target: aggregate_dataset(X, y)
+            for target, (X, y) in prepare_datasets(temp, yeast, time).items()}
+
 class FermentationModel:
     """Base class for fermentation models."""
     
+    # Relative step for central-difference gradients
+    gradient_step = 1e-4
+    
     def __init__(self, name: str):
         self.name = name
         self.model = None
         self.is_fitted = False
         
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        """Fit the model to training data."""
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        """Fit the model to training data, optionally weighting each row."""
         raise NotImplementedError
         
     def predict(self, X: np.ndarray) -> np.ndarray:
@@ -31,6 +92,40 @@ class FermentationModel:
             raise ValueError("Model must be fitted before making predictions")
         return self.model.predict(X)
     
+    def value_and_gradient(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predictions and their gradient with respect to each input column.
+        
+        Uses central differences with a step of ``gradient_step`` relative to
+        each input, evaluated together with the predictions in a single
+        ``predict`` call. Subclasses override this with analytic derivatives.
+        
+        Returns:
+            Tuple of predictions (n,) and gradients (n, n_features)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        n, n_features = X.shape
+        steps = self.gradient_step * np.maximum(np.abs(X), 1e-3)
+        
+        shifted = np.repeat(X[None, :, :], 2 * n_features + 1, axis=0)
+        for col in range(n_features):
+            shifted[2 * col + 1, :, col] += steps[:, col]
+            shifted[2 * col + 2, :, col] -= steps[:, col]
+        
+        values = self.predict(shifted.reshape(-1, n_features)).reshape(2 * n_features + 1, n)
+        gradient = (values[1::2] - values[2::2]).T / (2 * steps)
+        return values[0], gradient
+    
+    def gradient(self, X: np.ndarray) -> np.ndarray:
+        """Gradient of the predictions with respect to each input column."""
+        return self.value_and_gradient(X)[1]
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        """Kernel name and parameter arrays for NumPy-only prediction.
+        
+        Returns None for models without a compact form.
+        """
+        return None
+    
     def save(self, filepath: str):
         """Save the fitted model."""
         joblib.dump(self.model, filepath)
@@ -46,18 +141,30 @@ class LinearModel(FermentationModel):
     """Linear regression model."""
     
     def __init__(self):
+        from sklearn.linear_model import LinearRegression
         super().__init__("Linear")
         self.model = LinearRegression()
     
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        self.model.fit(X, y)
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        self.model.fit(X, y, sample_weight=sample_weight)
         self.is_fitted = True
         logger.info("Linear model fitted")
+    
+    def value_and_gradient(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predictions and the (constant) coefficient gradient."""
+        X = np.asarray(X, dtype=np.float64)
+        return self.predict(X), np.broadcast_to(self.model.coef_, X.shape).copy()
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        return 'linear', {'coef': self.model.coef_, 'intercept': np.asarray(self.model.intercept_)}
 
 class PolynomialModel(FermentationModel):
     """Polynomial regression model."""
     
     def __init__(self, degree: int = 2):
+        from sklearn.linear_model import LinearRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import PolynomialFeatures
         super().__init__(f"Polynomial_degree_{degree}")
         self.degree = degree
         self.model = Pipeline([
@@ -65,15 +172,45 @@ class PolynomialModel(FermentationModel):
             ('linear', LinearRegression())
         ])
     
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        self.model.fit(X, y)
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        self.model.fit(X, y, linear__sample_weight=sample_weight)
         self.is_fitted = True
         logger.info(f"Polynomial model (degree {self.degree}) fitted")
+    
+    def value_and_gradient(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predictions and analytic gradient of the fitted polynomial."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        
+        X = np.asarray(X, dtype=np.float64)
+        powers = self.model.named_steps['poly'].powers_  # (n_terms, n_features)
+        coef = self.model.named_steps['linear'].coef_
+        
+        gradient = np.empty_like(X)
+        for col in range(X.shape[1]):
+            # d/dx_col of prod_k x_k^p_k = p_col * x_col^(p_col - 1) * prod_{k != col} x_k^p_k
+            reduced = powers.copy()
+            reduced[:, col] = np.maximum(reduced[:, col] - 1, 0)
+            terms = np.prod(X[:, None, :] ** reduced[None, :, :], axis=2)
+            gradient[:, col] = terms @ (coef * powers[:, col])
+        return self.predict(X), gradient
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        linear = self.model.named_steps['linear']
+        return 'polynomial', {
+            'powers': self.model.named_steps['poly'].powers_,
+            'coef': linear.coef_,
+            'intercept': np.asarray(linear.intercept_)
+        }
 
 class RandomForestModel(FermentationModel):
     """Random Forest regression model."""
     
+    # Piecewise-constant predictions: difference across several leaves
+    gradient_step = 0.05
+    
     def __init__(self, n_estimators: int = 100, random_state: int = 42):
+        from sklearn.ensemble import RandomForestRegressor
         super().__init__("RandomForest")
         self.model = RandomForestRegressor(
             n_estimators=n_estimators, 
@@ -81,10 +218,37 @@ class RandomForestModel(FermentationModel):
             n_jobs=-1
         )
     
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        self.model.fit(X, y)
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        self.model.fit(X, y, sample_weight=sample_weight)
         self.is_fitted = True
         logger.info("Random Forest model fitted")
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        """All trees' node arrays concatenated, child indices offset to match.
+        
+        Leaves become self-loops with an infinite threshold (see ``compact.forest``).
+        """
+        trees = [estimator.tree_ for estimator in self.model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        
+        def stacked(attribute: str) -> np.ndarray:
+            return np.concatenate([getattr(tree, attribute) for tree in trees])
+        
+        leaf = stacked('children_left') < 0
+        nodes = np.arange(len(leaf))
+        left = stacked('children_left') + np.repeat(offsets, sizes)
+        right = stacked('children_right') + np.repeat(offsets, sizes)
+        
+        return 'forest', {
+            'roots': offsets.astype(np.int32),
+            'children': np.concatenate([np.where(leaf, nodes, right),
+                                        np.where(leaf, nodes, left)]).astype(np.int32),
+            'feature': np.where(leaf, 0, stacked('feature')).astype(np.int32),
+            'threshold': np.where(leaf, np.inf, stacked('threshold')),
+            'value': np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+            'depth': np.asarray(max(tree.max_depth for tree in trees))
+        }
 
 class ArrheniusModel(FermentationModel):
     """Arrhenius kinetics model: Time = A * exp(Ea/(R*T)) * (Yeast%)^(-n)"""
@@ -92,21 +256,16 @@ class ArrheniusModel(FermentationModel):
     def __init__(self):
         super().__init__("Arrhenius")
         self.params = None
-        self.R = 8.314  # Gas constant J/(mol*K)
+        self.R = compact.GAS_CONSTANT  # Gas constant J/(mol*K)
     
     def _arrhenius_func(self, X: np.ndarray, A: float, Ea: float, n: float) -> np.ndarray:
         """Arrhenius function: Time = A * exp(Ea/(R*T)) * (Yeast%)^(-n)"""
-        temp_kelvin = X[:, 0] + 273.15  # Convert Celsius to Kelvin
-        yeast_pct = X[:, 1]
-        
-        # Avoid division by zero and negative values
-        temp_kelvin = np.maximum(temp_kelvin, 273.15)
-        yeast_pct = np.maximum(yeast_pct, 0.001)
-        
-        return A * np.exp(Ea / (self.R * temp_kelvin)) * (yeast_pct ** (-n))
+        return compact.arrhenius(X, A, Ea, n, self.R)
     
-    def fit(self, X: np.ndarray, y: np.ndarray):
-        """Fit Arrhenius model using curve fitting."""
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        """Fit Arrhenius model using curve fitting (weights scale each squared residual)."""
+        from scipy.optimize import curve_fit
+        sigma = None if sample_weight is None else 1.0 / np.sqrt(sample_weight)
         try:
             # Initial parameter guesses
             p0 = [1e-6, 50000, 0.5]  # A, Ea (J/mol), n
@@ -119,7 +278,7 @@ class ArrheniusModel(FermentationModel):
                 warnings.simplefilter("ignore")
                 popt, _ = curve_fit(
                     self._arrhenius_func, X, y, 
-                    p0=p0, bounds=bounds, 
+                    p0=p0, bounds=bounds, sigma=sigma,
                     maxfev=10000
                 )
             
@@ -130,15 +289,18 @@ class ArrheniusModel(FermentationModel):
         except Exception as e:
             logger.error(f"Failed to fit Arrhenius model: {e}")
             # Fallback to simple exponential model
-            self._fit_simple_exponential(X, y)
+            self._fit_simple_exponential(X, y, sigma)
     
-    def _fit_simple_exponential(self, X: np.ndarray, y: np.ndarray):
+    def _fit_simple_exponential(self, X: np.ndarray, y: np.ndarray,
+                                sigma: Optional[np.ndarray] = None):
         """Fallback to simple exponential model."""
+        from scipy.optimize import curve_fit
+        
         def simple_func(X, a, b, c):
             return a * np.exp(b / (X[:, 0] + 273.15)) * (X[:, 1] ** c)
         
         try:
-            popt, _ = curve_fit(simple_func, X, y, p0=[1e-3, 1000, -0.5])
+            popt, _ = curve_fit(simple_func, X, y, p0=[1e-3, 1000, -0.5], sigma=sigma)
             self.params = [popt[0], popt[1], -popt[2]]
             self.is_fitted = True
             logger.info("Fitted simplified exponential model")
@@ -154,36 +316,393 @@ class ArrheniusModel(FermentationModel):
             raise ValueError("Model must be fitted before making predictions")
         
         return self._arrhenius_func(X, *self.params)
+    
+    def value_and_gradient(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predictions and analytic gradient of the Arrhenius function."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        
+        X = np.asarray(X, dtype=np.float64)
+        _, Ea, n = self.params
+        values = self._arrhenius_func(X, *self.params)
+        temp_kelvin = X[:, 0] + 273.15
+        yeast_pct = X[:, 1]
+        
+        # Zero where the inputs are clamped
+        gradient = np.column_stack([
+            np.where(temp_kelvin > 273.15, -values * Ea / (self.R * temp_kelvin ** 2), 0.0),
+            np.where(yeast_pct > 0.001, -n * values / np.maximum(yeast_pct, 0.001), 0.0)
+        ])
+        return values, gradient
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        A, Ea, n = self.params
+        return 'arrhenius', {'A': np.asarray(A), 'Ea': np.asarray(Ea), 'n': np.asarray(n),
+                             'R': np.asarray(self.R)}
+    
+    def save(self, filepath: str):
+        """Save the fitted parameters (there is no estimator object)."""
+        joblib.dump(np.asarray(self.params, dtype=np.float64), filepath)
+        logger.info(f"Model saved to {filepath}")
+    
+    def load(self, filepath: str):
+        """Load fitted parameters; files from before parameters were saved hold None."""
+        params = joblib.load(filepath)
+        self.params = None if params is None else [float(p) for p in params]
+        self.is_fitted = self.params is not None
+        logger.info(f"Model loaded from {filepath}")
+
+class PowerLawModel(FermentationModel):
+    """Per-temperature power law: Time = a(T) * (Yeast%)^(-n(T)).
+    
+    Every temperature present in the data gets its own log-log least-squares
+    line, solved for all temperatures at once from grouped sums. log a(T)
+    and n(T) are then smoothed across temperature with polynomials of degree
+    ``smoothing_degree``, weighted by the number of observations at each
+    temperature, so the fitted model is just two short coefficient vectors.
+    """
+    
+    def __init__(self, smoothing_degree: int = 2):
+        super().__init__("PowerLaw")
+        self.smoothing_degree = smoothing_degree
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        """Fit per-temperature power laws and smooth them across temperature."""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if np.any(X[:, 1] <= 0) or np.any(y <= 0):
+            raise ValueError("Power-law fitting needs positive yeast and times")
+        
+        temperatures, groups = np.unique(X[:, 0], return_inverse=True)
+        groups = groups.ravel()
+        w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        x, v = np.log(X[:, 1]), np.log(y)
+        
+        n = np.bincount(groups, weights=w)
+        sx, sv = np.bincount(groups, weights=w * x), np.bincount(groups, weights=w * v)
+        sxx, sxv = np.bincount(groups, weights=w * x * x), np.bincount(groups, weights=w * x * v)
+        denominator = n * sxx - sx * sx
+        
+        usable = (n >= 2) & (denominator > 1e-12 * np.maximum(n * sxx, 1.0))
+        if np.count_nonzero(usable) <= self.smoothing_degree:
+            raise ValueError(f"Power-law fitting needs at least {self.smoothing_degree + 1} "
+                             f"temperatures with two or more yeast levels")
+        
+        slope = (n[usable] * sxv[usable] - sx[usable] * sv[usable]) / denominator[usable]
+        log_a = (sv[usable] - slope * sx[usable]) / n[usable]
+        
+        weights = np.sqrt(n[usable])
+        self.model = {
+            'log_a': np.polyfit(temperatures[usable], log_a, self.smoothing_degree, w=weights),
+            'exponent': np.polyfit(temperatures[usable], -slope, self.smoothing_degree, w=weights)
+        }
+        self.is_fitted = True
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Make predictions from the smoothed power laws."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        
+        return compact.power_law(np.asarray(X, dtype=np.float64), **self.model)
+    
+    def value_and_gradient(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predictions and analytic gradient of the smoothed power law."""
+        X = np.asarray(X, dtype=np.float64)
+        values = self.predict(X)
+        log_yeast = np.log(np.maximum(X[:, 1], 1e-12))
+        d_log_a = np.polyval(np.polyder(self.model['log_a']), X[:, 0])
+        d_exponent = np.polyval(np.polyder(self.model['exponent']), X[:, 0])
+        exponent = np.polyval(self.model['exponent'], X[:, 0])
+        
+        gradient = np.column_stack([
+            values * (d_log_a - d_exponent * log_yeast),
+            -exponent * values / np.maximum(X[:, 1], 1e-12)
+        ])
+        return values, gradient
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        return 'power_law', dict(self.model)
+
+class GridInterpolationModel(FermentationModel):
+    """Interpolation on the measured temperature x yeast grid.
+    
+    The training data is a table of fermentation times with temperatures in
+    rows and yeast concentrations in columns. The table is rebuilt from the
+    observations in log-time, blanks are filled by a least-squares line of
+    log-time against log-yeast along each row (a per-temperature power law),
+    or along the column for rows with fewer than two observations, and
+    predictions interpolate bilinearly in (temperature, log-yeast). Cells are
+    located with ``searchsorted`` on the sorted axes. Inputs outside the
+    table are clamped to its edge.
+    
+    Only suitable for the time target: fitting raises ValueError when the
+    inputs do not form a reasonably filled grid.
+    """
+    
+    def __init__(self, min_fill: float = 0.25):
+        super().__init__("GridInterpolation")
+        self.min_fill = min_fill
+    
+    @staticmethod
+    def _line_fill(x: np.ndarray, table: np.ndarray) -> np.ndarray:
+        """Fill NaNs in each row with a least-squares line in x, vectorized over rows."""
+        observed = ~np.isnan(table)
+        values = np.where(observed, table, 0.0)
+        xs = np.where(observed, x, 0.0)
+        
+        n = observed.sum(axis=1)
+        sx, sy = xs.sum(axis=1), values.sum(axis=1)
+        sxx, sxy = (xs * xs).sum(axis=1), (xs * values).sum(axis=1)
+        denominator = n * sxx - sx * sx
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = (n * sxy - sx * sy) / denominator
+            intercept = (sy - slope * sx) / n
+        fitted = intercept[:, None] + slope[:, None] * x
+        usable = (n >= 2)[:, None] & (denominator > 0)[:, None]
+        return np.where(observed, table, np.where(usable, fitted, np.nan))
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        """Build and fill the log-time table."""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if np.any(X[:, 1] <= 0) or np.any(y <= 0):
+            raise ValueError("Grid interpolation needs positive yeast and times")
+        
+        temperatures, rows = np.unique(X[:, 0], return_inverse=True)
+        yeast, columns = np.unique(X[:, 1], return_inverse=True)
+        shape = (len(temperatures), len(yeast))
+        if min(shape) < 2:
+            raise ValueError("Grid interpolation needs at least two temperatures and yeast levels")
+        
+        # Mean log-time per cell
+        cells = rows.ravel() * shape[1] + columns.ravel()
+        w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        counts = np.bincount(cells, weights=w, minlength=shape[0] * shape[1])
+        sums = np.bincount(cells, weights=w * np.log(y), minlength=shape[0] * shape[1])
+        fill = np.count_nonzero(counts) / counts.size
+        if fill < self.min_fill:
+            raise ValueError(f"Inputs are too sparse for grid interpolation "
+                             f"({fill:.0%} of {shape[0]}x{shape[1]} cells observed)")
+        
+        with np.errstate(invalid='ignore'):
+            table = (sums / counts).reshape(shape)
+        
+        log_yeast = np.log(yeast)
+        table = self._line_fill(log_yeast, table)
+        if np.isnan(table).any():
+            table = self._line_fill(temperatures, table.T).T
+        if np.isnan(table).any():
+            raise ValueError("Grid too sparse to fill all blanks")
+        
+        self.model = {
+            'temperatures': temperatures,
+            'log_yeast': log_yeast,
+            'log_time': table
+        }
+        self.is_fitted = True
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Bilinear interpolation of log-time in (temperature, log-yeast)."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        
+        return compact.grid_interpolation(np.asarray(X, dtype=np.float64), **self.model)
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        return 'grid_interpolation', dict(self.model)
+
+class InterpolationSurrogate(FermentationModel):
+    """Dense lookup table compiled from another model.
+
+    The source model is evaluated once on a ``resolution`` x ``resolution``
+    grid spanning the observed input box, with axes in log space where
+    ``LOG_FEATURES`` says so (yeast, time). Predictions interpolate the table
+    bilinearly, which costs a few array reads per row whatever the source
+    model is; inputs outside the box are clamped to its edge.
+
+    At build time the table is checked against the source model at every
+    cell centre, where bilinear interpolation is least accurate, and at the
+    training inputs. The largest absolute and relative deviations are kept as
+    ``error_bound`` and ``relative_error_bound``. Step-shaped sources such as
+    random forests keep large bounds near their steps.
+    """
+    
+    def __init__(self, source_name: str = ""):
+        super().__init__(f"Surrogate_{source_name}")
+        self.source_name = source_name
+        self.table = None
+        self.lower = None
+        self.upper = None
+        self.log_features = (False, False)
+        self.error_bound = np.inf
+        self.relative_error_bound = np.inf
+    
+    def _axes(self, X: np.ndarray) -> np.ndarray:
+        U = np.array(X, dtype=np.float64, ndmin=2)
+        for col, use_log in enumerate(self.log_features):
+            if use_log:
+                U[:, col] = np.log(np.maximum(U[:, col], 1e-6))
+        return U
+    
+    def _grid(self, resolution: int) -> list:
+        return [np.linspace(self.lower[col], self.upper[col], resolution) for col in range(2)]
+    
+    def _features(self, U: np.ndarray) -> np.ndarray:
+        X = U.copy()
+        for col, use_log in enumerate(self.log_features):
+            if use_log:
+                X[:, col] = np.exp(X[:, col])
+        return X
+    
+    def build(self, source: FermentationModel, X: np.ndarray, target: str,
+              resolution: int = 256) -> 'InterpolationSurrogate':
+        """Tabulate a fitted source model over the box spanned by training inputs X."""
+        self.source_name = source.name
+        self.name = f"Surrogate_{source.name}"
+        self.log_features = LOG_FEATURES.get(target, (False, False))
+        
+        U = self._axes(X)
+        self.lower, self.upper = U.min(axis=0), U.max(axis=0)
+        
+        axis_0, axis_1 = self._grid(resolution)
+        grid = np.column_stack([np.repeat(axis_0, resolution), np.tile(axis_1, resolution)])
+        self.table = source.predict(self._features(grid)).reshape(resolution, resolution)
+        self.is_fitted = True
+        
+        # Error bound at cell centres and training inputs
+        centre_0 = 0.5 * (axis_0[1:] + axis_0[:-1])
+        centre_1 = 0.5 * (axis_1[1:] + axis_1[:-1])
+        centres = np.column_stack([np.repeat(centre_0, len(centre_1)),
+                                   np.tile(centre_1, len(centre_0))])
+        check = np.vstack([self._features(centres), np.asarray(X, dtype=np.float64)])
+        expected = source.predict(check)
+        error = np.abs(self.predict(check) - expected)
+        # Relative to the prediction, floored at 1% of the table's range so
+        # predictions near zero don't dominate
+        floor = max(0.01 * float(np.ptp(self.table)), 1e-12)
+        self.error_bound = float(error.max())
+        self.relative_error_bound = float((error / np.maximum(np.abs(expected), floor)).max())
+        
+        logger.info(f"Compiled {resolution}x{resolution} surrogate of {source.name} for {target}: "
+                    f"max error {self.error_bound:.3g} ({self.relative_error_bound:.2%})")
+        return self
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        raise NotImplementedError("Surrogates are built from a fitted model, use build()")
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Bilinear interpolation in the lookup table."""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before making predictions")
+        
+        return compact.table_interpolation(X, **self.compact()[1])
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        return 'table_interpolation', {
+            'table': self.table,
+            'lower': self.lower,
+            'upper': self.upper,
+            'log_features': np.array(self.log_features)
+        }
+    
+    def save(self, filepath: str):
+        """Save the table as .npy (memory-mappable) with metadata in .npz."""
+        path = Path(filepath)
+        np.save(path.with_suffix('.npy'), self.table)
+        np.savez(path.with_suffix('.npz'),
+                 source_name=np.array(self.source_name),
+                 lower=self.lower, upper=self.upper,
+                 log_features=np.array(self.log_features),
+                 error_bound=np.array(self.error_bound),
+                 relative_error_bound=np.array(self.relative_error_bound))
+        logger.info(f"Surrogate saved to {path.with_suffix('.npy')}")
+    
+    def load(self, filepath: str):
+        """Load metadata and memory-map the table."""
+        path = Path(filepath)
+        with np.load(path.with_suffix('.npz')) as meta:
+            self.source_name = str(meta['source_name'])
+            self.lower, self.upper = meta['lower'], meta['upper']
+            self.log_features = tuple(bool(v) for v in meta['log_features'])
+            self.error_bound = float(meta['error_bound'])
+            self.relative_error_bound = float(meta['relative_error_bound'])
+        self.name = f"Surrogate_{self.source_name}"
+        self.table = np.load(path.with_suffix('.npy'), mmap_mode='r')
+        self.is_fitted = True
+        logger.info(f"Surrogate loaded from {path.with_suffix('.npy')}")
+
+class SharedModel(FermentationModel):
+    """Read-only model predicting through a compact kernel.
+    
+    The parameter arrays are typically views of the memory-mapped compact
+    artifact, so every process serving from the same model directory shares
+    them. Built by ``ModelManager.load_shared_models``; cannot be fitted or
+    saved.
+    """
+    
+    def __init__(self, compact_model: 'compact.CompactModel', source_name: Optional[str] = None,
+                 relative_error_bound: Optional[float] = None):
+        super().__init__(compact_model.name)
+        self.kind = compact_model.kind
+        self.arrays = compact_model.arrays
+        self.is_fitted = True
+        if self.kind == 'forest':
+            self.gradient_step = RandomForestModel.gradient_step
+        # Surrogates carry their source model and error bound
+        if source_name is not None:
+            self.source_name = source_name
+            self.relative_error_bound = relative_error_bound
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None):
+        raise NotImplementedError("Shared models are read-only; train the full models instead")
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return compact.KERNELS[self.kind](np.asarray(X, dtype=np.float64), **self.arrays)
+    
+    def compact(self) -> Optional[Tuple[str, Dict[str, np.ndarray]]]:
+        return self.kind, dict(self.arrays)
+    
+    def save(self, filepath: str):
+        raise NotImplementedError("Shared models are saved with save_compact_models")
 
 class ModelManager:
     """Manage multiple fermentation models."""
     
-    def __init__(self):
+    def __init__(self, surrogate_tolerance: Optional[float] = None,
+                 surrogate_resolution: int = 256):
         self.models = {
             'time': {},
             'temperature': {},
             'yeast': {}
         }
         self.best_models = {}
+        # Lookup-table surrogates replace the best model when their relative
+        # error bound is within surrogate_tolerance (None disables them)
+        self.surrogate_tolerance = surrogate_tolerance
+        self.surrogate_resolution = surrogate_resolution
+        self.surrogates: Dict[str, InterpolationSurrogate] = {}
     
-    def train_all_models(self, temp: np.ndarray, yeast: np.ndarray, time: np.ndarray):
-        """Train all models for all prediction types."""
-        
-        # Prepare data for different prediction tasks
-        X_time = np.column_stack([temp, yeast])  # Predict time from temp, yeast
-        X_temp = np.column_stack([time, yeast])  # Predict temp from time, yeast
-        X_yeast = np.column_stack([time, temp])  # Predict yeast from time, temp
-        
-        # Train models for time prediction
-        self._train_model_set('time', X_time, time)
+    def train_all_models(self, temp: np.ndarray, yeast: np.ndarray, time: np.ndarray,
+                         targets: Optional[List[str]] = None, aggregate: bool = False):
+        """Train all models for all prediction types, or only the given targets.
         
-        # Train models for temperature prediction
-        self._train_model_set('temperature', X_temp, temp)
-        
-        # Train models for yeast prediction
-        self._train_model_set('yeast', X_yeast, yeast)
+        With ``aggregate``, observations with identical inputs are merged
+        first (see aggregate_dataset) and the models are fitted on the
+        distinct rows weighted by their counts.
+        """
+        for target, (X, y) in prepare_datasets(temp, yeast, time).items():
+            if targets is not None and target not in targets:
+                continue
+            counts = None
+            if aggregate:
+                X, y, counts, _ = aggregate_dataset(X, y)
+                logger.info(f"Aggregated {counts.sum()} {target} observations "
+                            f"into {len(y)} distinct rows")
+            self._train_model_set(target, np.asarray(X, dtype=np.float64), y, counts)
     
-    def _train_model_set(self, target: str, X: np.ndarray, y: np.ndarray):
+    def _train_model_set(self, target: str, X: np.ndarray, y: np.ndarray,
+                         sample_weight: Optional[np.ndarray] = None):
         """Train a set of models for a specific target."""
         logger.info(f"Training models for {target} prediction")
         
@@ -194,13 +713,15 @@ class ModelManager:
             RandomForestModel()
         ]
         
-        # Add Arrhenius model only for time prediction
+        # Add the time-specific models only for time prediction
         if target == 'time':
             models_to_train.append(ArrheniusModel())
+            models_to_train.append(PowerLawModel())
+            models_to_train.append(GridInterpolationModel())
         
         for model in models_to_train:
             try:
-                model.fit(X, y)
+                model.fit(X, y, sample_weight)
                 self.models[target][model.name] = model
                 logger.info(f"Successfully trained {model.name} for {target}")
             except Exception as e:
@@ -219,23 +740,79 @@ class ModelManager:
         
         return self.best_models[target]
     
-    def save_models(self, directory: str):
-        """Save all trained models."""
+    def compile_surrogates(self, datasets: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """Compile the best model of each target into a lookup-table surrogate.
+        
+        Args:
+            datasets: (X, y) per target, as returned by prepare_datasets; X
+                defines the input box the table covers
+        """
+        self.surrogates = {}
+        for target, (X, _) in datasets.items():
+            if not self.models.get(target):
+                continue
+            source = self.get_best_model(target)
+            if isinstance(source, InterpolationSurrogate):
+                source = self.models[target].get(source.source_name, source)
+            try:
+                self.surrogates[target] = InterpolationSurrogate().build(
+                    source, X, target, self.surrogate_resolution
+                )
+            except Exception as e:
+                logger.error(f"Failed to compile surrogate for {target}: {e}")
+        self.select_surrogates()
+    
+    def select_surrogates(self):
+        """Use surrogates whose error bound is within tolerance in place of their source model."""
+        if self.surrogate_tolerance is None:
+            return
+        for target, surrogate in self.surrogates.items():
+            source = self.models.get(target, {}).get(surrogate.source_name)
+            current = self.best_models.get(target)
+            if source is None or current not in (source, surrogate):
+                continue
+            if surrogate.relative_error_bound <= self.surrogate_tolerance:
+                self.best_models[target] = surrogate
+                logger.info(f"Using surrogate for {target} "
+                            f"(error bound {surrogate.relative_error_bound:.2%})")
+            else:
+                self.best_models[target] = source
+                logger.info(f"Surrogate for {target} exceeds tolerance "
+                            f"({surrogate.relative_error_bound:.2%}), keeping {source.name}")
+    
+    def save_tasks(self, directory: str) -> List[Callable[[], None]]:
+        """One task per model or surrogate file, for writing them in parallel."""
+        save_dir = Path(directory)
+        tasks = [
+            functools.partial(model.save, str(save_dir / f"{target}_{model_name}.joblib"))
+            for target, model_dict in self.models.items()
+            for model_name, model in model_dict.items()
+        ]
+        tasks += [
+            functools.partial(surrogate.save, str(save_dir / f"{target}_surrogate.npy"))
+            for target, surrogate in self.surrogates.items()
+        ]
+        return tasks
+    
+    def save_models(self, directory: str, n_jobs: Optional[int] = None):
+        """Save all trained models, writing the files in parallel."""
         save_dir = Path(directory)
         save_dir.mkdir(exist_ok=True)
-        
-        for target, model_dict in self.models.items():
-            for model_name, model in model_dict.items():
-                filepath = save_dir / f"{target}_{model_name}.joblib"
-                model.save(str(filepath))
+        run_parallel(self.save_tasks(directory), n_jobs)
     
-    def load_models(self, directory: str):
-        """Load saved models."""
+    def load_models(self, directory: str, n_jobs: Optional[int] = None):
+        """Load saved models in parallel.
+        
+        Models are read into memory: scikit-learn copies the node arrays of
+        unpickled trees, so memory-mapping the random forests saves nothing.
+        Use ``load_shared_models`` to serve them from the memory-mapped arena.
+        """
         load_dir = Path(directory)
         if not load_dir.exists():
             raise FileNotFoundError(f"Model directory not found: {directory}")
         
-        for model_file in load_dir.glob("*.joblib"):
+        entries = []
+        for model_file in sorted(load_dir.glob("*.joblib")):
             parts = model_file.stem.split('_', 1)
             if len(parts) == 2:
                 target, model_name = parts
@@ -250,8 +827,46 @@ class ModelManager:
                         model = RandomForestModel()
                     elif model_name == 'Arrhenius':
                         model = ArrheniusModel()
+                    elif model_name == 'PowerLaw':
+                        model = PowerLawModel()
+                    elif model_name == 'GridInterpolation':
+                        model = GridInterpolationModel()
                     else:
                         continue
                     
-                    model.load(str(model_file))
-                    self.models[target][model_name] = model
\ No newline at end of file
+                    entries.append((target, model_name, model,
+                                    functools.partial(model.load, str(model_file))))
+        
+        surrogates = []
+        for table_file in sorted(load_dir.glob("*_surrogate.npy")):
+            target = table_file.stem.rsplit('_', 1)[0]
+            if target in self.models and table_file.with_suffix('.npz').exists():
+                surrogate = InterpolationSurrogate()
+                surrogates.append((target, surrogate,
+                                   functools.partial(surrogate.load, str(table_file))))
+        
+        run_parallel([task for *_, task in entries] + [task for *_, task in surrogates], n_jobs)
+        
+        # Registered afterwards, in file order, so the default best model is deterministic
+        for target, model_name, model, _ in entries:
+            self.models[target][model_name] = model
+        for target, surrogate, _ in surrogates:
+            self.surrogates[target] = surrogate
+    
+    def load_shared_models(self, directory: str):
+        """Load the compact artifact as read-only, memory-mapped shared models.
+        
+        Only the exported models are available: the calibrated model of each
+        target and its surrogate. Nothing is unpickled and the arrays are not
+        copied, so forked or separately started workers add almost no memory.
+        """
+        models, surrogates, bounds = compact.load_compact_models(directory, mmap=True)
+        for target, model in models.items():
+            if target not in self.models:
+                continue
+            self.models[target][model.name] = SharedModel(model)
+            self.best_models[target] = self.models[target][model.name]
+            if target in surrogates:
+                self.surrogates[target] = SharedModel(surrogates[target], model.name,
+                                                      bounds[target])
+        self.select_surrogates()
\ No newline at end of file
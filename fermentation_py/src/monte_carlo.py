@@ -0,0 +1,158 @@
+import numpy as np
+from joblib import Parallel, delayed
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+
+from .models import FermentationModel
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ('uniform', 'normal')
+
+class MonteCarloPropagator:
+    """Propagate input uncertainty through the time model by Monte Carlo sampling.
+
+    Temperature drift is sampled in absolute degrees and yeast dosing error
+    relative to the dose, either uniformly within ± tolerance or normally with
+    the tolerance as standard deviation. Optionally, model error is added by
+    resampling relative out-of-fold residuals.
+
+    Samples are drawn in blocks, each from its own child of a seeded
+    ``SeedSequence``, so results depend only on the seed and block size and
+    not on ``n_jobs``. Perturbed inputs are quantized (0.01°C and 0.1% of the
+    dose by default) so that a million samples collapse to a few thousand
+    distinct model evaluations.
+    """
+
+    def __init__(self, time_model: FermentationModel,
+                 relative_residuals: Optional[np.ndarray] = None,
+                 block_size: int = 1 << 16, n_jobs: int = 1,
+                 temperature_resolution: Optional[float] = 0.01,
+                 yeast_resolution: Optional[float] = 0.001):
+        self.time_model = time_model
+        self.relative_residuals = None if relative_residuals is None \
+            else np.asarray(relative_residuals, dtype=np.float64)
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+        self.temperature_resolution = temperature_resolution
+        self.yeast_resolution = yeast_resolution
+
+    def _perturbations(self, rng: np.random.Generator, size: int, tolerance: float,
+                       distribution: str) -> np.ndarray:
+        if tolerance == 0:
+            return np.zeros(size)
+        if distribution == 'uniform':
+            return rng.uniform(-tolerance, tolerance, size)
+        return rng.normal(0.0, tolerance, size)
+
+    def _sample_block(self, seed: np.random.SeedSequence, size: int, temperature: float,
+                      temperature_tolerance: float, yeast_tolerance: float, distribution: str,
+                      residual_noise: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample one block of temperatures, yeast dose factors and residual multipliers."""
+        rng = np.random.default_rng(seed)
+
+        temperatures = temperature + self._perturbations(rng, size, temperature_tolerance, distribution)
+        yeast_factors = np.maximum(
+            1.0 + self._perturbations(rng, size, yeast_tolerance, distribution), 0.0
+        )
+
+        if residual_noise and self.relative_residuals is not None and len(self.relative_residuals):
+            multipliers = 1.0 + rng.choice(self.relative_residuals, size)
+        else:
+            multipliers = np.ones(size)
+
+        return temperatures, yeast_factors, multipliers
+
+    def _predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict in chunks, in parallel when ``n_jobs`` allows."""
+        if self.n_jobs == 1 or len(X) <= self.block_size:
+            return self.time_model.predict(X)
+
+        chunks = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self.time_model.predict)(X[start:start + self.block_size])
+            for start in range(0, len(X), self.block_size)
+        )
+        return np.concatenate(chunks)
+
+    def _predict_quantized(self, temperatures: np.ndarray, yeast_factors: np.ndarray,
+                           yeast_concentration: float) -> np.ndarray:
+        """Predict on quantized inputs, evaluating each distinct grid cell once."""
+        t_index = np.rint(temperatures / self.temperature_resolution).astype(np.int64)
+        y_index = np.rint(yeast_factors / self.yeast_resolution).astype(np.int64)
+        t_min, y_min = t_index.min(), y_index.min()
+        y_span = y_index.max() - y_min + 1
+
+        keys, inverse = np.unique((t_index - t_min) * y_span + (y_index - y_min),
+                                  return_inverse=True)
+        inputs = np.column_stack([
+            (keys // y_span + t_min) * self.temperature_resolution,
+            yeast_concentration * (keys % y_span + y_min) * self.yeast_resolution
+        ])
+        logger.debug(f"Monte Carlo: {len(temperatures)} samples, {len(inputs)} distinct inputs")
+        return self._predict(inputs)[inverse.ravel()]
+
+    def sample_completion_times(self, temperature: float, yeast_concentration: float,
+                                n_samples: int = 1_000_000,
+                                temperature_tolerance: float = 2.0,
+                                yeast_tolerance: float = 0.05,
+                                distribution: str = 'uniform',
+                                residual_noise: bool = True,
+                                seed: int = 42) -> np.ndarray:
+        """Sample fermentation times under input and model uncertainty.
+
+        Args:
+            temperature: Nominal temperature in Celsius
+            yeast_concentration: Nominal yeast concentration in percent
+            n_samples: Number of Monte Carlo samples
+            temperature_tolerance: Temperature drift in °C (half-width or standard deviation)
+            yeast_tolerance: Relative dosing error (e.g. 0.05 for ±5%)
+            distribution: 'uniform' or 'normal'
+            residual_noise: Add resampled relative model residuals
+            seed: Seed for the random generator
+
+        Returns:
+            Array of sampled fermentation times in hours
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution}. Expected one of {DISTRIBUTIONS}")
+        if n_samples <= 0:
+            raise ValueError("Number of samples must be positive")
+
+        n_blocks = -(-n_samples // self.block_size)
+        seeds = np.random.SeedSequence(seed).spawn(n_blocks)
+        sizes = [min(self.block_size, n_samples - i * self.block_size) for i in range(n_blocks)]
+        args = (temperature, temperature_tolerance, yeast_tolerance, distribution, residual_noise)
+
+        if self.n_jobs == 1 or n_blocks == 1:
+            blocks = [self._sample_block(s, size, *args) for s, size in zip(seeds, sizes)]
+        else:
+            blocks = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                delayed(self._sample_block)(s, size, *args) for s, size in zip(seeds, sizes)
+            )
+
+        temperatures = np.concatenate([block[0] for block in blocks])
+        yeast_factors = np.concatenate([block[1] for block in blocks])
+        multipliers = np.concatenate([block[2] for block in blocks])
+
+        if self.temperature_resolution and self.yeast_resolution:
+            times = self._predict_quantized(temperatures, yeast_factors, yeast_concentration)
+        else:
+            times = self._predict(np.column_stack([temperatures, yeast_concentration * yeast_factors]))
+
+        return np.maximum(times * multipliers, 0.0)
+
+    def completion_time_quantiles(self, temperature: float, yeast_concentration: float,
+                                  quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+                                  **kwargs) -> Dict[str, float]:
+        """Summarize sampled fermentation times as quantiles, mean and standard deviation.
+
+        Keyword arguments are passed to ``sample_completion_times``.
+        """
+        samples = self.sample_completion_times(temperature, yeast_concentration, **kwargs)
+        values = np.quantile(samples, quantiles)
+
+        summary = {f"q{q * 100:g}": float(v) for q, v in zip(quantiles, values)}
+        summary['mean'] = float(samples.mean())
+        summary['std'] = float(samples.std())
+        summary['n_samples'] = len(samples)
+        return summary
@@ -0,0 +1,233 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+STORE_SUFFIXES = ('.sqlite', '.sqlite3', '.db')
+
+# Numeric columns that can be fetched into arrays
+OBSERVATION_COLUMNS = ('temperature', 'yeast_concentration', 'fermentation_time', 'observed_at')
+FEATURE_COLUMNS = OBSERVATION_COLUMNS[:3]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    temperature REAL NOT NULL,
+    yeast_concentration REAL NOT NULL,
+    fermentation_time REAL NOT NULL,
+    strain TEXT,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_temperature ON observations (temperature);
+CREATE INDEX IF NOT EXISTS idx_observations_yeast ON observations (yeast_concentration);
+CREATE INDEX IF NOT EXISTS idx_observations_strain ON observations (strain);
+CREATE INDEX IF NOT EXISTS idx_observations_observed_at ON observations (observed_at);
+"""
+
+_FETCH_BLOCK = 1 << 16
+
+Timestamp = Union[float, int, str, date, datetime]
+
+def is_store_path(path: str) -> bool:
+    """Whether a data path names an SQLite observation store."""
+    return Path(path).suffix.lower() in STORE_SUFFIXES
+
+def to_timestamp(value: Timestamp) -> float:
+    """Unix seconds from a number, an ISO 8601 string, a date or a datetime (naive is local)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    return float(value)
+
+class ObservationStore:
+    """Fermentation observations in a local SQLite database.
+
+    One row per observation: temperature (°C), yeast concentration (%),
+    fermentation time (hours), an optional strain and the time it was
+    observed (unix seconds). Temperature, yeast, strain and observation time
+    are indexed, so range queries read only the matching rows, and results
+    are fetched in blocks straight into float64 arrays.
+
+    ``add`` buffers single observations and writes them ``batch_size`` at a
+    time; ``append`` writes many rows in one transaction. Call ``flush`` (or
+    use the store as a context manager) to write the rest. Each call opens
+    its own connection, so one store can be used from several threads.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10_000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection committing on success, rolling back on error, closed afterwards."""
+        with closing(sqlite3.connect(self.path)) as conn:
+            with conn:
+                yield conn
+
+    def add(self, temperature: float, yeast_concentration: float, fermentation_time: float,
+            strain: Optional[str] = None, observed_at: Optional[Timestamp] = None):
+        """Buffer one observation; the buffer is written once it holds ``batch_size`` rows."""
+        row = (float(temperature), float(yeast_concentration), float(fermentation_time), strain,
+               time.time() if observed_at is None else to_timestamp(observed_at))
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) < self.batch_size:
+                return
+            rows, self._pending = self._pending, []
+        self._insert(rows)
+
+    def append(self, temperature: Sequence[float], yeast_concentration: Sequence[float],
+               fermentation_time: Sequence[float], strain: Union[None, str, Sequence[str]] = None,
+               observed_at: Union[None, Timestamp, Sequence[float]] = None) -> int:
+        """Write many observations in one transaction.
+
+        Args:
+            temperature, yeast_concentration, fermentation_time: Equal-length
+                sequences (or arrays)
+            strain: One strain for all rows or one per row
+            observed_at: One timestamp for all rows (default now) or unix
+                seconds per row
+
+        Returns:
+            Number of rows written
+        """
+        temperature = np.asarray(temperature, dtype=np.float64)
+        n_rows = len(temperature)
+        columns = [temperature,
+                   np.broadcast_to(np.asarray(yeast_concentration, dtype=np.float64), n_rows),
+                   np.broadcast_to(np.asarray(fermentation_time, dtype=np.float64), n_rows)]
+        if observed_at is None or np.ndim(observed_at) == 0:
+            stamp = time.time() if observed_at is None else to_timestamp(observed_at)
+            columns.append(np.full(n_rows, stamp))
+        else:
+            columns.append(np.asarray(observed_at, dtype=np.float64))
+        strains = [strain] * n_rows if strain is None or isinstance(strain, str) else list(strain)
+
+        rows = [(t, y, f, s, o) for (t, y, f, o), s in zip(np.column_stack(columns).tolist(), strains)]
+        self._insert(rows)
+        return len(rows)
+
+    def _insert(self, rows: List[Tuple]):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO observations (temperature, yeast_concentration, fermentation_time, "
+                "strain, observed_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        logger.debug(f"Wrote {len(rows)} observations to {self.path}")
+
+    def flush(self):
+        """Write buffered observations."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._insert(rows)
+
+    def __enter__(self) -> 'ObservationStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    @staticmethod
+    def _where(temperature_range: Optional[Tuple[float, float]] = None,
+               yeast_range: Optional[Tuple[float, float]] = None,
+               time_range: Optional[Tuple[float, float]] = None,
+               strain: Optional[str] = None, since: Optional[Timestamp] = None,
+               until: Optional[Timestamp] = None,
+               last_days: Optional[float] = None) -> Tuple[str, List]:
+        """SQL condition and parameters for the filters (ranges are inclusive)."""
+        conditions, params = [], []
+        for column, bounds in (('temperature', temperature_range),
+                               ('yeast_concentration', yeast_range),
+                               ('fermentation_time', time_range)):
+            if bounds is not None:
+                conditions.append(f"{column} BETWEEN ? AND ?")
+                params += [float(bounds[0]), float(bounds[1])]
+        if strain is not None:
+            conditions.append("strain = ?")
+            params.append(strain)
+        if last_days is not None:
+            conditions.append("observed_at >= ?")
+            params.append(time.time() - last_days * 86400.0)
+        if since is not None:
+            conditions.append("observed_at >= ?")
+            params.append(to_timestamp(since))
+        if until is not None:
+            conditions.append("observed_at < ?")
+            params.append(to_timestamp(until))
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def query(self, columns: Sequence[str] = FEATURE_COLUMNS, **filters) -> Dict[str, np.ndarray]:
+        """Observations matching the filters, as one float64 array per column.
+
+        Args:
+            columns: Columns to fetch, from ``OBSERVATION_COLUMNS``
+            **filters: ``temperature_range``, ``yeast_range`` and
+                ``time_range`` as inclusive (low, high) pairs, ``strain``,
+                ``since`` and ``until`` (unix seconds, ISO strings, dates or
+                datetimes; ``until`` is exclusive) and ``last_days``
+
+        Returns:
+            Dictionary of column name to array, in insertion order of the rows
+        """
+        unknown = set(columns) - set(OBSERVATION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown observation columns: {sorted(unknown)}")
+        where, params = self._where(**filters)
+
+        blocks = []
+        with self._connect() as conn:
+            cursor = conn.execute(f"SELECT {', '.join(columns)} FROM observations{where} "
+                                  f"ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(_FETCH_BLOCK)
+                if not rows:
+                    break
+                blocks.append(np.array(rows, dtype=np.float64))
+        data = np.concatenate(blocks) if blocks else np.empty((0, len(columns)))
+        return {column: np.ascontiguousarray(data[:, i]) for i, column in enumerate(columns)}
+
+    def count(self, **filters) -> int:
+        """Number of observations matching the filters (see ``query``)."""
+        where, params = self._where(**filters)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM observations{where}", params).fetchone()[0]
+
+    def strains(self) -> List[str]:
+        """Distinct strains recorded."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT strain FROM observations "
+                                "WHERE strain IS NOT NULL ORDER BY strain").fetchall()
+        return [row[0] for row in rows]
+
+    def import_csv(self, csv_path: str, strain: Optional[str] = None,
+                   observed_at: Optional[Timestamp] = None) -> int:
+        """Append the observations of a wide CSV table (as read by ``FermentationDataLoader``).
+
+        Outliers are kept; they are removed when the data is loaded for training.
+
+        Returns:
+            Number of rows written
+        """
+        from .data_loader import FermentationDataLoader
+
+        observations = FermentationDataLoader(csv_path).expand_table()
+        return self.append(*(observations[column].to_numpy() for column in FEATURE_COLUMNS),
+                           strain=strain, observed_at=observed_at)
@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, Union, TYPE_CHECKING
+import logging
+
+from .batch_results import PredictionBatch
+from .input_validation import TYPICAL_RANGES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Predictor of the current worker process, built once by _init_worker
+_worker_predictor = None
+
+def _init_worker(data_path: str, model_dir: str, options: dict):
+    """Load the models once per worker process."""
+    global _worker_predictor
+    from .predictor import FermentationPredictor
+
+    _worker_predictor = FermentationPredictor(data_path, model_dir, **options)
+    if not _worker_predictor.is_trained:
+        raise RuntimeError(f"No trained models found in {model_dir}")
+
+def _predict_chunk(chunk: 'pd.DataFrame', policy: Optional[str]) -> PredictionBatch:
+    return _worker_predictor.predict_batch(chunk, policy, as_frame=False)
+
+class ParallelBatchExecutor:
+    """Run ``predict_batch`` over very large inputs on a pool of processes.
+
+    The input is split into chunks of ``chunk_size`` rows that are predicted
+    by worker processes, each of which loads the predictor's saved models
+    once when it starts (memory-mapped with ``shared_models``, so the
+    workers share one copy of the model arrays). Results come back in input
+    order, and at most two chunks per worker are in flight, so a stream of
+    chunks never has to be held in memory at once.
+
+    Inputs below ``min_parallel_rows`` rows are predicted in-process, where
+    starting and feeding the pool would cost more than it saves. The pool is
+    started on first use and restarted when the predictor publishes new
+    models.
+    """
+
+    def __init__(self, predictor, n_workers: Optional[int] = None, chunk_size: int = 250_000,
+                 min_parallel_rows: int = 1_000_000, shared_models: bool = True):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.predictor = predictor
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_parallel_rows = min_parallel_rows
+        self.shared_models = shared_models
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_version: Optional[int] = None
+
+    def _use_pool(self, n_rows: Optional[int]) -> bool:
+        if self.n_workers < 2:
+            return False
+        if n_rows is not None and n_rows < self.min_parallel_rows:
+            return False
+        if not self.predictor.model_dir:
+            logger.warning("Predictor has no model directory to load workers from, "
+                           "predicting in-process")
+            return False
+        return True
+
+    def _worker_options(self) -> dict:
+        """Predictor settings the workers are rebuilt with."""
+        predictor = self.predictor
+        return {
+            'confidence_level': predictor.confidence_level,
+            'validation_policy': predictor.batch_validator.policy,
+            'inverse_mode': predictor.inverse_mode,
+            'surrogate_tolerance': predictor.surrogate_tolerance,
+            'shared_models': self.shared_models,
+            'data_filters': predictor.data_loader.filters,
+            'aggregate_training': predictor.aggregate_training,
+            'verify_checksums': predictor.verify_checksums
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Pool whose workers hold the predictor's current models."""
+        predictor = self.predictor
+        if not predictor.is_trained:
+            predictor.train_models()
+
+        if self._pool is not None and self._pool_version != predictor.model_version:
+            logger.info("Models changed, restarting prediction workers")
+            self.close()
+        if self._pool is None:
+            # Spawned, since forking a process with serving threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(str(predictor.data_path), str(predictor.model_dir), self._worker_options())
+            )
+            self._pool_version = predictor.model_version
+        return self._pool
+
+    def _chunks(self, data: Union['pd.DataFrame', Iterable['pd.DataFrame']]) -> Iterator['pd.DataFrame']:
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            for start in range(0, len(data), self.chunk_size):
+                yield data.iloc[start:start + self.chunk_size]
+        else:
+            yield from data
+
+    def iter_batches(self, data: Union['pd.DataFrame', Iterable['pd.DataFrame']],
+                     policy: Optional[str] = None) -> Iterator[PredictionBatch]:
+        """Predict chunk by chunk, yielding one ``PredictionBatch`` per chunk in input order.
+
+        Args:
+            data: DataFrame, split into ``chunk_size`` rows, or an iterable of
+                DataFrame chunks (e.g. ``pd.read_csv(..., chunksize=...)``),
+                used as given
+            policy: Validation policy override, as for ``predict_batch``
+        """
+        import pandas as pd
+
+        n_rows = len(data) if isinstance(data, pd.DataFrame) else None
+        if not self._use_pool(n_rows):
+            for chunk in self._chunks(data):
+                yield self.predictor.predict_batch(chunk, policy, as_frame=False)
+            return
+
+        pool = self._get_pool()
+        columns = list(TYPICAL_RANGES)
+        pending = deque()
+        try:
+            for chunk in self._chunks(data):
+                # Only the input columns are sent to the workers
+                chunk = chunk[[column for column in columns if column in chunk.columns]]
+                pending.append(pool.submit(_predict_chunk, chunk, policy))
+                if len(pending) >= 2 * self.n_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def predict_batch(self, data: Union['pd.DataFrame', Iterable['pd.DataFrame']],
+                      policy: Optional[str] = None, as_frame: bool = True,
+                      interval_tuples: bool = False):
+        """Predict all rows, with the same result as ``FermentationPredictor.predict_batch``.
+
+        Returns:
+            DataFrame with one prediction row per input row, or the joined
+            ``PredictionBatch`` if ``as_frame`` is False
+        """
+        batch = PredictionBatch.concat(self.iter_batches(data, policy))
+        return batch.to_frame(interval_tuples) if as_frame else batch
+
+    def close(self, wait: bool = True):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            self._pool_version = None
+
+    def __enter__(self) -> 'ParallelBatchExecutor':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,79 +1,316 @@
 import numpy as np
-import pandas as pd
+import functools
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, TYPE_CHECKING
 import logging
 
 from .data_loader import FermentationDataLoader
-from .models import ModelManager
-from .validator import ModelValidator
+from .models import ModelManager, prepare_datasets
+from .validator import ModelValidator, selection_rmse
+from .intervals import ConformalIntervals
+from .coverage import CoverageIndex
+from .simulation import FermentationSimulator, piecewise_profiles
+from .monte_carlo import MonteCarloPropagator
+from .inversion import TimeModelInverter
+from .scheduler import ProductionScheduler
+from .sweep import GridSweep
+from .batch_results import PredictionBatch
+from .cache import PredictionCache
+from .compact import save_compact_models
+from .model_store import recover_directory, run_parallel, staged_directory, verify_manifest
+from .snapshot import ModelSnapshot
+from .input_validation import (
+    BatchInputValidator, PREDICTION_TARGETS, TYPICAL_RANGES, FLAG_EXTRAPOLATION,
+    FLAG_REJECTED, warn_out_of_range
+)
+
+# pandas is imported where a DataFrame is read or built, so single predictions never load it
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# 'model' predicts temperature and yeast with trained inverse models,
+# 'inversion' solves the time model for them instead
+INVERSE_MODES = ('model', 'inversion')
+
+def _uses_snapshot(method):
+    """Run a public method against one model snapshot, training first if there is none."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._pinned():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class FermentationPredictor:
-    """Main class for fermentation parameter prediction with auto-inference."""
+    """Main class for fermentation parameter prediction with auto-inference.
     
-    def __init__(self, data_path: str, model_dir: Optional[str] = None):
+    Trained state lives in an immutable ``ModelSnapshot``. Training and
+    loading build a new snapshot off to the side and publish it with a single
+    reference swap, so predictions from any number of threads run without
+    locks and each call sees one consistent model set, even while a retrain
+    (``train_models_async``) or ``load_models`` is in progress. Only the very
+    first call on an untrained predictor waits, for the initial training.
+    """
+    
+    def __init__(self, data_path: str, model_dir: Optional[str] = None,
+                 confidence_level: float = 0.95, validation_policy: str = 'warn',
+                 inverse_mode: str = 'model', surrogate_tolerance: Optional[float] = None,
+                 cache_bytes: int = 0, cache_ttl: Optional[float] = None,
+                 shared_models: bool = False, data_filters: Optional[Dict[str, Any]] = None,
+                 aggregate_training: bool = False, verify_checksums: bool = False):
+        if inverse_mode not in INVERSE_MODES:
+            raise ValueError(f"Unknown inverse mode: {inverse_mode}. Expected one of {INVERSE_MODES}")
         self.data_path = data_path
         self.model_dir = model_dir
-        self.data_loader = FermentationDataLoader(data_path)
-        self.model_manager = ModelManager()
-        self.validator = ModelValidator()
-        self.is_trained = False
+        self.confidence_level = confidence_level
+        self.batch_validator = BatchInputValidator(policy=validation_policy)
+        # Filters select the training observations (see ObservationStore.query)
+        self.data_loader = FermentationDataLoader(data_path, data_filters)
+        self.surrogate_tolerance = surrogate_tolerance
+        self.inverse_mode = inverse_mode
+        # Train and validate on distinct input settings weighted by their
+        # counts; intervals are still calibrated on every observation
+        self.aggregate_training = aggregate_training
+        # Loading always checks file sizes against the manifest; hashing
+        # every file is opt-in since it reads the whole directory
+        self.verify_checksums = verify_checksums
+        
+        # Serve the memory-mapped compact artifact instead of unpickling the
+        # full models, so worker processes share one copy of the model arrays
+        self.shared_models = shared_models
+        
+        # Writers (training, loading) are serialized; readers never take a lock
+        self._versions = itertools.count(1)
+        self._snapshot = ModelSnapshot(0, ModelManager(surrogate_tolerance=surrogate_tolerance))
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._executor = None
+        
+        # Optional cache of predictions on quantized inputs (cache_bytes=0
+        # disables it); entries are tied to the snapshot version
+        self.cache = PredictionCache(cache_bytes, cache_ttl) if cache_bytes else None
         
         # Load existing models if available
-        if model_dir and Path(model_dir).exists():
+        if model_dir and (Path(model_dir).exists() or recover_directory(model_dir)):
+            self.load_models(model_dir)
+    
+    @property
+    def snapshot(self) -> ModelSnapshot:
+        """Snapshot pinned by the current call on this thread, otherwise the latest one."""
+        return getattr(self._local, 'snapshot', None) or self._snapshot
+    
+    @property
+    def model_manager(self) -> ModelManager:
+        return self.snapshot.model_manager
+    
+    @property
+    def validator(self) -> ModelValidator:
+        return self.snapshot.validator
+    
+    @property
+    def intervals(self) -> ConformalIntervals:
+        return self.snapshot.intervals
+    
+    @property
+    def coverage(self) -> CoverageIndex:
+        return self.snapshot.coverage
+    
+    @property
+    def is_trained(self) -> bool:
+        return self._snapshot.is_trained
+    
+    @property
+    def model_version(self) -> int:
+        return self._snapshot.version
+    
+    @contextmanager
+    def _pinned(self, snapshot: Optional[ModelSnapshot] = None):
+        """Pin a snapshot for the current thread; nested calls keep the outer one."""
+        previous = getattr(self._local, 'snapshot', None)
+        if previous is None and snapshot is None:
+            snapshot = self._snapshot
+            if not snapshot.is_trained:
+                self.train_models()
+                snapshot = self._snapshot
+        self._local.snapshot = previous or snapshot
+        try:
+            yield self._local.snapshot
+        finally:
+            self._local.snapshot = previous
+    
+    def _publish(self, snapshot: ModelSnapshot):
+        """Make a snapshot the one new calls use, dropping cached predictions of the old one."""
+        self._snapshot = snapshot
+        if self.cache is not None:
+            self.cache.check_version(snapshot.version)
+    
+    def load_models(self, model_dir: Optional[str] = None) -> bool:
+        """Load saved models and calibration into a new snapshot and publish it.
+        
+        Returns:
+            True if models were loaded; otherwise the current snapshot is kept
+        """
+        model_dir = model_dir or self.model_dir
+        with self._write_lock:
             try:
-                self.model_manager.load_models(model_dir)
-                self.is_trained = True
-                logger.info("Loaded existing models")
+                snapshot = self._load_snapshot(model_dir)
             except Exception as e:
                 logger.warning(f"Failed to load existing models: {e}")
+                return False
+            if not snapshot.is_trained:
+                return False
+            self._publish(snapshot)
+        logger.info("Loaded existing models")
+        return True
+    
+    def _load_snapshot(self, model_dir: str) -> ModelSnapshot:
+        """Load models, coverage index and interval calibration, restoring the calibrated
+        models (or their surrogates)."""
+        # Refuse directories that don't match their manifest (partly copied or damaged)
+        recover_directory(model_dir)
+        verify_manifest(model_dir, checksums=self.verify_checksums)
+        
+        model_manager = ModelManager(surrogate_tolerance=self.surrogate_tolerance)
+        if self.shared_models:
+            model_manager.load_shared_models(model_dir)
+        else:
+            model_manager.load_models(model_dir)
+        validator = ModelValidator()
+        intervals = ConformalIntervals()
+        coverage = CoverageIndex()
+        
+        if any(model_manager.models.values()):
+            coverage.load(model_dir)
+            validator.results_store.load(model_dir)
+            
+            if intervals.load(model_dir):
+                for target, model_name in intervals.model_names.items():
+                    if model_name in model_manager.models.get(target, {}):
+                        model_manager.best_models[target] = model_manager.models[target][model_name]
+            
+            model_manager.select_surrogates()
+        
+        return ModelSnapshot(next(self._versions), model_manager, validator, intervals, coverage)
     
     def train_models(self, retrain: bool = False):
-        """Train all prediction models."""
-        if self.is_trained and not retrain:
-            logger.info("Models already trained. Use retrain=True to force retraining.")
-            return
+        """Train all prediction models and publish them as a new snapshot.
         
+        Predictions keep using the current snapshot until training has
+        finished; concurrent calls train once.
+        """
+        with self._write_lock:
+            if self._snapshot.is_trained and not retrain:
+                logger.info("Models already trained. Use retrain=True to force retraining.")
+                return
+            
+            snapshot = self._train_snapshot()
+            self._publish(snapshot)
+            
+            # Save models if directory specified
+            if self.model_dir:
+                self._save_snapshot(snapshot, self.model_dir)
+                logger.info(f"Models saved to {self.model_dir}")
+    
+    def _save_snapshot(self, snapshot: ModelSnapshot, model_dir: str):
+        """Write every artifact of a snapshot in parallel and swap the directory in at once.
+        
+        The files go to a staging directory that gets a checksummed manifest
+        and then replaces ``model_dir``, so an interrupted save leaves the
+        previous models in place.
+        """
+        with staged_directory(model_dir) as staging:
+            run_parallel(snapshot.model_manager.save_tasks(staging) + [
+                functools.partial(snapshot.intervals.save, staging),
+                functools.partial(snapshot.coverage.save, staging),
+                functools.partial(snapshot.validator.results_store.save, staging),
+                functools.partial(save_compact_models, snapshot.model_manager,
+                                  snapshot.intervals, staging)
+            ])
+    
+    def train_models_async(self, retrain: bool = True) -> Future:
+        """Train in a background thread while predictions continue on the current snapshot.
+        
+        Returns:
+            Future that completes once the new snapshot is published
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='retrain')
+        return self._executor.submit(self.train_models, retrain)
+    
+    def _train_snapshot(self) -> ModelSnapshot:
+        """Train, validate and calibrate a complete new snapshot."""
         logger.info("Loading and preprocessing data...")
         temp, yeast, time = self.data_loader.get_feature_matrices()
+        datasets = prepare_datasets(temp, yeast, time)
+        model_manager = ModelManager(surrogate_tolerance=self.surrogate_tolerance)
+        validator = ModelValidator()
         
         logger.info("Training models...")
-        self.model_manager.train_all_models(temp, yeast, time)
+        # Inversion solves the time model, so the inverse targets need no models
+        targets = ['time'] if self.inverse_mode == 'inversion' else None
+        model_manager.train_all_models(temp, yeast, time, targets=targets,
+                                       aggregate=self.aggregate_training)
         
         # Validate models
         logger.info("Validating models...")
-        validation_results = self.validator.validate_all_models(
-            self.model_manager, temp, yeast, time
-        )
+        validation_results = validator.validate_all_models(model_manager, temp, yeast, time,
+                                                           aggregate=self.aggregate_training)
         
         # Select best models based on validation
-        self._select_best_models(validation_results)
+        self._select_best_models(model_manager, validation_results)
+        
+        # Calibrate prediction intervals from out-of-fold residuals
+        logger.info("Calibrating prediction intervals...")
+        intervals = self._calibrate_intervals(model_manager, validator, datasets)
         
-        self.is_trained = True
+        # Compile lookup-table surrogates of the calibrated models
+        if model_manager.surrogate_tolerance is not None:
+            logger.info("Compiling surrogates...")
+            model_manager.compile_surrogates(datasets)
         
-        # Save models if directory specified
-        if self.model_dir:
-            Path(self.model_dir).mkdir(exist_ok=True)
-            self.model_manager.save_models(self.model_dir)
-            logger.info(f"Models saved to {self.model_dir}")
+        # Index training inputs for extrapolation detection
+        coverage = CoverageIndex()
+        for target, (X, _) in datasets.items():
+            coverage.fit(target, X)
+        
+        return ModelSnapshot(next(self._versions), model_manager, validator, intervals, coverage)
     
-    def _select_best_models(self, validation_results: Dict[str, Dict[str, float]]):
+    def _calibrate_intervals(self, model_manager: ModelManager, validator: ModelValidator,
+                             datasets: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> ConformalIntervals:
+        """Calibrate conformal intervals for the best model of each target."""
+        intervals = ConformalIntervals()
+        
+        for target, (X, y) in datasets.items():
+            if not model_manager.models[target]:
+                continue
+            model = model_manager.get_best_model(target)
+            try:
+                validator.calibrate_intervals(model, X, y, target, intervals)
+            except Exception as e:
+                logger.warning(f"Failed to calibrate intervals for {target}: {e}")
+        return intervals
+    
+    def _select_best_models(self, model_manager: ModelManager,
+                            validation_results: Dict[str, Dict[str, float]]):
         """Select best models based on validation results."""
         for target in ['time', 'temperature', 'yeast']:
-            if target in validation_results:
-                # Select model with lowest RMSE
+            if validation_results.get(target):
+                # Select model with lowest cross-validated RMSE
                 best_model_name = min(
                     validation_results[target].items(),
-                    key=lambda x: x[1]['rmse']
+                    key=lambda x: selection_rmse(x[1])
                 )[0]
                 
-                if best_model_name in self.model_manager.models[target]:
-                    self.model_manager.best_models[target] = \
-                        self.model_manager.models[target][best_model_name]
+                if best_model_name in model_manager.models[target]:
+                    model_manager.best_models[target] = model_manager.models[target][best_model_name]
                     logger.info(f"Selected {best_model_name} as best model for {target}")
     
+    @_uses_snapshot
     def predict(self, temperature: Optional[float] = None, 
                 yeast_concentration: Optional[float] = None,
                 fermentation_time: Optional[float] = None) -> Dict[str, Any]:
@@ -88,9 +325,6 @@ class FermentationPredictor:
         Returns:
             Dictionary containing prediction results
         """
-        if not self.is_trained:
-            self.train_models()
-        
         # Validate inputs
         provided_params = sum([
             temperature is not None,
@@ -101,7 +335,13 @@ class FermentationPredictor:
         if provided_params != 2:
             raise ValueError("Exactly 2 of 3 parameters must be provided")
         
-        # Determine what to predict and make prediction
+        if self.cache is not None:
+            return self._predict_cached(temperature, yeast_concentration, fermentation_time)
+        return self._predict_single(temperature, yeast_concentration, fermentation_time)
+    
+    def _predict_single(self, temperature: Optional[float], yeast_concentration: Optional[float],
+                        fermentation_time: Optional[float]) -> Dict[str, Any]:
+        """Dispatch a single prediction on the missing parameter."""
         if temperature is None:
             return self._predict_temperature(fermentation_time, yeast_concentration)
         elif yeast_concentration is None:
@@ -109,6 +349,70 @@ class FermentationPredictor:
         else:  # fermentation_time is None
             return self._predict_fermentation_time(temperature, yeast_concentration)
     
+    def _predict_cached(self, temperature: Optional[float], yeast_concentration: Optional[float],
+                        fermentation_time: Optional[float]) -> Dict[str, Any]:
+        """Single prediction through the cache, on inputs snapped to its grid."""
+        inputs = {
+            'temperature': temperature,
+            'yeast_concentration': yeast_concentration,
+            'fermentation_time': fermentation_time
+        }
+        target = next(t for t, spec in PREDICTION_TARGETS.items() if inputs[spec[0]] is None)
+        parameter, unit, input_columns, _ = PREDICTION_TARGETS[target]
+        
+        version = self.snapshot.version
+        X, keys, cacheable = self.cache.quantize(
+            target, [[inputs[column] for column in input_columns]]
+        )
+        snapped = dict(zip(input_columns, X[0].tolist()))
+        hit, entry = self.cache.fetch(keys, cacheable, version)
+        
+        if not hit[0]:
+            result = self._predict_single(**dict(inputs, **snapped))
+            if cacheable[0]:
+                distance = result['distance_to_nearest_observation']
+                self.cache.store(keys, result['predicted_value'], result['confidence_interval'][0],
+                                 result['confidence_interval'][1],
+                                 np.nan if distance is None else distance,
+                                 result['extrapolation'], result['model_used'], version)
+            # Echo the inputs as given; the snapped values only key the cache
+            for column in input_columns:
+                result[f'input_{column}'] = inputs[column]
+            return result
+        
+        self._validate_inputs(**snapped)
+        distance = float(entry['distance'][0])
+        result = {
+            'predicted_parameter': parameter,
+            'predicted_value': float(entry['value'][0]),
+            'unit': unit,
+            'confidence_interval': (float(entry['lower'][0]), float(entry['upper'][0]))
+        }
+        for column in input_columns:
+            result[f'input_{column}'] = inputs[column]
+        result.update({
+            'model_used': entry['model_names'][entry['model'][0]],
+            'distance_to_nearest_observation': None if np.isnan(distance) else distance,
+            'extrapolation': bool(entry['extrapolation'][0])
+        })
+        return result
+    
+    def _fill_from_cache(self, batch: PredictionBatch, target: str, rows: np.ndarray,
+                         entries: Dict[str, np.ndarray]):
+        """Copy cached entries (as returned by ``PredictionCache.fetch``) into batch rows."""
+        for model_id in np.unique(entries['model']):
+            same = entries['model'] == model_id
+            batch_rows = rows[same]
+            batch.set_predictions(batch_rows, target, entries['value'][same],
+                                  entries['lower'][same], entries['upper'][same],
+                                  entries['model_names'][model_id])
+            batch.distance[batch_rows] = entries['distance'][same]
+            batch.flags[batch_rows[entries['extrapolation'][same]]] |= FLAG_EXTRAPOLATION
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Prediction cache counters (empty when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else {}
+    
     def _predict_fermentation_time(self, temperature: float, 
                                   yeast_concentration: float) -> Dict[str, Any]:
         """Predict fermentation time from temperature and yeast concentration."""
@@ -122,9 +426,12 @@ class FermentationPredictor:
         model = self.model_manager.get_best_model('time')
         prediction = model.predict(X)[0]
         
-        # Calculate confidence interval (simplified approach)
+        # Distance to training data, widening the interval when extrapolating
+        distance, extrapolation, widening = self._check_coverage('time', X)
+        
+        # Calculate confidence interval
         confidence_interval = self._estimate_confidence_interval(
-            'time', X, prediction
+            'time', X, prediction, widening
         )
         
         return {
@@ -134,7 +441,9 @@ class FermentationPredictor:
             'confidence_interval': confidence_interval,
             'input_temperature': temperature,
             'input_yeast_concentration': yeast_concentration,
-            'model_used': model.name
+            'model_used': model.name,
+            'distance_to_nearest_observation': distance,
+            'extrapolation': extrapolation
         }
     
     def _predict_temperature(self, fermentation_time: float, 
@@ -147,14 +456,13 @@ class FermentationPredictor:
         # Prepare input
         X = np.array([[fermentation_time, yeast_concentration]])
         
-        # Get best model and make prediction
-        model = self.model_manager.get_best_model('temperature')
-        prediction = model.predict(X)[0]
+        # Distance to training data, widening the interval when extrapolating
+        distance, extrapolation, widening = self._check_coverage('temperature', X)
         
-        # Calculate confidence interval
-        confidence_interval = self._estimate_confidence_interval(
-            'temperature', X, prediction
-        )
+        # Predict with the inverse model or by inverting the time model
+        predictions, lower, upper, model_name = self._predict_inverse('temperature', X, widening)
+        prediction = predictions[0]
+        confidence_interval = (float(lower[0]), float(upper[0]))
         
         return {
             'predicted_parameter': 'temperature',
@@ -163,7 +471,9 @@ class FermentationPredictor:
             'confidence_interval': confidence_interval,
             'input_fermentation_time': fermentation_time,
             'input_yeast_concentration': yeast_concentration,
-            'model_used': model.name
+            'model_used': model_name,
+            'distance_to_nearest_observation': distance,
+            'extrapolation': extrapolation
         }
     
     def _predict_yeast_concentration(self, fermentation_time: float, 
@@ -175,14 +485,13 @@ class FermentationPredictor:
         # Prepare input
         X = np.array([[fermentation_time, temperature]])
         
-        # Get best model and make prediction
-        model = self.model_manager.get_best_model('yeast')
-        prediction = model.predict(X)[0]
+        # Distance to training data, widening the interval when extrapolating
+        distance, extrapolation, widening = self._check_coverage('yeast', X)
         
-        # Calculate confidence interval
-        confidence_interval = self._estimate_confidence_interval(
-            'yeast', X, prediction
-        )
+        # Predict with the inverse model or by inverting the time model
+        predictions, lower, upper, model_name = self._predict_inverse('yeast', X, widening)
+        prediction = predictions[0]
+        confidence_interval = (float(lower[0]), float(upper[0]))
         
         return {
             'predicted_parameter': 'yeast_concentration',
@@ -191,30 +500,99 @@ class FermentationPredictor:
             'confidence_interval': confidence_interval,
             'input_fermentation_time': fermentation_time,
             'input_temperature': temperature,
-            'model_used': model.name
+            'model_used': model_name,
+            'distance_to_nearest_observation': distance,
+            'extrapolation': extrapolation
         }
     
+    def _predict_inverse(self, target: str, X: np.ndarray,
+                         widening=1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+        """Predict temperature or yeast with interval bounds.
+        
+        Args:
+            target: 'temperature' or 'yeast'
+            X: Inputs in the target's feature order (time first)
+            widening: Interval widening factor, scalar or per row
+            
+        Returns:
+            Tuple of predictions, lower and upper bounds, and the model name
+        """
+        if self.inverse_mode == 'model':
+            model = self.model_manager.get_best_model(target)
+            predictions = model.predict(X)
+            lower, upper = self._interval_bounds(target, predictions, widening)
+            return predictions, lower, upper, model.name
+        
+        inverter = self._get_inverter()
+        n = len(X)
+        times, fixed = X[:, 0], X[:, 1]
+        
+        # Time decreases with both inputs, so the longest consistent time
+        # gives the lower bound of the solved input
+        if self.intervals.is_fitted('time'):
+            shortest, longest = self.intervals.prediction_range(
+                'time', times, self.confidence_level
+            )
+            solution = inverter.solve(target, np.concatenate([times, longest, shortest]),
+                                      np.tile(fixed, 3))
+            values = solution['value']
+            predictions, lower, upper = values[:n], values[n:2 * n], values[2 * n:]
+            lower = predictions - (predictions - lower) * widening
+            upper = predictions + (upper - predictions) * widening
+        else:
+            solution = inverter.solve(target, times, fixed)
+            predictions = solution['value']
+            lower, upper = self._interval_bounds(target, predictions, widening)
+        
+        unreachable = np.count_nonzero(~solution['converged'][:n])
+        if unreachable:
+            logger.warning(f"{unreachable} fermentation time(s) outside the range reachable "
+                           f"by the time model; {target} set to the nearest search bound")
+        
+        return predictions, lower, upper, f"{inverter.time_model.name} (inverted)"
+    
+    def _get_inverter(self) -> TimeModelInverter:
+        """Inverter for the best time model of the current snapshot."""
+        inverter = self.snapshot.inverter
+        if inverter is None:
+            raise ValueError("No models trained for time")
+        return inverter
+    
     def _validate_inputs(self, temperature: Optional[float] = None,
                         yeast_concentration: Optional[float] = None,
                         fermentation_time: Optional[float] = None):
         """Validate input parameters."""
-        if temperature is not None:
-            if not (0 <= temperature <= 50):
-                logger.warning(f"Temperature {temperature}°C is outside typical range (0-50°C)")
-        
-        if yeast_concentration is not None:
-            if not (0 < yeast_concentration <= 1):
-                logger.warning(f"Yeast concentration {yeast_concentration}% is outside typical range (0-1%)")
-        
-        if fermentation_time is not None:
-            if not (0 < fermentation_time <= 1000):
-                logger.warning(f"Fermentation time {fermentation_time}h is outside typical range (0-1000h)")
+        warn_out_of_range(temperature=temperature, yeast_concentration=yeast_concentration,
+                          fermentation_time=fermentation_time)
+    
+    def _check_coverage(self, target: str, X: np.ndarray) -> Tuple[Optional[float], bool, float]:
+        """Distance to the nearest training observation, extrapolation flag and widening factor."""
+        if not self.coverage.is_fitted(target):
+            return None, False, 1.0
+        
+        distances, extrapolation = self.coverage.query(target, X)
+        widening = self.coverage.widening_factor(distances)
+        return float(distances[0]), bool(extrapolation[0]), float(widening[0])
     
     def _estimate_confidence_interval(self, target: str, X: np.ndarray, 
-                                    prediction: float) -> Tuple[float, float]:
-        """Estimate confidence interval for prediction (simplified approach)."""
-        # This is a simplified approach - in practice, you'd want to use
-        # proper statistical methods or model-specific uncertainty estimates
+                                    prediction: float,
+                                    widening: float = 1.0) -> Tuple[float, float]:
+        """Estimate confidence interval for prediction.
+        
+        Uses conformal intervals calibrated at train time when available,
+        otherwise falls back to a fixed-percentage estimate. The half-width is
+        multiplied by ``widening`` for inputs far from the training data.
+        """
+        lower, upper = self._interval_bounds(target, np.array([prediction]), widening)
+        return (float(lower[0]), float(upper[0]))
+    
+    def _interval_bounds(self, target: str, predictions: np.ndarray,
+                         widening=1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized interval bounds for an array of predictions."""
+        if self.intervals.is_fitted(target):
+            lower, upper = self.intervals.interval(target, predictions, self.confidence_level)
+            return (predictions - (predictions - lower) * widening,
+                    predictions + (upper - predictions) * widening)
         
         # Get data ranges for scaling uncertainty
         data_summary = self.data_loader.get_data_summary()
@@ -230,23 +608,194 @@ class FermentationPredictor:
             uncertainty_factor = 0.15  # 15% uncertainty
         
         # Calculate uncertainty based on prediction value and data range
-        uncertainty = max(
-            abs(prediction) * uncertainty_factor,
+        uncertainty = np.maximum(
+            np.abs(predictions) * uncertainty_factor,
             (data_range[1] - data_range[0]) * 0.01
+        ) * widening
+        
+        return predictions - uncertainty, predictions + uncertainty
+    
+    @_uses_snapshot
+    def predict_sensitivity(self, temperature, yeast_concentration) -> Dict[str, np.ndarray]:
+        """
+        Fermentation time and its sensitivity to temperature and yeast.
+        
+        Evaluated for whole arrays of operating points at once: analytic
+        derivatives where the time model has them, otherwise central
+        differences computed in a single predict call.
+        
+        Args:
+            temperature: Temperatures in Celsius (scalar or array)
+            yeast_concentration: Yeast concentrations as percentage,
+                broadcastable against temperature
+            
+        Returns:
+            Dictionary of arrays: fermentation_time (hours),
+            d_time_d_temperature (hours per °C) and d_time_d_yeast
+            (hours per percentage point)
+        """
+        temperature, yeast_concentration = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(temperature, dtype=np.float64)),
+            np.atleast_1d(np.asarray(yeast_concentration, dtype=np.float64))
         )
+        X = np.column_stack([temperature.ravel(), yeast_concentration.ravel()])
+        values, gradient = self.model_manager.get_best_model('time').value_and_gradient(X)
+        
+        return {
+            'fermentation_time': values,
+            'd_time_d_temperature': gradient[:, 0],
+            'd_time_d_yeast': gradient[:, 1]
+        }
+    
+    @_uses_snapshot
+    def predict_profile_completion(self, yeast_concentration,
+                                   segments: Optional[list] = None,
+                                   times: Optional[np.ndarray] = None,
+                                   temperatures: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Predict completion times for temperature profiles.
+        
+        Args:
+            yeast_concentration: Scalar or one value per profile
+            segments: Piecewise profiles as lists of (duration_hours, temperature) tuples
+            times: Sample times in hours for sampled profiles, starting at 0
+            temperatures: Sampled temperatures, shape (n_profiles, n_samples)
+            
+        Returns:
+            Array of completion times in hours, one per profile
+        """
+        simulator = FermentationSimulator(self.model_manager.get_best_model('time'))
+        
+        if segments is not None:
+            durations, segment_temps = piecewise_profiles(segments)
+            return simulator.simulate_piecewise(durations, segment_temps, yeast_concentration)
+        if times is not None and temperatures is not None:
+            return simulator.simulate_sampled(times, temperatures, yeast_concentration)
+        
+        raise ValueError("Provide either segments or times and temperatures")
+    
+    @_uses_snapshot
+    def predict_time_distribution(self, temperature: float, yeast_concentration: float,
+                                  temperature_tolerance: float = 2.0,
+                                  yeast_tolerance: float = 0.05,
+                                  n_samples: int = 1_000_000,
+                                  quantiles: Tuple[float, ...] = (0.05, 0.5, 0.95),
+                                  residual_noise: bool = True,
+                                  n_jobs: int = 1, **kwargs) -> Dict[str, float]:
+        """
+        Monte Carlo distribution of fermentation time under input drift.
+        
+        Args:
+            temperature: Nominal temperature in Celsius
+            yeast_concentration: Nominal yeast concentration as percentage
+            temperature_tolerance: Room temperature drift in °C
+            yeast_tolerance: Relative yeast dosing tolerance
+            n_samples: Number of Monte Carlo samples
+            quantiles: Quantiles of fermentation time to report
+            residual_noise: Include model error from out-of-fold residuals
+            n_jobs: Parallel workers for sampling and prediction
+            **kwargs: Passed to MonteCarloPropagator.sample_completion_times
+                (distribution, seed)
+            
+        Returns:
+            Dictionary with quantiles ('q5', 'q50', ...), mean, std and n_samples
+        """
+        model = self.model_manager.get_best_model('time')
+        propagator = MonteCarloPropagator(
+            model, relative_residuals=self._relative_residuals(
+                'time', getattr(model, 'source_name', model.name)
+            ),
+            n_jobs=n_jobs
+        )
+        return propagator.completion_time_quantiles(
+            temperature, yeast_concentration, quantiles=quantiles, n_samples=n_samples,
+            temperature_tolerance=temperature_tolerance, yeast_tolerance=yeast_tolerance,
+            residual_noise=residual_noise, **kwargs
+        )
+    
+    @_uses_snapshot
+    def plan_production(self, jobs: List[Dict[str, Any]], rooms: List[Dict[str, Any]],
+                        tolerance: float = 0.0) -> 'pd.DataFrame':
+        """
+        Schedule doughs across proofing rooms so each is ready on time.
+        
+        Args:
+            jobs: Dicts with id, yeast_concentration, ready_time (hours from
+                plan start) and optionally rooms and tolerance
+            rooms: Dicts with name, temperature, capacity and optionally
+                windows as (open, close) hours
+            tolerance: Default hours a dough may be ready early or late
+            
+        Returns:
+            DataFrame with room, start and end time per job, lateness and
+            why unplaced jobs were not scheduled (see
+            ProductionScheduler.schedule); use schedule_to_gantt to export
+        """
+        scheduler = ProductionScheduler(self.model_manager.get_best_model('time'), tolerance)
+        return scheduler.schedule(jobs, rooms)
+    
+    @_uses_snapshot
+    def grid_sweep(self, chunk_size: int = 1_000_000, **ranges) -> GridSweep:
+        """
+        Sweep two parameters over a full grid, predicting the third.
+        
+        Args:
+            chunk_size: Maximum number of grid cells predicted at once
+            **ranges: Value arrays for exactly two of temperature,
+                yeast_concentration and fermentation_time
+            
+        Returns:
+            GridSweep to evaluate or write as CSV/npz
+        """
+        # Chunks are evaluated later; all of them use the current snapshot
+        snapshot = self.snapshot
         
-        lower_bound = prediction - uncertainty
-        upper_bound = prediction + uncertainty
+        def predict_parameter(parameter: str, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+            with self._pinned(snapshot):
+                return self._predict_parameter(parameter, inputs)
         
-        return (lower_bound, upper_bound)
+        return GridSweep(predict_parameter, ranges, chunk_size)
+    
+    def _predict_parameter(self, parameter: str, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Point predictions of a parameter from flat input columns."""
+        target = next(t for t, spec in PREDICTION_TARGETS.items() if spec[0] == parameter)
+        _, _, input_columns, non_negative = PREDICTION_TARGETS[target]
+        X = np.column_stack([inputs[column] for column in input_columns])
+        
+        if target == 'time' or self.inverse_mode == 'model':
+            predictions = self.model_manager.get_best_model(target).predict(X)
+        else:
+            predictions = self._get_inverter().solve(target, X[:, 0], X[:, 1])['value']
+        return np.maximum(predictions, 0) if non_negative else predictions
     
+    def _relative_residuals(self, target: str, model_name: str) -> Optional[np.ndarray]:
+        """Signed out-of-fold residuals relative to the prediction, if stored."""
+        store = self.validator.results_store
+        if not store.has(target, model_name):
+            return None
+        
+        oof = store.out_of_fold(target, model_name)
+        if oof is None:
+            return None
+        
+        oof = oof.astype(np.float64)
+        floor = self.intervals.scale_floors.get(target, 0.0) or 1e-6
+        return (store.actuals[target] - oof) / np.maximum(np.abs(oof), floor)
+    
+    @_uses_snapshot
     def get_model_performance(self) -> Dict[str, Dict[str, float]]:
-        """Get performance metrics for all models."""
-        if not self.is_trained:
-            self.train_models()
+        """Get performance metrics for all models.
+        
+        Computed from the validation results stored at train time when
+        available, otherwise by validating the models again.
+        """
+        stored = self.validator.results_store.to_validation_results()
+        if stored:
+            return stored
         
+        # Validate with a fresh validator; the snapshot's one is read-only
         temp, yeast, time = self.data_loader.get_feature_matrices()
-        return self.validator.validate_all_models(
+        return ModelValidator().validate_all_models(
             self.model_manager, temp, yeast, time
         )
     
@@ -254,38 +803,110 @@ class FermentationPredictor:
         """Get summary of the training data."""
         return self.data_loader.get_data_summary()
     
-    def predict_batch(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Make batch predictions from a DataFrame."""
-        if not self.is_trained:
-            self.train_models()
+    @_uses_snapshot
+    def predict_batch(self, df: 'pd.DataFrame', policy: Optional[str] = None,
+                      as_frame: bool = True, interval_tuples: bool = False):
+        """Make batch predictions from a DataFrame.
+        
+        Rows are grouped by the missing parameter and each group is predicted
+        with one vectorized model call. Inputs are range-checked column-wise
+        according to ``policy`` ('warn', 'clip' or 'reject'; defaults to the
+        predictor's ``validation_policy``), and the resulting per-row bit flags
+        are returned in the ``input_flags`` column.
         
-        results = []
+        Results are collected in a columnar ``PredictionBatch`` rather than
+        one dict per row.
         
-        for idx, row in df.iterrows():
+        Args:
+            df: DataFrame with temperature, yeast_concentration and
+                fermentation_time columns, NaN for the parameter to predict
+            policy: Validation policy override for this batch
+            as_frame: Return a DataFrame; if False, return the
+                ``PredictionBatch`` itself
+            interval_tuples: Return intervals as a ``confidence_interval``
+                column of (lower, upper) tuples instead of the float
+                ``confidence_lower`` and ``confidence_upper`` columns
+            
+        Returns:
+            DataFrame with one prediction row per input row, or the
+            ``PredictionBatch``
+        """
+        import pandas as pd
+        
+        n_rows = len(df)
+        inputs = {
+            column: (pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+                     if column in df.columns else np.full(n_rows, np.nan))
+            for column in TYPICAL_RANGES
+        }
+        provided = np.column_stack([~np.isnan(values) for values in inputs.values()])
+        
+        # Zero yeast or time is clipped to the smallest value trained on
+        inputs, flags = self.batch_validator.validate(inputs, policy,
+                                                      self.coverage.input_minimums())
+        batch = PredictionBatch(inputs, flags, df.index)
+        
+        invalid_count = provided.sum(axis=1) != 2
+        rejected = (flags & FLAG_REJECTED) != 0
+        batch.set_error(np.flatnonzero(invalid_count), "Exactly 2 of 3 parameters must be provided")
+        batch.set_error(np.flatnonzero(rejected), "Inputs outside typical range rejected")
+        failed = invalid_count | rejected
+        
+        version = self.snapshot.version
+        for target, (parameter, unit, input_columns, non_negative) in PREDICTION_TARGETS.items():
+            missing_column = list(TYPICAL_RANGES).index(parameter)
+            rows = np.flatnonzero(~provided[:, missing_column] & ~failed)
+            if len(rows) == 0:
+                continue
+            
+            X = np.column_stack([inputs[column][rows] for column in input_columns])
+            
+            if self.cache is not None:
+                # Snap inputs to the cache grid, serve hits and predict only the misses;
+                # the batch keeps the inputs as given
+                X, keys, cacheable = self.cache.quantize(target, X)
+                hit, entries = self.cache.fetch(keys, cacheable, version)
+                self._fill_from_cache(batch, target, rows[hit], entries)
+                rows, X, keys, cacheable = rows[~hit], X[~hit], keys[~hit], cacheable[~hit]
+                if len(rows) == 0:
+                    continue
+            
+            widening = 1.0
+            if self.coverage.is_fitted(target):
+                distances, extrapolation = self.coverage.query(target, X)
+                batch.distance[rows] = distances
+                flags[rows[extrapolation]] |= FLAG_EXTRAPOLATION
+                widening = self.coverage.widening_factor(distances)
+            
             try:
-                temp = row.get('temperature')
-                yeast = row.get('yeast_concentration') 
-                time = row.get('fermentation_time')
-                
-                # Convert None values from missing data
-                temp = None if pd.isna(temp) else temp
-                yeast = None if pd.isna(yeast) else yeast
-                time = None if pd.isna(time) else time
-                
-                result = self.predict(
-                    temperature=temp,
-                    yeast_concentration=yeast,
-                    fermentation_time=time
-                )
-                
-                result['row_index'] = idx
-                results.append(result)
-                
+                if target == 'time':
+                    model = self.model_manager.get_best_model(target)
+                    predictions = model.predict(X)
+                    lower, upper = self._interval_bounds(target, predictions, widening)
+                    model_name = model.name
+                else:
+                    predictions, lower, upper, model_name = \
+                        self._predict_inverse(target, X, widening)
             except Exception as e:
-                logger.error(f"Failed to predict for row {idx}: {e}")
-                results.append({
-                    'row_index': idx,
-                    'error': str(e)
-                })
-        
-        return pd.DataFrame(results)
\ No newline at end of file
+                logger.error(f"Batch prediction failed for {target}: {e}")
+                batch.set_error(rows, str(e))
+                failed[rows] = True
+                continue
+            
+            if non_negative:
+                predictions = np.maximum(predictions, 0)
+            batch.set_predictions(rows, target, predictions, lower, upper, model_name)
+            
+            if self.cache is not None and cacheable.any():
+                extrapolated = (flags[rows] & FLAG_EXTRAPOLATION) != 0
+                self.cache.store(keys[cacheable], predictions[cacheable], lower[cacheable],
+                                 upper[cacheable], batch.distance[rows][cacheable],
+                                 extrapolated[cacheable], model_name, version)
+        
+        n_errors = np.count_nonzero(failed)
+        if n_errors:
+            logger.error(f"Batch prediction failed for {n_errors} of {n_rows} rows")
+        
+        if not as_frame:
+            return batch
+        return batch.to_frame(interval_tuples)
@@ -0,0 +1,235 @@
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import logging
+
+from .models import TARGET_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+class ValidationResultsStore:
+    """Compact store of validation predictions per (target, model).
+
+    Keeps the inputs and actual values of each target once, plus in-sample
+    and out-of-fold predictions for every model as float32 arrays, so residual
+    analysis, model comparison and reports can be computed without calling
+    ``model.predict`` again.
+    """
+
+    FILENAME = "validation_results.npz"
+
+    def __init__(self):
+        self.inputs: Dict[str, np.ndarray] = {}
+        self.actuals: Dict[str, np.ndarray] = {}
+        self.folds: Dict[str, np.ndarray] = {}
+        # Row weights of targets validated on aggregated rows
+        self.weights: Dict[str, np.ndarray] = {}
+        # (target, model_name) -> float32 array of shape (2, n): in-sample, out-of-fold
+        self.predictions: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def add(self, target: str, model_name: str, X: np.ndarray, y: np.ndarray,
+            in_sample: np.ndarray, out_of_fold: Optional[np.ndarray] = None,
+            folds: Optional[np.ndarray] = None, sample_weight: Optional[np.ndarray] = None):
+        """Record predictions of a model for a target (rows optionally weighted)."""
+        if target not in self.actuals or len(self.actuals[target]) != len(y):
+            self.inputs[target] = np.asarray(X, dtype=np.float32)
+            self.actuals[target] = np.asarray(y, dtype=np.float32)
+            self.folds[target] = np.full(len(y), -1, dtype=np.int8)
+        if sample_weight is None:
+            self.weights.pop(target, None)
+        else:
+            self.weights[target] = np.asarray(sample_weight, dtype=np.float32)
+        if folds is not None:
+            self.folds[target] = np.asarray(folds, dtype=np.int8)
+
+        predictions = np.empty((2, len(y)), dtype=np.float32)
+        predictions[0] = in_sample
+        predictions[1] = np.nan if out_of_fold is None else out_of_fold
+        self.predictions[(target, model_name)] = predictions
+
+    def has(self, target: str, model_name: str) -> bool:
+        return (target, model_name) in self.predictions
+
+    def matches(self, target: str, X: np.ndarray, y: np.ndarray) -> bool:
+        """Whether ``target`` was stored for exactly these inputs and actual values."""
+        if target not in self.actuals:
+            return False
+        return (np.array_equal(self.actuals[target], np.asarray(y, dtype=np.float32)) and
+                np.array_equal(self.inputs[target], np.asarray(X, dtype=np.float32)))
+
+    def in_sample(self, target: str, model_name: str) -> np.ndarray:
+        return self.predictions[(target, model_name)][0]
+
+    def out_of_fold(self, target: str, model_name: str) -> Optional[np.ndarray]:
+        """Out-of-fold predictions, or None if cross-validation was not run."""
+        oof = self.predictions[(target, model_name)][1]
+        return None if np.isnan(oof).all() else oof
+
+    def metrics(self, target: str, model_name: str) -> Dict[str, float]:
+        """Metrics in the format returned by ModelValidator.validate_model."""
+        y = self.actuals[target].astype(np.float64)
+        w = self.weights[target].astype(np.float64) if target in self.weights else np.ones(len(y))
+        residuals = y - self.in_sample(target, model_name)
+
+        rmse = float(np.sqrt(np.average(residuals ** 2, weights=w)))
+        mae = float(np.average(np.abs(residuals), weights=w))
+        ss_tot = float(np.sum(w * (y - np.average(y, weights=w)) ** 2))
+        if ss_tot == 0:
+            r2 = 1.0 if rmse == 0 else 0.0
+        else:
+            r2 = 1.0 - float(np.sum(w * residuals ** 2)) / ss_tot
+
+        cv_rmse, cv_std = rmse, 0.0
+        oof = self.out_of_fold(target, model_name)
+        folds = self.folds[target]
+        if oof is not None and folds.max() >= 0:
+            # Per-fold MSE, as cross_val_score would report it
+            sq_errors = (y - oof) ** 2
+            fold_mse = (np.bincount(folds, weights=w * sq_errors) /
+                        np.maximum(np.bincount(folds, weights=w), 1))
+            cv_rmse = float(np.sqrt(fold_mse.mean()))
+            cv_std = float(fold_mse.std())
+
+        return {
+            'rmse': rmse,
+            'mae': mae,
+            'r2': r2,
+            'cv_rmse': cv_rmse,
+            'cv_std': cv_std
+        }
+
+    def to_validation_results(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Validation results for every stored model, grouped by target."""
+        results = {}
+        for target, model_name in self.predictions:
+            results.setdefault(target, {})[model_name] = self.metrics(target, model_name)
+        return results
+
+    def residual_analysis(self, target: str, model_name: str,
+                          out_of_fold: bool = False) -> Dict[str, Any]:
+        """Residual analysis in the format returned by ModelValidator.residual_analysis."""
+        y = self.actuals[target]
+        predictions = self.out_of_fold(target, model_name) if out_of_fold \
+            else self.in_sample(target, model_name)
+        if predictions is None:
+            raise ValueError(f"No out-of-fold predictions stored for {model_name} ({target})")
+        residuals = y - predictions
+
+        return {
+            'residuals': residuals,
+            'mean_residual': float(np.mean(residuals)),
+            'std_residual': float(np.std(residuals)),
+            'residual_range': (float(np.min(residuals)), float(np.max(residuals))),
+            'predictions': predictions,
+            'actual_values': y
+        }
+
+    def column(self, target: str, column: str) -> np.ndarray:
+        """Values of an input or output column for a target's observations."""
+        feature_cols, target_col = TARGET_COLUMNS[target]
+        if column == target_col:
+            return self.actuals[target]
+        if column not in feature_cols:
+            raise ValueError(f"Unknown column for {target}: {column}")
+        return self.inputs[target][:, feature_cols.index(column)]
+
+    def residual_bins(self, target: str, model_name: str,
+                      by: Sequence[str] = ('temperature', 'yeast_concentration'),
+                      bins: Union[int, Sequence] = 10,
+                      out_of_fold: bool = True) -> Dict[str, Any]:
+        """Residual statistics binned by one or two columns.
+
+        Args:
+            target: Prediction target
+            model_name: Model to analyse
+            by: One or two of 'temperature', 'yeast_concentration', 'fermentation_time'
+            bins: Number of equal-width bins or explicit edges, per column
+                (a single value applies to all columns)
+            out_of_fold: Use out-of-fold residuals if stored, else in-sample
+
+        Returns:
+            Dictionary with bin edges per column and count, mean residual and
+            RMSE arrays shaped (n_bins,) or (n_bins_0, n_bins_1); empty bins are NaN.
+            Rows of aggregated targets are weighted by their observation counts,
+            so counts and statistics are per observation rather than per row
+        """
+        if isinstance(by, str):
+            by = (by,)
+        if not 1 <= len(by) <= 2:
+            raise ValueError("Residuals can be binned by one or two columns")
+        if isinstance(bins, int):
+            bins = [bins] * len(by)
+        elif len(by) == 1:
+            bins = [bins]
+
+        predictions = self.out_of_fold(target, model_name) if out_of_fold else None
+        if predictions is None:
+            predictions = self.in_sample(target, model_name)
+        residuals = self.actuals[target].astype(np.float64) - predictions
+
+        edges, shape = [], []
+        flat_index = np.zeros(len(residuals), dtype=np.int64)
+        for column, column_bins in zip(by, bins):
+            values = self.column(target, column)
+            column_edges = np.histogram_bin_edges(values, bins=column_bins)
+            index = np.clip(np.searchsorted(column_edges, values, side='right') - 1,
+                            0, len(column_edges) - 2)
+            flat_index = flat_index * (len(column_edges) - 1) + index
+            edges.append(column_edges)
+            shape.append(len(column_edges) - 1)
+
+        w = self.weights[target].astype(np.float64) if target in self.weights else np.ones(len(residuals))
+        size = int(np.prod(shape))
+        counts = np.bincount(flat_index, weights=w, minlength=size)
+        sums = np.bincount(flat_index, weights=w * residuals, minlength=size)
+        sq_sums = np.bincount(flat_index, weights=w * residuals ** 2, minlength=size)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_residual = sums / counts
+            rmse = np.sqrt(sq_sums / counts)
+
+        return {
+            'by': tuple(by),
+            'bin_edges': edges,
+            'count': np.rint(counts).astype(np.int64).reshape(shape),
+            'mean_residual': mean_residual.reshape(shape),
+            'rmse': rmse.reshape(shape)
+        }
+
+    def save(self, directory: str):
+        """Save all stored arrays to a single file."""
+        filepath = Path(directory) / self.FILENAME
+        arrays = {}
+        for target in self.actuals:
+            arrays[f"{target}__inputs"] = self.inputs[target]
+            arrays[f"{target}__actuals"] = self.actuals[target]
+            arrays[f"{target}__folds"] = self.folds[target]
+            if target in self.weights:
+                arrays[f"{target}__weights"] = self.weights[target]
+        for (target, model_name), predictions in self.predictions.items():
+            arrays[f"{target}__{model_name}__predictions"] = predictions
+        np.savez(filepath, **arrays)
+        logger.info(f"Validation results saved to {filepath}")
+
+    def load(self, directory: str) -> bool:
+        """Load stored arrays if present. Returns True if loaded."""
+        filepath = Path(directory) / self.FILENAME
+        if not filepath.exists():
+            return False
+
+        with np.load(filepath) as data:
+            for key in data.files:
+                parts = key.split('__')
+                if len(parts) == 3:
+                    self.predictions[(parts[0], parts[1])] = data[key]
+                elif parts[1] == 'inputs':
+                    self.inputs[parts[0]] = data[key]
+                elif parts[1] == 'actuals':
+                    self.actuals[parts[0]] = data[key]
+                elif parts[1] == 'folds':
+                    self.folds[parts[0]] = data[key]
+                elif parts[1] == 'weights':
+                    self.weights[parts[0]] = data[key]
+
+        logger.info(f"Validation results loaded from {filepath}")
+        return True
@@ -0,0 +1,238 @@
+import heapq
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+import logging
+
+from .models import FermentationModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def format_gantt_duration(hours: float) -> str:
+    """Duration string understood by gantt.html, rounded to the minute."""
+    minutes = int(round(hours * 60))
+    whole_hours, rest = divmod(minutes, 60)
+    if whole_hours == 0:
+        return f"{rest} minutes"
+    if rest == 0:
+        return f"{whole_hours} hours"
+    return f"{whole_hours} hours {rest} minutes"
+
+class ProductionScheduler:
+    """Assign doughs to proofing rooms so that each is ready on time.
+
+    Jobs are dicts with ``id``, ``yeast_concentration``, ``ready_time`` (hours
+    from the start of the plan) and optionally ``rooms`` (allowed room names)
+    and ``tolerance`` (hours the dough may be ready early or late). Rooms are
+    dicts with ``name``, ``temperature``, ``capacity`` (doughs at once) and
+    optionally ``windows``, a list of (open, close) hours during which doughs
+    may proof there.
+
+    Fermentation times for every job and room come from one vectorized
+    ``predict`` call over the distinct (temperature, yeast) pairs. Jobs are
+    then placed greedily in order of their ideal start time: each room keeps
+    a heap of the times its slots become free, and a job goes to the allowed
+    room where it can finish closest to its ready time, preferring shorter
+    fermentation on ties. This is list scheduling, so it is fast
+    (O(jobs x rooms x log capacity)) but not guaranteed optimal.
+
+    No dough starts before the plan does. A dough that cannot be ready in
+    time even when started right away is still placed, as early as it can
+    finish, and reported late. Jobs that are not placed at all get an
+    ``unscheduled_reason``: ``no_room`` (no allowed rooms), ``no_window``
+    (no allowed room is open long enough at the right time, even if empty)
+    or ``no_capacity`` (every fitting slot was taken by other jobs).
+    """
+
+    def __init__(self, time_model: FermentationModel, tolerance: float = 0.0):
+        self.time_model = time_model
+        self.tolerance = tolerance
+
+    def duration_matrix(self, jobs: Sequence[Dict[str, Any]],
+                        rooms: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Predicted fermentation hours for each job (rows) in each room (columns)."""
+        yeast = np.array([job['yeast_concentration'] for job in jobs], dtype=np.float64)
+        temperatures = np.array([room['temperature'] for room in rooms], dtype=np.float64)
+
+        pairs = np.column_stack([
+            np.repeat(temperatures[None, :], len(yeast), axis=0).ravel(),
+            np.repeat(yeast[:, None], len(temperatures), axis=1).ravel()
+        ])
+        unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+        durations = np.maximum(self.time_model.predict(unique_pairs), 0.0)
+        return durations[inverse.ravel()].reshape(len(yeast), len(temperatures))
+
+    def _earliest_start(self, earliest: float, duration: float,
+                        windows: Optional[List[tuple]]) -> float:
+        """First start at or after ``earliest`` that fits inside a window."""
+        if windows is None:
+            return earliest
+        for open_time, close_time in windows:
+            start = max(earliest, open_time)
+            if start + duration <= close_time:
+                return start
+        return np.inf
+
+    def _candidate_start(self, ideal_start: float, duration: float, ready: float,
+                         tolerance: float, free_at: float,
+                         windows: Optional[List[tuple]]) -> float:
+        """Start closest to ``ideal_start`` in a room with a slot free at ``free_at``."""
+        candidate = self._earliest_start(max(ideal_start, free_at), duration, windows)
+        if candidate + duration - ready > tolerance:
+            # Starting early may still fit a window that closes sooner
+            candidate = self._earliest_start(max(ideal_start - tolerance, free_at),
+                                             duration, windows)
+        return candidate
+
+    def schedule(self, jobs: Sequence[Dict[str, Any]],
+                 rooms: Sequence[Dict[str, Any]], plan_start: float = 0.0) -> 'pd.DataFrame':
+        """Plan start times and rooms for all jobs.
+
+        Args:
+            jobs: Job dicts (see class docstring)
+            rooms: Room dicts (see class docstring)
+            plan_start: Earliest start time (hours, on the ready-time clock)
+
+        Returns:
+            DataFrame with one row per job: job, room, temperature,
+            yeast_concentration, ready_time, start, end, duration, deviation
+            (end minus ready time), scheduled, late, lateness (hours past
+            ready time plus tolerance) and unscheduled_reason (see class
+            docstring); unscheduled jobs have no room and NaN times
+        """
+        import pandas as pd
+
+        if not rooms:
+            raise ValueError("At least one room is required")
+        names = [room['name'] for room in rooms]
+        if len(set(names)) != len(names):
+            raise ValueError("Room names must be unique")
+        room_index = {name: i for i, name in enumerate(names)}
+
+        n_jobs = len(jobs)
+        if n_jobs == 0:
+            return pd.DataFrame(columns=['job', 'room', 'temperature', 'yeast_concentration',
+                                         'ready_time', 'start', 'end', 'duration',
+                                         'deviation', 'scheduled', 'late', 'lateness',
+                                         'unscheduled_reason'])
+
+        durations = self.duration_matrix(jobs, rooms)
+        ready = np.array([job['ready_time'] for job in jobs], dtype=np.float64)
+        tolerance = np.array([job.get('tolerance', self.tolerance) for job in jobs],
+                             dtype=np.float64)
+
+        allowed = np.ones((n_jobs, len(rooms)), dtype=bool)
+        for j, job in enumerate(jobs):
+            if job.get('rooms') is not None:
+                allowed[j] = False
+                for name in job['rooms']:
+                    if name not in room_index:
+                        raise ValueError(f"Unknown room {name} for job {job.get('id', j)}")
+                    allowed[j, room_index[name]] = True
+
+        windows = [sorted(room['windows']) if room.get('windows') else None for room in rooms]
+        slots = [[float(plan_start)] * int(room.get('capacity', 1)) for room in rooms]
+        for heap in slots:
+            heapq.heapify(heap)
+
+        # Place jobs in order of their earliest ideal start over allowed rooms
+        ideal_start = ready[:, None] - durations
+        # Jobs that would have to start before the plan in every allowed room
+        overdue = np.where(allowed, ideal_start + tolerance[:, None], np.inf).max(axis=1) < plan_start
+        order = np.argsort(np.where(allowed, ideal_start, np.inf).min(axis=1), kind='stable')
+
+        def placeable(j: int, r: int, free_at: float) -> Optional[float]:
+            """Acceptable start of job j in room r once a slot is free, or None."""
+            candidate = self._candidate_start(ideal_start[j, r], durations[j, r], ready[j],
+                                              tolerance[j], free_at, windows[r])
+            if candidate + durations[j, r] - ready[j] > tolerance[j] and \
+                    not (overdue[j] and np.isfinite(candidate)):
+                return None
+            return candidate
+
+        room_of = np.full(n_jobs, -1)
+        start = np.full(n_jobs, np.nan)
+        for j in order:
+            best = None
+            for r in np.flatnonzero(allowed[j]):
+                if not slots[r]:
+                    continue
+                duration = durations[j, r]
+                candidate = placeable(j, r, slots[r][0])
+                if candidate is None:
+                    continue
+                deviation = candidate + duration - ready[j]
+                # Closest to the ready time (earliest end if late), then shortest fermentation
+                key = (abs(deviation), duration)
+                if best is None or key < best[0]:
+                    best = (key, r, candidate)
+
+            if best is not None:
+                _, r, candidate = best
+                heapq.heapreplace(slots[r], candidate + durations[j, r])
+                room_of[j] = r
+                start[j] = candidate
+
+        scheduled = room_of >= 0
+        duration = np.where(scheduled, durations[np.arange(n_jobs), np.maximum(room_of, 0)], np.nan)
+
+        # Would the job have fitted some allowed room had it been empty?
+        reason = np.full(n_jobs, None, dtype=object)
+        for j in np.flatnonzero(~scheduled):
+            rooms_allowed = np.flatnonzero(allowed[j])
+            if len(rooms_allowed) == 0:
+                reason[j] = 'no_room'
+            elif any(placeable(j, r, float(plan_start)) is not None for r in rooms_allowed):
+                reason[j] = 'no_capacity'
+            else:
+                reason[j] = 'no_window'
+        if not scheduled.all():
+            reasons, counts = np.unique(reason[~scheduled].astype(str), return_counts=True)
+            details = ", ".join(f"{count} {name}" for name, count in zip(reasons, counts))
+            logger.warning(f"Could not schedule {np.count_nonzero(~scheduled)} of {n_jobs} jobs "
+                           f"({details})")
+        deviation = start + duration - ready
+        lateness = np.where(scheduled, np.maximum(deviation - tolerance, 0.0), np.nan)
+        late = scheduled & (lateness > 1e-9)
+        if late.any():
+            logger.warning(f"{np.count_nonzero(late)} of {n_jobs} jobs cannot be ready in time")
+
+        return pd.DataFrame({
+            'job': [job.get('id', j) for j, job in enumerate(jobs)],
+            'room': [names[r] if r >= 0 else None for r in room_of],
+            'temperature': np.where(scheduled, [rooms[r]['temperature'] for r in room_of], np.nan),
+            'yeast_concentration': [job['yeast_concentration'] for job in jobs],
+            'ready_time': ready,
+            'start': start,
+            'end': start + duration,
+            'duration': duration,
+            'deviation': deviation,
+            'scheduled': scheduled,
+            'late': late,
+            'lateness': lateness,
+            'unscheduled_reason': reason
+        })
+
+def schedule_to_gantt(schedule: 'pd.DataFrame', plan_start: datetime) -> List[Dict[str, Any]]:
+    """Convert a schedule to the task list rendered by gantt.html.
+
+    Tasks carry the usual ``id``, ``task``, ``duration`` and ``category``
+    (the room) plus ISO ``start`` and ``end`` times, which gantt.html uses
+    instead of chaining tasks back from the target time.
+    """
+    tasks = []
+    for row in schedule[schedule['scheduled']].sort_values('start').itertuples(index=False):
+        start = plan_start + timedelta(hours=float(row.start))
+        end = plan_start + timedelta(hours=float(row.end))
+        tasks.append({
+            'id': len(tasks) + 1,
+            'task': f"{row.job} ({row.yeast_concentration:g}% yeast)",
+            'duration': format_gantt_duration(row.duration),
+            'category': row.room,
+            'start': start.isoformat(timespec='minutes'),
+            'end': end.isoformat(timespec='minutes')
+        })
+    return tasks
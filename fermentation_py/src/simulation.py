@@ -0,0 +1,159 @@
+import numpy as np
+from typing import Sequence, Tuple, Union
+import logging
+
+from .models import FermentationModel
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+class FermentationSimulator:
+    """Fermentation progress under time-varying temperature.
+
+    Treats the time model's prediction as the time to completion at a
+    constant temperature, so progress accumulates at rate 1 / time(T, yeast)
+    and the dough is done when ∫ dt / time(T(t), yeast) reaches 1. After the
+    end of a profile the last temperature is held.
+
+    All profiles are evaluated together: temperatures are quantized to
+    ``temperature_resolution`` and every distinct (temperature, yeast) pair
+    is predicted in a single ``model.predict`` call.
+    """
+
+    def __init__(self, time_model: FermentationModel, temperature_resolution: float = 0.01,
+                 min_time: float = 1e-3):
+        self.time_model = time_model
+        self.temperature_resolution = temperature_resolution
+        self.min_time = min_time
+
+    def _rates(self, temperatures: np.ndarray, yeast: np.ndarray) -> np.ndarray:
+        """Progress rate (1/hours) for broadcastable temperature and yeast arrays."""
+        temperatures, yeast = np.broadcast_arrays(temperatures, yeast)
+        shape = temperatures.shape
+
+        if self.temperature_resolution:
+            temperatures = np.round(temperatures / self.temperature_resolution) * \
+                self.temperature_resolution
+        pairs = np.column_stack([temperatures.ravel(), yeast.ravel()])
+        unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+
+        times = np.maximum(self.time_model.predict(unique_pairs), self.min_time)
+        return (1.0 / times)[inverse.ravel()].reshape(shape)
+
+    def _yeast_column(self, yeast: ArrayLike, n_profiles: int) -> np.ndarray:
+        yeast = np.asarray(yeast, dtype=np.float64)
+        if yeast.ndim == 0:
+            yeast = np.full(n_profiles, float(yeast))
+        if yeast.shape != (n_profiles,):
+            raise ValueError("Yeast concentration must be a scalar or one value per profile")
+        return yeast[:, None]
+
+    def simulate_piecewise(self, durations: np.ndarray, temperatures: np.ndarray,
+                           yeast_concentration: ArrayLike) -> np.ndarray:
+        """Completion times for piecewise-constant temperature profiles.
+
+        Args:
+            durations: Segment durations in hours, shape (n_profiles, n_segments);
+                pad shorter profiles with zero-length segments that repeat the
+                last temperature (see ``piecewise_profiles``)
+            temperatures: Segment temperatures in Celsius, same shape
+            yeast_concentration: Scalar or one value per profile
+
+        Returns:
+            Completion time in hours from the start of each profile
+        """
+        durations = np.atleast_2d(np.asarray(durations, dtype=np.float64))
+        temperatures = np.atleast_2d(np.asarray(temperatures, dtype=np.float64))
+        if durations.shape != temperatures.shape:
+            raise ValueError("Durations and temperatures must have the same shape")
+        if durations.shape[1] == 0:
+            raise ValueError("Profiles must have at least one segment")
+        if np.any(durations < 0):
+            raise ValueError("Segment durations must be non-negative")
+
+        n_profiles, n_segments = durations.shape
+        rates = self._rates(temperatures, self._yeast_column(yeast_concentration, n_profiles))
+
+        # Exact integral of a constant rate over each segment
+        progress_end = np.cumsum(durations * rates, axis=1)
+        progress_start = progress_end - durations * rates
+        segment_start = np.cumsum(durations, axis=1) - durations
+
+        done = progress_end >= 1.0
+        finished = done.any(axis=1)
+        segment = np.where(finished, done.argmax(axis=1), n_segments - 1)
+        rows = np.arange(n_profiles)
+
+        # Finish inside the first segment that reaches 1, or hold the last
+        # temperature past the end of the profile
+        start = np.where(finished, segment_start[rows, segment], durations.sum(axis=1))
+        remaining = 1.0 - np.where(finished, progress_start[rows, segment], progress_end[:, -1])
+        return start + remaining / rates[rows, segment]
+
+    def simulate_sampled(self, times: np.ndarray, temperatures: np.ndarray,
+                         yeast_concentration: ArrayLike) -> np.ndarray:
+        """Completion times for sampled temperature profiles.
+
+        Progress is integrated with the trapezoidal rule between samples and
+        the completion time is interpolated linearly within the sample
+        interval where progress crosses 1.
+
+        Args:
+            times: Sample times in hours, shape (n_samples,) shared by all
+                profiles or (n_profiles, n_samples); must start at 0 and increase
+            temperatures: Temperatures in Celsius, shape (n_profiles, n_samples)
+            yeast_concentration: Scalar or one value per profile
+
+        Returns:
+            Completion time in hours for each profile
+        """
+        temperatures = np.atleast_2d(np.asarray(temperatures, dtype=np.float64))
+        n_profiles, n_samples = temperatures.shape
+        times = np.broadcast_to(np.asarray(times, dtype=np.float64), temperatures.shape)
+        if n_samples == 0:
+            raise ValueError("Profiles must have at least one sample")
+        if np.any(times[:, 0] != 0):
+            raise ValueError("Sample times must start at 0")
+        if np.any(np.diff(times, axis=1) <= 0):
+            raise ValueError("Sample times must be strictly increasing")
+
+        rates = self._rates(temperatures, self._yeast_column(yeast_concentration, n_profiles))
+
+        steps = np.diff(times, axis=1) * 0.5 * (rates[:, 1:] + rates[:, :-1])
+        progress = np.concatenate([np.zeros((n_profiles, 1)), np.cumsum(steps, axis=1)], axis=1)
+
+        done = progress >= 1.0
+        finished = done.any(axis=1)
+        rows = np.arange(n_profiles)
+        completion = np.empty(n_profiles)
+
+        # Interpolate within the interval where progress crosses 1
+        end = done.argmax(axis=1)[finished]
+        start = np.maximum(end - 1, 0)
+        r = rows[finished]
+        span = progress[r, end] - progress[r, start]
+        fraction = np.divide(1.0 - progress[r, start], span,
+                             out=np.zeros_like(span), where=span > 0)
+        completion[finished] = times[r, start] + fraction * (times[r, end] - times[r, start])
+
+        # Hold the final temperature after the last sample
+        r = rows[~finished]
+        completion[~finished] = times[r, -1] + (1.0 - progress[r, -1]) / rates[r, -1]
+        return completion
+
+def piecewise_profiles(profiles: Sequence[Sequence[Tuple[float, float]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack ragged lists of (duration, temperature) segments into padded arrays."""
+    n_segments = max((len(profile) for profile in profiles), default=0)
+    durations = np.zeros((len(profiles), n_segments))
+    temperatures = np.zeros((len(profiles), n_segments))
+
+    for i, profile in enumerate(profiles):
+        for j, (duration, temperature) in enumerate(profile):
+            durations[i, j] = duration
+            temperatures[i, j] = temperature
+        if profile and len(profile) < n_segments:
+            # Padding continues the last temperature with zero duration
+            temperatures[i, len(profile):] = profile[-1][1]
+
+    return durations, temperatures
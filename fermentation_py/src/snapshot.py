@@ -0,0 +1,56 @@
+from typing import Optional
+import logging
+
+from .models import ModelManager, FermentationModel
+from .validator import ModelValidator
+from .intervals import ConformalIntervals
+from .coverage import CoverageIndex
+from .inversion import TimeModelInverter
+
+logger = logging.getLogger(__name__)
+
+class ModelSnapshot:
+    """Everything a prediction reads, published as one unit.
+
+    A snapshot bundles the trained models, the validator holding their
+    stored validation results, the calibrated intervals, the coverage index
+    and the time-model inverter, tagged with a version number. It is built
+    completely before being published and never modified afterwards, so
+    readers that hold a reference see a consistent model set while the
+    next snapshot is trained or loaded elsewhere.
+
+    Default best models are resolved up front, so
+    ``model_manager.get_best_model`` never writes to a published snapshot.
+    """
+
+    __slots__ = ('version', 'model_manager', 'validator', 'intervals', 'coverage', 'inverter')
+
+    def __init__(self, version: int, model_manager: ModelManager,
+                 validator: Optional[ModelValidator] = None,
+                 intervals: Optional[ConformalIntervals] = None,
+                 coverage: Optional[CoverageIndex] = None):
+        for target, models in model_manager.models.items():
+            if models:
+                model_manager.get_best_model(target)
+
+        time_model = model_manager.best_models.get('time')
+        values = {
+            'version': version,
+            'model_manager': model_manager,
+            'validator': validator or ModelValidator(),
+            'intervals': intervals or ConformalIntervals(),
+            'coverage': coverage or CoverageIndex(),
+            'inverter': TimeModelInverter(time_model) if time_model is not None else None
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelSnapshot is immutable; build a new one instead")
+
+    @property
+    def is_trained(self) -> bool:
+        return any(self.model_manager.models.values())
+
+    def best_model(self, target: str) -> FermentationModel:
+        return self.model_manager.get_best_model(target)
@@ -0,0 +1,269 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+from .models import ModelManager, TARGET_COLUMNS
+from .validator import ModelValidator
+
+logger = logging.getLogger(__name__)
+
+# Column layout of long-format holdout files (one observation per row)
+HOLDOUT_COLUMNS = ['temperature', 'yeast_concentration', 'fermentation_time']
+
+class RunningMetrics:
+    """Mergeable running statistics for regression metrics.
+
+    Keeps sums of absolute and squared errors, the running mean and M2 of the
+    targets (for R²) and the first four central moments of the residuals.
+    Two instances built from disjoint chunks can be merged exactly.
+    Statistics marked ``failed`` (a model raised on some chunk) stay failed
+    when merged, since they no longer cover every observation.
+    """
+
+    def __init__(self):
+        self.failed = False
+        self.count = 0
+        self.sum_abs_error = 0.0
+        self.sum_sq_error = 0.0
+        self.y_mean = 0.0
+        self.y_m2 = 0.0
+        self.residual_mean = 0.0
+        self.residual_m2 = 0.0
+        self.residual_m3 = 0.0
+        self.residual_m4 = 0.0
+
+    @classmethod
+    def from_arrays(cls, y_true: np.ndarray, y_pred: np.ndarray) -> 'RunningMetrics':
+        """Compute statistics for a single chunk of observations."""
+        stats = cls()
+        y_true = np.asarray(y_true, dtype=np.float64)
+        residuals = y_true - np.asarray(y_pred, dtype=np.float64)
+
+        stats.count = len(y_true)
+        if stats.count == 0:
+            return stats
+
+        stats.sum_abs_error = float(np.abs(residuals).sum())
+        stats.sum_sq_error = float(np.dot(residuals, residuals))
+
+        stats.y_mean = float(y_true.mean())
+        stats.y_m2 = float(((y_true - stats.y_mean) ** 2).sum())
+
+        stats.residual_mean = float(residuals.mean())
+        centered = residuals - stats.residual_mean
+        centered_sq = centered * centered
+        stats.residual_m2 = float(centered_sq.sum())
+        stats.residual_m3 = float((centered_sq * centered).sum())
+        stats.residual_m4 = float((centered_sq * centered_sq).sum())
+        return stats
+
+    @classmethod
+    def failure(cls) -> 'RunningMetrics':
+        """Statistics of a chunk the model could not predict."""
+        stats = cls()
+        stats.failed = True
+        return stats
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> 'RunningMetrics':
+        """Add a chunk of observations."""
+        return self.merge(RunningMetrics.from_arrays(y_true, y_pred))
+
+    def merge(self, other: 'RunningMetrics') -> 'RunningMetrics':
+        """Merge statistics from another (disjoint) set of observations in place."""
+        failed = self.failed or other.failed
+        if other.count == 0:
+            self.failed = failed
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            self.failed = failed
+            return self
+
+        na, nb = float(self.count), float(other.count)
+        n = na + nb
+
+        # Target mean and M2 (Chan et al.)
+        delta_y = other.y_mean - self.y_mean
+        self.y_m2 += other.y_m2 + delta_y ** 2 * na * nb / n
+        self.y_mean += delta_y * nb / n
+
+        # Residual central moments up to fourth order (Pébay)
+        delta = other.residual_mean - self.residual_mean
+        delta2 = delta * delta
+        m2a, m3a, m4a = self.residual_m2, self.residual_m3, self.residual_m4
+        m2b, m3b, m4b = other.residual_m2, other.residual_m3, other.residual_m4
+
+        m2 = m2a + m2b + delta2 * na * nb / n
+        m3 = (m3a + m3b
+              + delta2 * delta * na * nb * (na - nb) / n ** 2
+              + 3.0 * delta * (na * m2b - nb * m2a) / n)
+        m4 = (m4a + m4b
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6.0 * delta2 * (na * na * m2b + nb * nb * m2a) / n ** 2
+              + 4.0 * delta * (na * m3b - nb * m3a) / n)
+
+        self.residual_mean += delta * nb / n
+        self.residual_m2, self.residual_m3, self.residual_m4 = m2, m3, m4
+
+        self.sum_abs_error += other.sum_abs_error
+        self.sum_sq_error += other.sum_sq_error
+        self.count += other.count
+        return self
+
+    @property
+    def rmse(self) -> float:
+        return float(np.sqrt(self.sum_sq_error / self.count)) if self.count else float('inf')
+
+    @property
+    def mae(self) -> float:
+        return self.sum_abs_error / self.count if self.count else float('inf')
+
+    @property
+    def r2(self) -> float:
+        if self.count == 0:
+            return -float('inf')
+        if self.y_m2 == 0:
+            # Same convention as sklearn.metrics.r2_score for constant targets
+            return 1.0 if self.sum_sq_error == 0 else 0.0
+        return 1.0 - self.sum_sq_error / self.y_m2
+
+    @property
+    def residual_std(self) -> float:
+        return float(np.sqrt(self.residual_m2 / self.count)) if self.count else float('nan')
+
+    @property
+    def residual_skew(self) -> float:
+        if self.count == 0 or self.residual_m2 == 0:
+            return 0.0
+        return float(np.sqrt(self.count) * self.residual_m3 / self.residual_m2 ** 1.5)
+
+    @property
+    def residual_kurtosis(self) -> float:
+        """Excess kurtosis of the residuals."""
+        if self.count == 0 or self.residual_m2 == 0:
+            return 0.0
+        return self.count * self.residual_m4 / self.residual_m2 ** 2 - 3.0
+
+    def to_metrics(self) -> Dict[str, float]:
+        """Metrics in the format returned by ModelValidator.validate_model.
+
+        A holdout set has no out-of-fold predictions, so ``cv_rmse`` and
+        ``cv_std`` are NaN and model ranking falls back to the holdout RMSE.
+        Failed models get infinite errors, as in validate_model.
+        """
+        if self.failed:
+            return {
+                'rmse': float('inf'),
+                'mae': float('inf'),
+                'r2': -float('inf'),
+                'cv_rmse': float('inf'),
+                'cv_std': float('inf'),
+                'n_samples': self.count
+            }
+        return {
+            'rmse': self.rmse,
+            'mae': self.mae,
+            'r2': self.r2,
+            'cv_rmse': float('nan'),
+            'cv_std': float('nan'),
+            'n_samples': self.count,
+            'residual_mean': self.residual_mean,
+            'residual_std': self.residual_std,
+            'residual_skew': self.residual_skew,
+            'residual_kurtosis': self.residual_kurtosis
+        }
+
+class StreamingEvaluator:
+    """Evaluate trained models against holdout files too large to fit in memory.
+
+    The holdout file is read in chunks of ``chunk_size`` rows. Each chunk is
+    scored independently into ``RunningMetrics`` and the partial results are
+    merged, so chunks can be evaluated in parallel with ``n_jobs``.
+    """
+
+    def __init__(self, model_manager: ModelManager, chunk_size: int = 100_000,
+                 n_jobs: int = 1):
+        self.model_manager = model_manager
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+    def iter_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """Yield chunks of a long-format holdout CSV."""
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Holdout file not found: {path}")
+
+        reader = pd.read_csv(path, usecols=HOLDOUT_COLUMNS, chunksize=self.chunk_size,
+                             dtype={col: np.float64 for col in HOLDOUT_COLUMNS})
+        for chunk in reader:
+            yield chunk
+
+    def _targets(self, targets: Optional[List[str]]) -> List[str]:
+        if targets is None:
+            targets = [t for t in TARGET_COLUMNS if self.model_manager.models.get(t)]
+        return targets
+
+    def evaluate_chunk(self, chunk: pd.DataFrame,
+                       targets: Optional[List[str]] = None) -> Dict[Tuple[str, str], RunningMetrics]:
+        """Score every model on a single chunk."""
+        partial = {}
+
+        for target in self._targets(targets):
+            feature_cols, target_col = TARGET_COLUMNS[target]
+            data = chunk[feature_cols + [target_col]].to_numpy(dtype=np.float64)
+            data = data[~np.isnan(data).any(axis=1)]
+            X, y = data[:, :2], data[:, 2]
+
+            for model_name, model in self.model_manager.models[target].items():
+                if len(y) == 0:
+                    partial[(target, model_name)] = RunningMetrics()
+                    continue
+                try:
+                    partial[(target, model_name)] = RunningMetrics.from_arrays(y, model.predict(X))
+                except Exception as e:
+                    logger.error(f"Streaming evaluation failed for {model_name} ({target}): {e}")
+                    partial[(target, model_name)] = RunningMetrics.failure()
+
+        return partial
+
+    def evaluate_file(self, path: str,
+                      targets: Optional[List[str]] = None) -> Dict[str, Dict[str, RunningMetrics]]:
+        """Stream a holdout file and return merged running statistics per target and model."""
+        targets = self._targets(targets)
+
+        if self.n_jobs == 1:
+            partials = (self.evaluate_chunk(chunk, targets) for chunk in self.iter_chunks(path))
+        else:
+            # Threads avoid pickling the models; pre_dispatch bounds the
+            # number of chunks held in memory at once.
+            partials = Parallel(n_jobs=self.n_jobs, prefer='threads',
+                                pre_dispatch='2*n_jobs')(
+                delayed(self.evaluate_chunk)(chunk, targets) for chunk in self.iter_chunks(path)
+            )
+
+        merged = {target: {} for target in targets}
+        n_chunks = 0
+        for partial in partials:
+            n_chunks += 1
+            for (target, model_name), stats in partial.items():
+                merged[target].setdefault(model_name, RunningMetrics()).merge(stats)
+
+        logger.info(f"Evaluated {n_chunks} chunks from {path}")
+        return merged
+
+    def validate_file(self, path: str,
+                      targets: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Validation results in the format returned by ModelValidator.validate_all_models."""
+        merged = self.evaluate_file(path, targets)
+        return {
+            target: {name: stats.to_metrics() for name, stats in models.items()
+                     if stats.count or stats.failed}
+            for target, models in merged.items()
+        }
+
+    def generate_report(self, path: str, targets: Optional[List[str]] = None) -> str:
+        """Generate the standard validation report from a streamed holdout file."""
+        return ModelValidator().generate_validation_report(self.validate_file(path, targets))
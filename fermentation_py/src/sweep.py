@@ -0,0 +1,112 @@
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+import logging
+
+from .input_validation import TYPICAL_RANGES
+
+logger = logging.getLogger(__name__)
+
+# Parameters in table order: the first swept one labels rows, the second columns
+SWEEP_PARAMETERS = tuple(TYPICAL_RANGES)
+
+def parameter_grid(start: float, stop: float, step: float) -> np.ndarray:
+    """Evenly spaced values from start to stop inclusive."""
+    if step <= 0:
+        raise ValueError("Sweep step must be positive")
+    if stop < start:
+        raise ValueError("Sweep stop must not be below start")
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return np.round(start + step * np.arange(n), 10)
+
+class GridSweep:
+    """Evaluate one parameter over the full grid of the other two.
+
+    The grid is evaluated in blocks of whole rows holding at most
+    ``chunk_size`` cells, each with a single vectorized prediction, so huge
+    grids never materialize all inputs at once and CSV output is streamed.
+    Tables use the wide layout of the training data: one row per value of the
+    row parameter, one column per value of the column parameter, e.g.
+    temperature (°C) rows by yeast (%) columns holding fermentation times.
+    """
+
+    def __init__(self, predict_fn: Callable[[str, Dict[str, np.ndarray]], np.ndarray],
+                 ranges: Dict[str, np.ndarray], chunk_size: int = 1_000_000):
+        """
+        Args:
+            predict_fn: Called as predict_fn(parameter, inputs) with the
+                parameter to predict and flat input arrays keyed by parameter
+            ranges: Values for exactly two of temperature, yeast_concentration
+                and fermentation_time
+            chunk_size: Maximum number of grid cells predicted at once
+        """
+        unknown = set(ranges) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        if len(ranges) != 2:
+            raise ValueError("Exactly 2 of 3 parameters must be swept")
+
+        self.row_parameter, self.column_parameter = [p for p in SWEEP_PARAMETERS if p in ranges]
+        self.predicted_parameter = next(p for p in SWEEP_PARAMETERS if p not in ranges)
+        self.row_values = np.asarray(ranges[self.row_parameter], dtype=np.float64)
+        self.column_values = np.asarray(ranges[self.column_parameter], dtype=np.float64)
+        self.predict_fn = predict_fn
+        self.chunk_size = chunk_size
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.row_values), len(self.column_values)
+
+    def iter_blocks(self) -> Iterator[Tuple[slice, np.ndarray]]:
+        """Yield (row slice, predictions of shape (rows, columns)) blocks."""
+        n_rows, n_columns = self.shape
+        rows_per_block = max(1, self.chunk_size // max(n_columns, 1))
+
+        for start in range(0, n_rows, rows_per_block):
+            rows = slice(start, min(start + rows_per_block, n_rows))
+            block_rows = self.row_values[rows]
+            inputs = {
+                self.row_parameter: np.repeat(block_rows, n_columns),
+                self.column_parameter: np.tile(self.column_values, len(block_rows))
+            }
+            predictions = self.predict_fn(self.predicted_parameter, inputs)
+            yield rows, np.asarray(predictions).reshape(len(block_rows), n_columns)
+
+    def evaluate(self, dtype=np.float64) -> np.ndarray:
+        """Full prediction matrix."""
+        matrix = np.empty(self.shape, dtype=dtype)
+        for rows, block in self.iter_blocks():
+            matrix[rows] = block
+        return matrix
+
+    def _labels(self, parameter: str, values: np.ndarray) -> list:
+        unit = TYPICAL_RANGES[parameter][3]
+        return [f"{value:g}{unit}" for value in values]
+
+    def to_csv(self, path: str, float_format: str = '%.6g'):
+        """Write the wide table, streaming one block at a time."""
+        import pandas as pd
+
+        path = Path(path)
+        header = [TYPICAL_RANGES[self.row_parameter][3]] + \
+            self._labels(self.column_parameter, self.column_values)
+        pd.DataFrame(columns=header).to_csv(path, index=False)
+
+        for rows, block in self.iter_blocks():
+            frame = pd.DataFrame(block, index=[f"{v:g}" for v in self.row_values[rows]])
+            frame.to_csv(path, mode='a', header=False, float_format=float_format)
+
+        logger.info(f"Wrote {self.shape[0]} x {self.shape[1]} {self.predicted_parameter} "
+                    f"grid to {path}")
+
+    def to_npz(self, path: str, dtype=np.float32):
+        """Save axis values and the prediction matrix, keyed by parameter name."""
+        np.savez(path, **{
+            self.row_parameter: self.row_values,
+            self.column_parameter: self.column_values,
+            self.predicted_parameter: self.evaluate(dtype),
+            'layout': np.array([self.row_parameter, self.column_parameter,
+                                self.predicted_parameter])
+        })
+        logger.info(f"Wrote {self.shape[0]} x {self.shape[1]} {self.predicted_parameter} "
+                    f"grid to {path}")
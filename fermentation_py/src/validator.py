@@ -1,51 +1,85 @@
 import numpy as np
-from sklearn.model_selection import cross_val_score, KFold
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Optional, Union
+import copy
 import logging
 
-from .models import ModelManager
+from .models import ModelManager, aggregate_dataset, prepare_datasets
+from .intervals import ConformalIntervals
+from .results_store import ValidationResultsStore
 
 logger = logging.getLogger(__name__)
 
+def selection_rmse(metrics: Dict[str, float]) -> float:
+    """RMSE used to rank models: out-of-fold when available.
+    
+    In-sample RMSE would always favour exact interpolators, which reproduce
+    their training table with zero error.
+    """
+    cv_rmse = metrics.get('cv_rmse')
+    if cv_rmse is not None and np.isfinite(cv_rmse):
+        return float(cv_rmse)
+    return float(metrics['rmse'])
+
 class ModelValidator:
     """Model validation and performance metrics."""
     
     def __init__(self, cv_folds: int = 5, random_state: int = 42):
         self.cv_folds = cv_folds
         self.random_state = random_state
-        self.kfold = KFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+        self._kfold = None
+        self.results_store = ValidationResultsStore()
+    
+    @property
+    def kfold(self):
+        """Cross-validation splitter, created on first use to keep imports lazy."""
+        if self._kfold is None:
+            from sklearn.model_selection import KFold
+            self._kfold = KFold(n_splits=self.cv_folds, shuffle=True,
+                                random_state=self.random_state)
+        return self._kfold
     
-    def validate_model(self, model, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
-        """Validate a single model and return performance metrics."""
+    def validate_model(self, model, X: np.ndarray, y: np.ndarray,
+                       target: Optional[str] = None,
+                       sample_weight: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Validate a single model and return performance metrics.
+        
+        When ``target`` is given, the in-sample and out-of-fold predictions
+        are kept in ``results_store`` for later analysis. ``sample_weight``
+        weights both the cross-validation fits and the metrics.
+        """
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+        
         try:
             # Make predictions
             y_pred = model.predict(X)
             
             # Calculate metrics
-            rmse = np.sqrt(mean_squared_error(y, y_pred))
-            mae = mean_absolute_error(y, y_pred)
-            r2 = r2_score(y, y_pred)
+            rmse = np.sqrt(mean_squared_error(y, y_pred, sample_weight=sample_weight))
+            mae = mean_absolute_error(y, y_pred, sample_weight=sample_weight)
+            r2 = r2_score(y, y_pred, sample_weight=sample_weight)
             
-            # Calculate cross-validation scores for sklearn models
-            cv_scores = None
-            if hasattr(model.model, 'fit') and hasattr(model.model, 'predict'):
-                try:
-                    cv_scores = cross_val_score(
-                        model.model, X, y, 
-                        cv=self.kfold, 
-                        scoring='neg_mean_squared_error'
-                    )
-                    cv_rmse = np.sqrt(-cv_scores.mean())
-                    cv_std = cv_scores.std()
-                except Exception as e:
-                    logger.warning(f"Cross-validation failed for {model.name}: {e}")
-                    cv_rmse = rmse
-                    cv_std = 0.0
-            else:
+            # Cross-validate from out-of-fold predictions
+            oof_predictions, folds = None, None
+            try:
+                oof_predictions, folds = self.cross_val_predict(model, X, y, return_folds=True,
+                                                                sample_weight=sample_weight)
+                fold_mse = np.array([
+                    mean_squared_error(y[folds == fold], oof_predictions[folds == fold],
+                                       sample_weight=None if sample_weight is None
+                                       else sample_weight[folds == fold])
+                    for fold in range(self.cv_folds)
+                ])
+                cv_rmse = np.sqrt(fold_mse.mean())
+                cv_std = fold_mse.std()
+            except Exception as e:
+                logger.warning(f"Cross-validation failed for {model.name}: {e}")
                 cv_rmse = rmse
                 cv_std = 0.0
             
+            if target is not None:
+                self.results_store.add(target, model.name, X, y, y_pred,
+                                       oof_predictions, folds, sample_weight)
+            
             return {
                 'rmse': rmse,
                 'mae': mae,
@@ -66,24 +100,29 @@ class ModelValidator:
     
     def validate_all_models(self, model_manager: ModelManager, 
                           temp: np.ndarray, yeast: np.ndarray, 
-                          time: np.ndarray) -> Dict[str, Dict[str, Dict[str, float]]]:
-        """Validate all models for all prediction targets."""
-        results = {}
+                          time: np.ndarray,
+                          aggregate: bool = False) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Validate all models for all prediction targets.
         
-        # Prepare data for different prediction tasks
-        datasets = {
-            'time': (np.column_stack([temp, yeast]), time),
-            'temperature': (np.column_stack([time, yeast]), temp),
-            'yeast': (np.column_stack([time, temp]), yeast)
-        }
+        With ``aggregate``, models are validated on the distinct input rows
+        weighted by their counts (see aggregate_dataset). Folds then hold
+        out whole input settings, and the metrics measure errors against
+        the mean of each setting.
+        """
+        results = {}
+        self.results_store = ValidationResultsStore()
         
-        for target, (X, y) in datasets.items():
+        for target, (X, y) in prepare_datasets(temp, yeast, time).items():
             results[target] = {}
+            counts = None
+            if aggregate and model_manager.models.get(target):
+                X, y, counts, _ = aggregate_dataset(X, y)
+                X = np.asarray(X, dtype=np.float64)
             
             if target in model_manager.models:
                 for model_name, model in model_manager.models[target].items():
                     logger.info(f"Validating {model_name} for {target} prediction")
-                    metrics = self.validate_model(model, X, y)
+                    metrics = self.validate_model(model, X, y, target, counts)
                     results[target][model_name] = metrics
                     
                     logger.info(f"{model_name} - RMSE: {metrics['rmse']:.3f}, "
@@ -97,16 +136,19 @@ class ModelValidator:
         if target not in validation_results:
             raise ValueError(f"No validation results for target: {target}")
         
-        # Find model with lowest RMSE
+        # Find model with lowest cross-validated RMSE
         best_model = min(
             validation_results[target].items(),
-            key=lambda x: x[1]['rmse']
+            key=lambda x: selection_rmse(x[1])
         )
         
         return best_model
     
-    def generate_validation_report(self, validation_results: Dict[str, Dict[str, Dict[str, float]]]) -> str:
-        """Generate a formatted validation report."""
+    def generate_validation_report(self, validation_results: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None) -> str:
+        """Generate a formatted validation report (from ``results_store`` if no results are given)."""
+        if validation_results is None:
+            validation_results = self.results_store.to_validation_results()
+        
         report = []
         report.append("=" * 80)
         report.append("FERMENTATION MODEL VALIDATION REPORT")
@@ -119,10 +161,10 @@ class ModelValidator:
             report.append(f"\n{target.upper()} PREDICTION MODELS:")
             report.append("-" * 40)
             
-            # Sort models by RMSE
+            # Sort models by cross-validated RMSE
             sorted_models = sorted(
                 validation_results[target].items(),
-                key=lambda x: x[1]['rmse']
+                key=lambda x: selection_rmse(x[1])
             )
             
             for model_name, metrics in sorted_models:
@@ -136,25 +178,66 @@ class ModelValidator:
             # Highlight best model
             if sorted_models:
                 best_model, best_metrics = sorted_models[0]
-                report.append(f"\n★ BEST MODEL: {best_model} (RMSE: {best_metrics['rmse']:.4f})")
+                report.append(f"\n★ BEST MODEL: {best_model} "
+                              f"(CV-RMSE: {selection_rmse(best_metrics):.4f})")
         
         report.append("\n" + "=" * 80)
         return "\n".join(report)
     
+    def cross_val_predict(self, model, X: np.ndarray, y: np.ndarray,
+                          return_folds: bool = False,
+                          sample_weight: Optional[np.ndarray] = None) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Out-of-fold predictions, refitting a copy of the model on each fold."""
+        oof_predictions = np.empty(len(y), dtype=np.float64)
+        folds = np.empty(len(y), dtype=np.int8)
+        
+        for fold, (train_idx, test_idx) in enumerate(self.kfold.split(X)):
+            fold_model = copy.deepcopy(model)
+            fold_model.fit(X[train_idx], y[train_idx],
+                           None if sample_weight is None else sample_weight[train_idx])
+            oof_predictions[test_idx] = fold_model.predict(X[test_idx])
+            folds[test_idx] = fold
+        
+        if return_folds:
+            return oof_predictions, folds
+        return oof_predictions
+    
+    def calibrate_intervals(self, model, X: np.ndarray, y: np.ndarray, target: str,
+                            intervals: ConformalIntervals) -> ConformalIntervals:
+        """Calibrate conformal intervals for a model from its out-of-fold residuals.
+        
+        Reuses out-of-fold predictions from ``results_store`` when the model
+        was validated on the same data.
+        """
+        oof_predictions = None
+        if self.results_store.has(target, model.name) and target not in self.results_store.weights \
+                and self.results_store.matches(target, X, y):
+            oof_predictions = self.results_store.out_of_fold(target, model.name)
+        if oof_predictions is None:
+            oof_predictions = self.cross_val_predict(model, X, y)
+        scale_floor = (np.max(y) - np.min(y)) * 0.01
+        intervals.fit(target, y, oof_predictions, model.name, scale_floor=scale_floor)
+        return intervals
+    
     def calculate_prediction_intervals(self, model, X: np.ndarray, 
-                                     confidence_level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
-        """Calculate prediction intervals (simplified approach)."""
-        # This is a simplified approach - proper prediction intervals would require
-        # model-specific statistical methods
+                                     confidence_level: float = 0.95,
+                                     intervals: Optional[ConformalIntervals] = None,
+                                     target: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate prediction intervals.
         
+        Uses split-conformal intervals when calibrated ``intervals`` are given
+        for ``target``, otherwise falls back to a rough spread-based estimate.
+        """
         predictions = model.predict(X)
         
-        # Estimate prediction variance (simplified)
-        # In practice, this would be model-specific
-        prediction_std = np.std(predictions) * 0.2  # Rough estimate
+        if intervals is not None and target is not None and intervals.is_fitted(target):
+            return intervals.interval(target, predictions, confidence_level)
         
-        # Calculate confidence intervals
-        z_score = 1.96 if confidence_level == 0.95 else 2.58  # 95% or 99%
+        # Rough estimate without calibration residuals
+        from scipy.stats import norm
+        prediction_std = np.std(predictions) * 0.2
+        
+        z_score = norm.ppf(0.5 + confidence_level / 2)
         margin_of_error = z_score * prediction_std
         
         lower_bound = predictions - margin_of_error
@@ -162,8 +245,18 @@ class ModelValidator:
         
         return lower_bound, upper_bound
     
-    def residual_analysis(self, model, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
-        """Perform residual analysis."""
+    def residual_analysis(self, model, X: np.ndarray, y: np.ndarray,
+                          target: Optional[str] = None) -> Dict[str, Any]:
+        """Perform residual analysis.
+        
+        Uses stored predictions when ``target`` is given and the model was
+        validated on the same data, otherwise predicts again.
+        """
+        if target is not None and self.results_store.has(target, model.name) \
+                and target not in self.results_store.weights \
+                and self.results_store.matches(target, X, y):
+            return self.results_store.residual_analysis(target, model.name)
+        
         predictions = model.predict(X)
         residuals = y - predictions
         
@@ -176,26 +269,34 @@ class ModelValidator:
             'actual_values': y
         }
     
-    def compare_models(self, validation_results: Dict[str, Dict[str, Dict[str, float]]], 
+    def compare_models(self, validation_results: Optional[Dict[str, Dict[str, Dict[str, float]]]], 
                       target: str) -> Dict[str, Any]:
-        """Compare models for a specific target."""
+        """Compare models for a specific target.
+        
+        Pass ``None`` as ``validation_results`` to compare from ``results_store``.
+        """
+        if validation_results is None:
+            validation_results = self.results_store.to_validation_results()
+        
         if target not in validation_results:
             return {}
         
         models_data = validation_results[target]
         
         # Find best and worst models
-        best_model = min(models_data.items(), key=lambda x: x[1]['rmse'])
-        worst_model = max(models_data.items(), key=lambda x: x[1]['rmse'])
+        best_model = min(models_data.items(), key=lambda x: selection_rmse(x[1]))
+        worst_model = max(models_data.items(), key=lambda x: selection_rmse(x[1]))
         
-        # Calculate improvement
-        improvement = (worst_model[1]['rmse'] - best_model[1]['rmse']) / worst_model[1]['rmse'] * 100
+        # Calculate improvement on the same RMSE the models were ranked by
+        best_rmse = selection_rmse(best_model[1])
+        worst_rmse = selection_rmse(worst_model[1])
+        improvement = (worst_rmse - best_rmse) / worst_rmse * 100
         
         return {
             'best_model': best_model[0],
-            'best_rmse': best_model[1]['rmse'],
+            'best_rmse': best_rmse,
             'worst_model': worst_model[0],
-            'worst_rmse': worst_model[1]['rmse'],
+            'worst_rmse': worst_rmse,
             'improvement_percent': improvement,
             'model_count': len(models_data)
         }
\ No newline at end of file
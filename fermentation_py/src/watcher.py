@@ -0,0 +1,351 @@
+import csv
+import hashlib
+import io
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from .model_store import commit_directory
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK = 1 << 20
+
+@dataclass(frozen=True)
+class DataFingerprint:
+    """Size, modification time and content hash of the data file."""
+    size: int
+    mtime_ns: int
+    digest: str
+
+def fingerprint(path: str, prefix_size: Optional[int] = None) -> Tuple[DataFingerprint, Optional[str]]:
+    """Fingerprint a file in one streaming pass.
+
+    Args:
+        path: File to fingerprint
+        prefix_size: Also hash the first ``prefix_size`` bytes, to tell
+            whether the file only grew since an earlier fingerprint
+
+    Returns:
+        Tuple of the fingerprint and the prefix digest (None if not requested
+        or the file is shorter)
+    """
+    stat = Path(path).stat()
+    hasher = hashlib.blake2b(digest_size=16)
+    prefix_digest = None
+    read = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(_HASH_BLOCK)
+            at_prefix = prefix_size is not None and read + len(block) >= prefix_size
+            if at_prefix and prefix_digest is None:
+                head = hasher.copy()
+                head.update(block[:prefix_size - read])
+                prefix_digest = head.hexdigest()
+            if not block:
+                break
+            hasher.update(block)
+            read += len(block)
+    return DataFingerprint(stat.st_size, stat.st_mtime_ns, hasher.hexdigest()), prefix_digest
+
+def count_data_rows(path: str, offset: int) -> int:
+    """Rows from byte ``offset`` on that carry a temperature and at least one positive time."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        text = f.read().decode('utf-8', errors='replace')
+
+    count = 0
+    for row in csv.reader(io.StringIO(text)):
+        if not row or not any(ch.isdigit() for ch in row[0]):
+            continue
+        for cell in row[1:]:
+            try:
+                if float(cell) > 0:
+                    count += 1
+                    break
+            except ValueError:
+                continue
+    return count
+
+def retrain_models(data_path: str, model_dir: str, inverse_mode: str = 'model',
+                   surrogate_tolerance: Optional[float] = None,
+                   data_filters: Optional[Dict[str, Any]] = None,
+                   aggregate_training: bool = False) -> Dict[str, Any]:
+    """Train and save a full model set into ``model_dir``; runs in the worker process.
+
+    Returns:
+        Dictionary with the stored validation results ('performance'), the
+        calibrated model name per target ('best_models') and the number of
+        training samples
+    """
+    from .predictor import FermentationPredictor
+
+    predictor = FermentationPredictor(data_path, model_dir, inverse_mode=inverse_mode,
+                                      surrogate_tolerance=surrogate_tolerance,
+                                      data_filters=data_filters,
+                                      aggregate_training=aggregate_training)
+    predictor.train_models(retrain=True)
+    snapshot = predictor.snapshot
+    return {
+        'performance': snapshot.validator.results_store.to_validation_results(),
+        'best_models': dict(snapshot.intervals.model_names),
+        'n_samples': int(predictor.get_data_summary()['total_samples'])
+    }
+
+def check_validation(candidate: Dict[str, Any], current_performance: Dict[str, Dict[str, Any]],
+                     current_best: Dict[str, str], max_rmse_increase: float = 0.25,
+                     required_targets: Tuple[str, ...] = ('time',)) -> Tuple[bool, str]:
+    """Decide whether a retrained model set may replace the serving one.
+
+    The candidate needs a validated, finite-RMSE model for every required
+    target, and no target's best cross-validated RMSE may exceed the
+    serving model's by more than ``max_rmse_increase`` (relative). The
+    in-sample RMSE is only used for metrics without ``cv_rmse``; it is zero
+    for exact interpolators, which would block every retrain.
+
+    Returns:
+        Tuple of the verdict and a reason
+    """
+    performance = candidate.get('performance', {})
+    best = candidate.get('best_models', {})
+
+    for target in required_targets:
+        if target not in best or best[target] not in performance.get(target, {}):
+            return False, f"no validated model for {target}"
+
+    for target, model_name in best.items():
+        metrics = performance.get(target, {}).get(model_name)
+        if metrics is None:
+            continue
+        rmse = _gate_rmse(metrics)
+        if not rmse < float('inf'):
+            return False, f"{target} RMSE is not finite"
+
+        serving = current_performance.get(target, {}).get(current_best.get(target))
+        if serving is not None and rmse > _gate_rmse(serving) * (1 + max_rmse_increase):
+            return False, (f"{target} CV-RMSE {rmse:.4g} worse than serving "
+                           f"{_gate_rmse(serving):.4g} by more than {max_rmse_increase:.0%}")
+    return True, "validation passed"
+
+def _gate_rmse(metrics: Dict[str, Any]) -> float:
+    """Cross-validated RMSE, or the in-sample RMSE when cross-validation did not run."""
+    return float(metrics.get('cv_rmse', metrics['rmse']))
+
+class RetrainWatcher:
+    """Retrain a predictor's models when its data file changes.
+
+    Each ``poll`` stats the data file, which is cheap; the file is only
+    hashed once its size or mtime changed and then stayed put for
+    ``debounce`` seconds. A file that was only touched is ignored, as is an
+    append without any usable data rows (only the appended bytes are
+    parsed). Otherwise the models are retrained in a worker process into a
+    staging directory; none of the models can be fitted incrementally, so
+    this is always a full retrain.
+
+    The predictor keeps serving its current snapshot meanwhile. The new
+    model set is loaded and swapped in, and replaces the model directory,
+    only if ``check_validation`` passes. Duration and outcome of
+    every retrain are kept in ``stats()`` and passed to ``on_retrain``.
+    """
+
+    def __init__(self, predictor, poll_interval: float = 5.0, debounce: float = 30.0,
+                 max_rmse_increase: float = 0.25, use_processes: bool = True,
+                 on_retrain: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.predictor = predictor
+        self.data_path = str(predictor.data_path)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.max_rmse_increase = max_rmse_increase
+        self.use_processes = use_processes
+        self.on_retrain = on_retrain
+
+        self._executor: Optional[Executor] = None
+        self._future: Optional[Future] = None
+        self._staging: Optional[str] = None
+        self._started_at = 0.0
+        self._started_wall = 0.0
+        self._candidate: Optional[DataFingerprint] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Models loaded at startup are taken to match the current file
+        self._trained: Optional[DataFingerprint] = None
+        if predictor.is_trained and Path(self.data_path).exists():
+            self._trained = fingerprint(self.data_path)[0]
+        self._seen: Optional[Tuple[int, int]] = None
+        self._changed_at = float('-inf')
+
+        self.counters = {'retrains': 0, 'published': 0, 'rejected': 0, 'failed': 0,
+                         'skipped': 0}
+        self.last_retrain: Optional[Dict[str, Any]] = None
+        self.total_duration = 0.0
+
+    @property
+    def busy(self) -> bool:
+        """Whether a retrain is running."""
+        return self._future is not None
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Check the data file once, starting or finishing a retrain as needed.
+
+        Returns:
+            Record of a retrain that finished during this poll, else None
+        """
+        record = None
+        if self._future is not None and self._future.done():
+            record = self._finish()
+
+        try:
+            stat = Path(self.data_path).stat()
+        except FileNotFoundError:
+            logger.warning(f"Data file not found: {self.data_path}")
+            return record
+
+        seen = (stat.st_size, stat.st_mtime_ns)
+        now = time.monotonic()
+        if seen != self._seen:
+            # Restart the quiet period on every change
+            self._seen = seen
+            self._changed_at = now
+        elif (self._future is None and now - self._changed_at >= self.debounce
+              and (self._trained is None or seen != (self._trained.size, self._trained.mtime_ns))):
+            self._maybe_start()
+        return record
+
+    def _maybe_start(self):
+        """Hash the settled file and start a retrain if its content needs one."""
+        prefix_size = self._trained.size if self._trained is not None else None
+        current, prefix_digest = fingerprint(self.data_path, prefix_size)
+
+        if self._trained is not None:
+            if current.digest == self._trained.digest:
+                logger.debug("Data file touched without content changes")
+                self._trained = current
+                return
+            if prefix_digest == self._trained.digest and \
+                    count_data_rows(self.data_path, self._trained.size) == 0:
+                logger.info("Appended data has no usable rows, keeping current models")
+                self._trained = current
+                self.counters['skipped'] += 1
+                return
+
+        model_dir = self.predictor.model_dir
+        parent = Path(model_dir).resolve().parent if model_dir else None
+        self._staging = tempfile.mkdtemp(prefix='retrain-', dir=parent)
+        self._candidate = current
+        self._started_at = time.monotonic()
+        self._started_wall = time.time()
+        self.counters['retrains'] += 1
+        logger.info(f"Data file changed, retraining in the background into {self._staging}")
+        self._future = self._get_executor().submit(
+            retrain_models, self.data_path, self._staging, self.predictor.inverse_mode,
+            self.predictor.surrogate_tolerance, self.predictor.data_loader.filters,
+            self.predictor.aggregate_training
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                # Spawned, since forking a process with serving threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='retrain')
+        return self._executor
+
+    def _finish(self) -> Dict[str, Any]:
+        """Gate and publish a finished retrain, recording its outcome."""
+        future, staging = self._future, self._staging
+        self._future = self._staging = None
+        record = {'started_at': self._started_wall}
+
+        try:
+            candidate = future.result()
+            snapshot = self.predictor.snapshot
+            passed, reason = check_validation(
+                candidate, snapshot.validator.results_store.to_validation_results(),
+                snapshot.intervals.model_names, self.max_rmse_increase
+            )
+            record.update(n_samples=candidate['n_samples'], best_models=candidate['best_models'])
+            if passed:
+                if not self.predictor.load_models(staging):
+                    raise RuntimeError("Retrained models could not be loaded")
+                self._persist(staging)
+                outcome = 'published'
+            else:
+                outcome = 'rejected'
+        except Exception as e:
+            outcome, reason = 'failed', str(e)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        # A rejected or failed data version is not retried until the file changes again
+        self._trained = self._candidate
+        duration = time.monotonic() - self._started_at
+        self.counters[outcome] += 1
+        self.total_duration += duration
+        record.update(outcome=outcome, reason=reason, duration_s=duration,
+                      model_version=self.predictor.model_version)
+        self.last_retrain = record
+
+        log = logger.info if outcome == 'published' else logger.warning
+        log(f"Retrain {outcome} after {duration:.1f}s: {reason}")
+        if self.on_retrain is not None:
+            self.on_retrain(record)
+        return record
+
+    def _persist(self, staging: str):
+        """Swap a published model set in as the predictor's model directory."""
+        if not self.predictor.model_dir:
+            return
+        commit_directory(staging, self.predictor.model_dir)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retrain counters, durations and the last retrain's record."""
+        finished = self.counters['published'] + self.counters['rejected'] + self.counters['failed']
+        return dict(
+            self.counters,
+            running=self.busy,
+            total_duration_s=self.total_duration,
+            mean_duration_s=self.total_duration / finished if finished else 0.0,
+            last_retrain=self.last_retrain
+        )
+
+    def run(self, max_polls: Optional[int] = None):
+        """Poll every ``poll_interval`` seconds until ``stop`` is called."""
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            self.poll()
+            polls += 1
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> threading.Thread:
+        """Run the watcher in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='retrain-watcher', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, wait: bool = True):
+        """Stop polling and shut down the worker; ``wait`` lets a running retrain finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+        if self._future is not None:
+            if self._future.done():
+                self._finish()
+            else:
+                shutil.rmtree(self._staging, ignore_errors=True)
+                self._future = self._staging = None
@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import tempfile
+from pathlib import Path
+
+from src.arena import load_arena, save_arena, ALIGNMENT
+
+class TestArena:
+
+    @pytest.fixture
+    def arrays(self):
+        """Arrays of mixed dtypes and shapes, including scalars and empty ones."""
+        return {
+            'nodes': np.arange(1000, dtype=np.int32),
+            'threshold': np.linspace(0, 1, 7)[::2],
+            'table': np.ones((3, 5), dtype=np.float32),
+            'name': np.array('RandomForest'),
+            'depth': np.asarray(12),
+            'empty': np.zeros(0)
+        }
+
+    def test_round_trip_read_only(self, arrays):
+        """Test arrays come back equal, aligned and read-only, mapped or not."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = save_arena(Path(temp_dir) / 'models.arena', arrays)
+            for mmap in (True, False):
+                loaded = load_arena(path, mmap=mmap)
+                assert loaded.keys() == arrays.keys()
+                for key, value in arrays.items():
+                    np.testing.assert_array_equal(loaded[key], value)
+                    assert loaded[key].dtype == value.dtype
+                    assert not loaded[key].flags.writeable
+                assert str(loaded['name']) == 'RandomForest'
+                if mmap:
+                    assert loaded['threshold'].ctypes.data % ALIGNMENT == 0
+            del loaded
+
+    def test_replace_keeps_existing_views(self, arrays):
+        """Test rewriting the file leaves arrays mapped from the old one intact."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'models.arena'
+            save_arena(path, arrays)
+            old = load_arena(path)
+
+            save_arena(path, {'nodes': np.zeros(10, dtype=np.int32)})
+            np.testing.assert_array_equal(old['nodes'], arrays['nodes'])
+            assert load_arena(path)['nodes'].sum() == 0
+            assert [p.name for p in Path(temp_dir).iterdir()] == ['models.arena']
+            del old
+
+    def test_rejects_bad_input(self):
+        """Test object arrays and foreign files are refused."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'models.arena'
+            with pytest.raises(TypeError):
+                save_arena(path, {'objects': np.array([{}, None], dtype=object)})
+            path.write_bytes(b'not an arena')
+            with pytest.raises(ValueError):
+                load_arena(path)
@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.batch_results import PredictionBatch, TARGETS
+from src.input_validation import FLAG_EXTRAPOLATION
+
+class TestPredictionBatch:
+
+    @pytest.fixture
+    def batch(self):
+        """Batch with one time, one yeast and one failed row."""
+        inputs = {
+            'temperature': np.array([20.0, 15.0, np.nan]),
+            'yeast_concentration': np.array([0.05, np.nan, np.nan]),
+            'fermentation_time': np.array([np.nan, 48.0, 10.0])
+        }
+        flags = np.array([FLAG_EXTRAPOLATION, 0, 0], dtype=np.int8)
+        batch = PredictionBatch(inputs, flags, pd.Index([10, 11, 12]))
+        batch.set_predictions(np.array([0]), 'time', np.array([12.5]),
+                              np.array([10.0]), np.array([15.0]), 'Arrhenius')
+        batch.set_predictions(np.array([1]), 'yeast', np.array([0.04]),
+                              np.array([0.03]), np.array([0.05]), 'Linear')
+        batch.distance[:2] = [0.5, 0.1]
+        batch.set_error(np.array([2]), "Exactly 2 of 3 parameters must be provided")
+        return batch
+
+    def test_columnar_dtypes(self, batch):
+        """Test results are stored as compact per-column arrays."""
+        assert len(batch) == 3
+        assert batch.value.dtype == np.float32
+        assert batch.lower.dtype == np.float32
+        assert batch.model.dtype == np.int16
+        assert batch.target.dtype == np.int8
+        assert TARGETS[batch.target[1]] == 'yeast'
+        assert batch.target[2] == -1
+        assert batch.model_names == ['Arrhenius', 'Linear']
+        np.testing.assert_array_equal(batch.failed, [False, False, True])
+
+    def test_to_frame_shares_memory(self, batch):
+        """Test the DataFrame view does not copy numeric columns."""
+        frame = batch.to_frame()
+
+        assert np.shares_memory(frame['predicted_value'].to_numpy(), batch.value)
+        assert np.shares_memory(frame['confidence_lower'].to_numpy(), batch.lower)
+        assert list(frame['row_index']) == [10, 11, 12]
+        assert list(frame['model_used'].astype(object)[:2]) == ['Arrhenius', 'Linear']
+        assert pd.isna(frame['model_used'].iloc[2])
+        assert frame['predicted_parameter'].iloc[1] == 'yeast_concentration'
+        assert frame['unit'].iloc[0] == 'hours'
+        assert frame['extrapolation'].tolist() == [True, False, False]
+        assert frame['error'].iloc[2].startswith("Exactly 2")
+
+    def test_to_frame_interval_tuples(self, batch):
+        """Test the legacy schema with a confidence_interval column."""
+        frame = batch.to_frame(interval_tuples=True)
+
+        assert 'confidence_lower' not in frame.columns
+        assert frame['confidence_interval'].iloc[0] == (10.0, 15.0)
+
+    def test_result_dict(self, batch):
+        """Test single rows convert to the single-prediction schema."""
+        result = batch.result(0)
+
+        assert result['predicted_parameter'] == 'fermentation_time'
+        assert result['predicted_value'] == pytest.approx(12.5)
+        assert result['confidence_interval'] == (10.0, 15.0)
+        assert result['input_temperature'] == 20.0
+        assert result['input_yeast_concentration'] == pytest.approx(0.05)
+        assert 'input_fermentation_time' not in result
+        assert result['model_used'] == 'Arrhenius'
+        assert result['distance_to_nearest_observation'] == pytest.approx(0.5)
+        assert result['extrapolation'] is True
+
+        assert batch.result(1)['input_fermentation_time'] == 48.0
+        assert batch.result(2) == {'row_index': 12,
+                                   'error': "Exactly 2 of 3 parameters must be provided"}
+        assert len(list(batch.results())) == 3
+
+
+    def test_concat(self, batch):
+        """Test joined batches keep row order, model names and error rows."""
+        inputs = {'temperature': np.array([25.0]), 'yeast_concentration': np.array([np.nan]),
+                  'fermentation_time': np.array([6.0])}
+        second = PredictionBatch(inputs, index=pd.Index([13]))
+        second.set_predictions(np.array([0]), 'yeast', np.array([0.02]),
+                               np.array([0.01]), np.array([0.03]), 'Linear')
+
+        merged = PredictionBatch.concat([batch, second, batch])
+
+        assert len(merged) == 7
+        assert list(merged.index) == [10, 11, 12, 13, 10, 11, 12]
+        assert merged.model_names == ['Arrhenius', 'Linear']
+        assert merged.result(3)['model_used'] == 'Linear'
+        assert merged.result(4)['model_used'] == 'Arrhenius'
+        assert sorted(merged.errors) == [2, 6]
+        np.testing.assert_array_equal(merged.inputs['temperature'][3:5], [25.0, 20.0])
+        assert merged.flags.tolist() == [FLAG_EXTRAPOLATION, 0, 0, 0, FLAG_EXTRAPOLATION, 0, 0]
+        assert len(PredictionBatch.concat([])) == 0
\ No newline at end of file
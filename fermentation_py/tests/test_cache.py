@@ -0,0 +1,103 @@
+import pytest
+import numpy as np
+from unittest import mock
+
+from src.cache import PredictionCache, ENTRY_BYTES
+
+class TestPredictionCache:
+
+    @pytest.fixture
+    def cache(self):
+        """Cache with room for 100 entries."""
+        return PredictionCache(max_bytes=100 * ENTRY_BYTES)
+
+    def _store(self, cache, keys, values, model_name='Linear'):
+        values = np.asarray(values, dtype=np.float64)
+        cache.store(keys, values, values - 1, values + 1, np.zeros(len(values)),
+                    values > 50, model_name)
+
+    def test_quantize(self, cache):
+        """Test nearby inputs share a key and snapped values lie on the grid."""
+        X, keys, cacheable = cache.quantize('time', [[15.001, 0.1], [14.999, 0.100004],
+                                                     [15.02, 0.1], [np.nan, 0.1]])
+        assert keys[0] == keys[1]
+        assert keys[0] != keys[2]
+        assert cacheable.tolist() == [True, True, True, False]
+        np.testing.assert_allclose(X[0], [15.0, 0.1])
+
+        # Same inputs for another target give another key
+        _, other, _ = cache.quantize('temperature', [[15.001, 0.1]])
+        assert other[0] != keys[0]
+
+    def test_lookup_store(self, cache):
+        """Test small and vectorized lookups find stored entries and count hits."""
+        _, keys, _ = cache.quantize('time', np.column_stack([np.arange(40.0), np.full(40, 0.1)]))
+        self._store(cache, keys[:20], np.arange(20.0))
+
+        slots = cache.lookup(keys[:3])
+        np.testing.assert_array_equal(cache.values[slots], [0.0, 1.0, 2.0])
+
+        slots = cache.lookup(keys)
+        assert (slots[:20] >= 0).all() and (slots[20:] < 0).all()
+        np.testing.assert_array_equal(cache.values[slots[:20]], np.arange(20.0))
+        assert cache.model_names[cache.model[slots[0]]] == 'Linear'
+
+        stats = cache.stats()
+        assert stats['hits'] == 23
+        assert stats['misses'] == 20
+        assert stats['hit_rate'] == pytest.approx(23 / 43)
+        assert stats['bytes'] == 20 * ENTRY_BYTES
+
+    def test_lru_eviction_within_budget(self, cache):
+        """Test the byte budget holds and recently used entries survive eviction."""
+        _, keys, _ = cache.quantize('time', np.column_stack([np.arange(150.0), np.full(150, 0.1)]))
+        self._store(cache, keys[:100], np.arange(100.0))
+        cache.lookup(keys[:10])  # Recently used
+
+        self._store(cache, keys[100:150], np.arange(100.0, 150.0))
+
+        assert len(cache) <= cache.capacity
+        assert cache.nbytes <= cache.max_bytes
+        assert cache.evictions >= 50
+        assert (cache.lookup(keys[:10]) >= 0).all()
+        assert (cache.lookup(keys[100:150]) >= 0).all()
+        assert (cache.lookup(keys[10:60]) < 0).any()
+
+    def test_ttl_expiry(self):
+        """Test entries older than the TTL are misses."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl=60.0)
+        _, keys, _ = cache.quantize('time', [[15.0, 0.1]])
+
+        with mock.patch('src.cache.time.monotonic', return_value=1000.0):
+            self._store(cache, keys, [10.0])
+        with mock.patch('src.cache.time.monotonic', return_value=1030.0):
+            assert cache.lookup(keys)[0] >= 0
+        with mock.patch('src.cache.time.monotonic', return_value=1100.0):
+            assert cache.lookup(keys)[0] < 0
+
+    def test_version_change_clears(self, cache):
+        """Test a new model version drops all entries."""
+        cache.check_version(1)
+        _, keys, _ = cache.quantize('time', [[15.0, 0.1]])
+        self._store(cache, keys, [10.0])
+
+        cache.check_version(1)
+        assert len(cache) == 1
+        cache.check_version(2)
+        assert len(cache) == 0
+        assert cache.lookup(keys)[0] < 0
+
+    def test_outdated_version_ignored(self, cache):
+        """Test lookups and stores for a replaced model version neither hit nor clear."""
+        _, keys, _ = cache.quantize('time', [[15.0, 0.1], [16.0, 0.1]])
+        cache.check_version(2)
+        self._store(cache, keys[:1], [10.0])
+
+        cache.store(keys[1:], 20.0, 19.0, 21.0, 0.0, False, 'Linear', version=1)
+        assert len(cache) == 1
+        assert cache.lookup(keys[:1], version=1)[0] < 0
+
+        hit, entries = cache.fetch(keys, version=2)
+        assert hit.tolist() == [True, False]
+        assert entries['value'].tolist() == [10.0]
+        assert entries['model_names'][entries['model'][0]] == 'Linear'
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from src.compact import CompactModel, CompactPredictor, save_compact_models
+from src.intervals import ConformalIntervals
+from src.models import ModelManager, InterpolationSurrogate
+
+class TestCompactModels:
+
+    @pytest.fixture
+    def trained(self):
+        """Train all time models on a fermentation-like grid."""
+        temps = np.repeat(np.arange(2.0, 32.0, 2.0), 6)
+        yeast = np.tile(np.geomspace(0.01, 0.4, 6), 15)
+        rng = np.random.default_rng(0)
+        time = 5000 * np.exp(-0.09 * temps) * yeast ** -0.7 / 100 * rng.uniform(0.95, 1.05, len(temps))
+
+        manager = ModelManager()
+        manager.train_all_models(temps, yeast, time, targets=['time'])
+        return manager, np.column_stack([temps, yeast])
+
+    def test_kernels_match_models(self, trained):
+        """Test every exportable model predicts the same through its compact form."""
+        manager, X = trained
+        query = np.column_stack([np.linspace(1, 35, 40), np.geomspace(0.005, 0.5, 40)])
+
+        for name, model in manager.models['time'].items():
+            compact = CompactModel(name, *model.compact())
+            np.testing.assert_allclose(compact.predict(query), model.predict(query), rtol=1e-9)
+
+        surrogate = InterpolationSurrogate().build(manager.models['time']['PowerLaw'], X, 'time', 32)
+        compact = CompactModel(surrogate.name, *surrogate.compact())
+        np.testing.assert_allclose(compact.predict(query), surrogate.predict(query))
+
+    def test_save_load_surrogate_selection(self, trained):
+        """Test the exported model or its surrogate is served according to the tolerance."""
+        manager, X = trained
+        manager.surrogates['time'] = InterpolationSurrogate().build(
+            manager.models['time']['PowerLaw'], X, 'time', 64)
+        intervals = ConformalIntervals()
+        intervals.fit('time', np.ones(20), np.full(20, 1.1), 'PowerLaw')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_compact_models(manager, intervals, temp_dir)
+            intervals.save(temp_dir)
+            exact = CompactPredictor(temp_dir)
+            fast = CompactPredictor(temp_dir, surrogate_tolerance=1.0)
+
+        assert exact.can_predict('time')
+        assert not exact.can_predict('temperature')
+        assert not exact.models['time'].arrays['log_a'].flags.writeable
+        assert exact.models['time'].name == 'PowerLaw'
+        assert fast.models['time'].name == 'Surrogate_PowerLaw'
+
+        result = exact.predict(temperature=15.0, yeast_concentration=0.1)
+        expected = manager.models['time']['PowerLaw'].predict(np.array([[15.0, 0.1]]))[0]
+        assert result['predicted_value'] == pytest.approx(expected)
+        assert result['confidence_interval'][0] < expected < result['confidence_interval'][1]
+        assert result['distance_to_nearest_observation'] is None
+
+        with pytest.raises(ValueError):
+            exact.predict(temperature=15.0)
+
+    def test_compact_path_imports_no_heavy_libraries(self):
+        """Test the compact predictor loads without pandas, scikit-learn or scipy."""
+        code = ("import sys; import src.compact; "
+                "print([m for m in ('pandas', 'sklearn', 'scipy') if m in sys.modules])")
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent.parent).stdout
+        assert output.strip() == '[]'
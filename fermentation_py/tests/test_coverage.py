@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+import tempfile
+
+from src.coverage import CoverageIndex
+
+class TestCoverageIndex:
+
+    @pytest.fixture
+    def grid_inputs(self):
+        """Create a triangular (temperature, yeast) grid like the shipped data."""
+        temps = np.arange(2.0, 36.0, 0.5)
+        yeasts = np.geomspace(0.004, 0.42, 17)
+        points = [(t, y) for t in temps for y in yeasts if t * y > 0.1]
+        return np.array(points)
+
+    def test_training_points_are_covered(self, grid_inputs):
+        """Test observed inputs have zero distance and no extrapolation flag."""
+        index = CoverageIndex()
+        index.fit('time', grid_inputs)
+
+        distances, extrapolation = index.query('time', grid_inputs)
+        assert np.allclose(distances, 0)
+        assert not extrapolation.any()
+
+    def test_empty_region_flagged(self, grid_inputs):
+        """Test an in-range point far from the observed triangle is flagged."""
+        index = CoverageIndex()
+        index.fit('time', grid_inputs)
+
+        # Cold and low yeast: inside the global ranges but never observed
+        distances, extrapolation = index.query('time', np.array([[2.0, 0.004], [20.0, 0.05]]))
+        assert extrapolation[0]
+        assert not extrapolation[1]
+        assert distances[0] > distances[1]
+
+        widening = index.widening_factor(distances)
+        assert widening[1] == 1.0
+        assert widening[0] > 1.0
+
+    def test_save_load(self, grid_inputs):
+        """Test the index survives a save/load round trip."""
+        index = CoverageIndex(threshold=3.0)
+        index.fit('time', grid_inputs)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index.save(temp_dir)
+            loaded = CoverageIndex()
+            assert loaded.load(temp_dir)
+
+        query = np.array([[2.0, 0.004], [20.0, 0.05]])
+        assert loaded.threshold == 3.0
+        np.testing.assert_allclose(loaded.query('time', query)[0], index.query('time', query)[0])
+
+    def test_brute_force_matches_tree(self, grid_inputs):
+        """Test small queries answered without the KD-tree match tree queries."""
+        index = CoverageIndex()
+        index.fit('time', grid_inputs)
+
+        loaded = CoverageIndex()
+        loaded.points, loaded.offsets = index.points, index.offsets
+        loaded.scales, loaded.spacing = index.scales, index.spacing
+
+        query = np.column_stack([np.linspace(1, 40, 7), np.geomspace(0.002, 0.9, 7)])
+        brute, _ = loaded.query('time', query)
+        assert 'time' not in loaded._trees
+        np.testing.assert_allclose(brute, index.query('time', query)[0])
@@ -6,6 +6,7 @@ import tempfile
 import os
 
 from src.data_loader import FermentationDataLoader
+from src.observation_store import ObservationStore
 
 class TestFermentationDataLoader:
     
@@ -122,4 +123,50 @@ class TestFermentationDataLoader:
         
         # Should remove the outlier
         assert len(clean_data) < len(test_data)
-        assert 1000 not in clean_data['fermentation_time'].values
\ No newline at end of file
+        assert 1000 not in clean_data['fermentation_time'].values
+    
+    def test_range_filters(self, temp_csv_file):
+        """Test CSV data can be narrowed by ranges but not by strain or time."""
+        loader = FermentationDataLoader(temp_csv_file)
+        temp, yeast, time = loader.get_feature_matrices(temperature_range=(2.0, 3.0),
+                                                        yeast_range=(0.01, 0.03))
+        
+        np.testing.assert_array_equal(temp, [2.2, 2.2, 2.8, 2.8])
+        assert len(loader.get_feature_matrices()[0]) == 9
+        
+        with pytest.raises(ValueError, match='observation store'):
+            loader.get_feature_matrices(last_days=90)
+        with pytest.raises(ValueError, match='observation store'):
+            FermentationDataLoader(temp_csv_file, {'strain': 'instant'})
+    
+    def test_observation_store_backend(self, temp_csv_file):
+        """Test a store path loads the same observations with filters applied in SQL."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'observations.sqlite')
+            store = ObservationStore(db_path)
+            store.import_csv(temp_csv_file, strain='instant', observed_at='2026-01-01')
+            store.append([2.5], [0.021], [110.0], strain='fresh', observed_at='2026-03-01')
+            
+            csv_matrices = FermentationDataLoader(temp_csv_file).get_feature_matrices()
+            loader = FermentationDataLoader(db_path, {'strain': 'instant'})
+            for csv_values, store_values in zip(csv_matrices, loader.get_feature_matrices()):
+                np.testing.assert_array_equal(csv_values, store_values)
+            assert loader.get_data_summary()['total_samples'] == 9
+            
+            temp, _, time = loader.get_feature_matrices(strain=None, since='2026-02-01')
+            assert temp.tolist() == [2.5] and time.tolist() == [110.0]
+    
+    def test_numpy_engine_matches_pandas(self, temp_csv_file):
+        """Test the NumPy engine yields the same observations and summary."""
+        pandas_loader = FermentationDataLoader(temp_csv_file)
+        numpy_loader = FermentationDataLoader(temp_csv_file, engine='numpy')
+        
+        for filters in [{}, {'temperature_range': (2.0, 3.0)}, {'time_range': (100, 150)}]:
+            for expected, actual in zip(pandas_loader.get_feature_matrices(**filters),
+                                        numpy_loader.get_feature_matrices(**filters)):
+                np.testing.assert_array_equal(actual, expected)
+        assert numpy_loader.get_data_summary() == pandas_loader.get_data_summary()
+        assert numpy_loader.raw_data is None
+        
+        with pytest.raises(ValueError, match='Unknown engine'):
+            FermentationDataLoader(temp_csv_file, engine='polars')
\ No newline at end of file
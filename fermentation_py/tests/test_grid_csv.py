@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from src.data_loader import FermentationDataLoader
+from src.grid_csv import iqr_inliers, parse_grid_csv
+
+class TestGridCsv:
+
+    @pytest.fixture
+    def grid_file(self):
+        """Wide table with blanks, a unit suffix, a non-% column and bad cells."""
+        content = ("°C,0.004%,0.008%,notes,0.013%\n"
+                   "1.7°C,,,x,167\n"
+                   "2.2,,150,,149\n"
+                   "n/a,10,10,,10\n"
+                   "\n"
+                   "2.8,0,abc,,133\n")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / 'grid.csv'
+            path.write_text(content, encoding='utf-8')
+            yield path
+
+    def test_parse_grid(self, grid_file):
+        """Test cells become one observation each, row by row, skipping unusable ones."""
+        temperature, yeast, time = parse_grid_csv(str(grid_file))
+
+        np.testing.assert_array_equal(temperature, [1.7, 2.2, 2.2, 2.8])
+        np.testing.assert_array_equal(yeast, [0.013, 0.008, 0.013, 0.013])
+        np.testing.assert_array_equal(time, [167.0, 150.0, 149.0, 133.0])
+
+        expected = FermentationDataLoader(str(grid_file)).expand_table()
+        np.testing.assert_array_equal(temperature, expected['temperature'])
+        np.testing.assert_array_equal(time, expected['fermentation_time'])
+
+        with pytest.raises(FileNotFoundError):
+            parse_grid_csv(str(grid_file.with_name('missing.csv')))
+
+    def test_iqr_inliers(self):
+        """Test values beyond 1.5 interquartile ranges of the quartiles are outliers."""
+        values = np.array([50.0, 60.0, 70.0, 80.0, 1000.0, -500.0])
+        q1, q3 = np.percentile(values, [25, 75])
+
+        np.testing.assert_array_equal(iqr_inliers(values), (values >= q1 - 1.5 * (q3 - q1)) &
+                                      (values <= q3 + 1.5 * (q3 - q1)))
+        assert iqr_inliers(values).tolist() == [True, True, True, True, False, False]
+        assert len(iqr_inliers(np.array([]))) == 0
+
+    def test_numpy_engine_imports_no_pandas(self):
+        """Test the NumPy engine builds feature arrays without importing pandas."""
+        code = ("import sys; from src.data_loader import FermentationDataLoader; "
+                "loader = FermentationDataLoader('data/fermentation_analysis.csv', engine='numpy'); "
+                "print(len(loader.get_feature_matrices()[0]), 'pandas' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent.parent).stdout
+        assert output.split()[1] == 'False'
+        assert int(output.split()[0]) > 0
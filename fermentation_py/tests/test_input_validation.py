@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+import logging
+import threading
+
+from src.input_validation import (
+    BatchInputValidator, FLAG_TEMPERATURE_RANGE, FLAG_YEAST_RANGE,
+    FLAG_CLIPPED, FLAG_REJECTED, out_of_range_mask
+)
+
+class TestBatchInputValidator:
+
+    @pytest.fixture
+    def inputs(self):
+        """Create input columns with a few out-of-range values."""
+        return {
+            'temperature': np.array([15.0, 60.0, -5.0, np.nan, 20.0]),
+            'yeast_concentration': np.array([0.1, 0.1, np.nan, 0.2, 0.0]),
+            'fermentation_time': np.array([np.nan, np.nan, 50.0, 40.0, np.nan])
+        }
+
+    def test_out_of_range_mask(self):
+        """Test range bounds and that missing values are not flagged."""
+        mask = out_of_range_mask('yeast_concentration', np.array([0.0, 0.5, 1.0, 1.5, np.nan]))
+        assert mask.tolist() == [True, False, False, True, False]
+
+    def test_warn_flags(self, inputs):
+        """Test warn policy keeps values and flags rows."""
+        validated, flags = BatchInputValidator('warn').validate(inputs)
+
+        np.testing.assert_array_equal(validated['temperature'], inputs['temperature'])
+        assert flags.tolist() == [0, FLAG_TEMPERATURE_RANGE, FLAG_TEMPERATURE_RANGE, 0, FLAG_YEAST_RANGE]
+
+    def test_clip(self, inputs):
+        """Test clip policy moves values into the typical range."""
+        validated, flags = BatchInputValidator('clip').validate(inputs)
+
+        assert validated['temperature'][1] == 50.0
+        assert validated['temperature'][2] == 0.0
+        assert validated['yeast_concentration'][4] == 0.004
+        assert np.isnan(validated['temperature'][3])
+        assert flags[1] & FLAG_CLIPPED
+        assert not flags[0] & FLAG_CLIPPED
+
+    def test_clip_minimums(self, inputs):
+        """Test zero yeast and time are clipped to configured minimums, not to the smallest float."""
+        inputs['fermentation_time'][2] = 0.0
+        validator = BatchInputValidator('clip', clip_minimums={'yeast_concentration': 0.01})
+
+        validated, _ = validator.validate(inputs)
+        assert validated['yeast_concentration'][4] == 0.01
+        assert validated['fermentation_time'][2] == 1.0
+
+        validated, _ = validator.validate(inputs, clip_minimums={'yeast_concentration': 0.02})
+        assert validated['yeast_concentration'][4] == 0.02
+        assert validated['yeast_concentration'][0] == 0.1
+
+    def test_clip_is_monotonic(self, inputs):
+        """Test tiny positive yeast and time are raised like zero, never left below it."""
+        inputs['yeast_concentration'][0] = 1e-6
+        inputs['fermentation_time'][0] = 0.01
+        validated, flags = BatchInputValidator('clip').validate(inputs)
+
+        assert validated['yeast_concentration'][0] == validated['yeast_concentration'][4] == 0.004
+        assert validated['fermentation_time'][0] == 1.0
+        assert flags[0] & FLAG_CLIPPED
+        assert not flags[0] & FLAG_YEAST_RANGE
+
+    def test_reject(self, inputs):
+        """Test reject policy marks flagged rows as rejected."""
+        _, flags = BatchInputValidator('reject').validate(inputs)
+        assert ((flags & FLAG_REJECTED) != 0).tolist() == [False, True, True, False, True]
+
+    def test_unknown_policy(self):
+        """Test unknown policies raise an error."""
+        with pytest.raises(ValueError, match="Unknown validation policy"):
+            BatchInputValidator('ignore')
+
+    def test_aggregated_rate_limited_warning(self, inputs, caplog):
+        """Test one summary per batch, rate-limited across batches."""
+        validator = BatchInputValidator('warn', warning_interval=3600)
+
+        with caplog.at_level(logging.WARNING, logger='src.input_validation'):
+            validator.validate(inputs)
+            validator.validate(inputs)
+
+        assert len(caplog.records) == 1
+        assert "temperature: 2 outside 0-50°C" in caplog.records[0].message
+        assert validator._suppressed == 1
+
+    def test_warning_counters_thread_safe(self, inputs, caplog):
+        """Test concurrent batches are each logged or counted as suppressed exactly once."""
+        validator = BatchInputValidator('warn', warning_interval=3600)
+
+        def validate_many():
+            for _ in range(200):
+                validator.validate(inputs)
+
+        with caplog.at_level(logging.WARNING, logger='src.input_validation'):
+            threads = [threading.Thread(target=validate_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(caplog.records) == 1
+        assert validator._suppressed == 799
@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+import tempfile
+
+from src.intervals import ConformalIntervals
+from src.models import LinearModel
+from src.validator import ModelValidator
+
+class TestConformalIntervals:
+
+    @pytest.fixture
+    def calibration_data(self):
+        """Create predictions with 10% multiplicative noise."""
+        rng = np.random.default_rng(42)
+        y_pred = rng.uniform(5, 150, 2000)
+        y_true = y_pred * (1 + rng.normal(0, 0.1, 2000))
+        return y_true, y_pred
+
+    def test_coverage(self, calibration_data):
+        """Test intervals reach the requested coverage on fresh data."""
+        y_true, y_pred = calibration_data
+        intervals = ConformalIntervals()
+        intervals.fit('time', y_true[:1000], y_pred[:1000], 'Linear')
+
+        for level in [0.5, 0.8, 0.95]:
+            lower, upper = intervals.interval('time', y_pred[1000:], level)
+            coverage = np.mean((y_true[1000:] >= lower) & (y_true[1000:] <= upper))
+            assert coverage == pytest.approx(level, abs=0.04)
+
+    def test_quantile_monotonic_and_cached(self, calibration_data):
+        """Test higher confidence levels give wider intervals."""
+        y_true, y_pred = calibration_data
+        intervals = ConformalIntervals()
+        intervals.fit('time', y_true, y_pred, 'Linear')
+
+        assert intervals.quantile('time', 0.8) < intervals.quantile('time', 0.99)
+        assert ('time', 0.99) in intervals._quantiles
+
+        with pytest.raises(ValueError):
+            intervals.quantile('time', 1.5)
+
+    def test_prediction_range_inverts_interval(self, calibration_data):
+        """Test predictions at the ends of the range have the observed value on their bounds."""
+        y_true, y_pred = calibration_data
+        intervals = ConformalIntervals()
+        intervals.fit('time', y_true, y_pred, 'Linear', scale_floor=0.5)
+
+        observed = np.array([5.0, 20.0, 80.0])
+        shortest, longest = intervals.prediction_range('time', observed, 0.9)
+        _, upper = intervals.interval('time', shortest, 0.9)
+        lower, _ = intervals.interval('time', longest, 0.9)
+
+        np.testing.assert_allclose(upper, observed)
+        np.testing.assert_allclose(lower, observed)
+
+    def test_small_sample_infinite(self):
+        """Test levels beyond the calibration set resolution give infinite width."""
+        intervals = ConformalIntervals()
+        intervals.fit('time', np.array([10.0, 11.0, 12.0]), np.array([10.5, 10.5, 10.5]), 'Linear')
+
+        assert intervals.quantile('time', 0.9) == float('inf')
+
+    def test_save_load(self, calibration_data):
+        """Test saving and loading calibration scores."""
+        y_true, y_pred = calibration_data
+        intervals = ConformalIntervals()
+        intervals.fit('time', y_true, y_pred, 'RandomForest', scale_floor=1.5)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            intervals.save(temp_dir)
+            loaded = ConformalIntervals()
+            assert loaded.load(temp_dir)
+
+        assert loaded.model_names['time'] == 'RandomForest'
+        assert loaded.scale_floors['time'] == 1.5
+        assert loaded.quantile('time', 0.9) == intervals.quantile('time', 0.9)
+
+    def test_validator_prediction_intervals(self):
+        """Test ModelValidator uses calibrated intervals when given."""
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0, 10, (200, 2))
+        y = 3 * X[:, 0] + X[:, 1] + rng.normal(0, 1, 200) + 20
+
+        model = LinearModel()
+        model.fit(X, y)
+        validator = ModelValidator()
+        intervals = validator.calibrate_intervals(model, X, y, 'time', ConformalIntervals())
+
+        lower, upper = validator.calculate_prediction_intervals(
+            model, X, 0.9, intervals=intervals, target='time'
+        )
+        assert np.mean((y >= lower) & (y <= upper)) >= 0.85
+
+        # Uncalibrated fallback supports any confidence level
+        lower, upper = validator.calculate_prediction_intervals(model, X, 0.9)
+        assert np.all(lower < upper)
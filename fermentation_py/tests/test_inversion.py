@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+
+from src.models import ArrheniusModel, FermentationModel
+from src.inversion import TimeModelInverter
+
+class BumpyTimeModel(FermentationModel):
+    """Time model that increases with temperature over part of the range."""
+
+    def __init__(self):
+        super().__init__("Bumpy")
+        self.is_fitted = True
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return 50.0 - X[:, 0] + 8.0 * np.exp(-(X[:, 0] - 30.0) ** 2)
+
+class TestTimeModelInverter:
+
+    @pytest.fixture
+    def time_model(self):
+        """Arrhenius time model with fixed parameters."""
+        model = ArrheniusModel()
+        model.params = [1e-6, 50000, 0.8]
+        model.is_fitted = True
+        return model
+
+    def test_roundtrip_temperature(self, time_model):
+        """Test solved temperatures reproduce the target times."""
+        temperatures = np.array([5.0, 12.5, 20.0, 31.0])
+        yeast = np.array([0.02, 0.1, 0.1, 0.4])
+        times = time_model.predict(np.column_stack([temperatures, yeast]))
+
+        solution = TimeModelInverter(time_model).solve('temperature', times, yeast)
+
+        assert solution['converged'].all()
+        assert solution['monotonic'].all()
+        np.testing.assert_allclose(solution['value'], temperatures, atol=1e-3)
+        assert (solution['tolerance'] <= 1e-3).all()
+
+    def test_roundtrip_yeast(self, time_model):
+        """Test yeast is solved to a relative tolerance in log space."""
+        yeast = np.array([0.005, 0.05, 0.5])
+        times = time_model.predict(np.column_stack([np.full(3, 22.0), yeast]))
+
+        solution = TimeModelInverter(time_model, yeast_xtol=1e-6).solve('yeast', times, 22.0)
+
+        assert solution['converged'].all()
+        np.testing.assert_allclose(solution['value'], yeast, rtol=1e-5)
+        np.testing.assert_allclose(solution['residual'], 0, atol=1e-3 * times.max())
+
+    def test_unreachable_target(self, time_model):
+        """Test targets beyond the model's range are reported, not extrapolated."""
+        solution = TimeModelInverter(time_model).solve('temperature', [1e-6, 1e9], 0.1)
+
+        assert not solution['converged'].any()
+        np.testing.assert_array_equal(solution['value'], [50.0, 0.0])
+
+    def test_monotonicity_check(self):
+        """Test non-monotonic time models are flagged."""
+        solution = TimeModelInverter(BumpyTimeModel()).solve('temperature', [40.0], 0.1)
+
+        assert not solution['monotonic'][0]
+        assert solution['converged'][0]
+        assert solution['value'][0] == pytest.approx(10.0, abs=1e-3)
+
+    def test_invalid_target(self, time_model):
+        """Test only temperature and yeast can be solved for."""
+        with pytest.raises(ValueError):
+            TimeModelInverter(time_model).solve('time', [10.0], 0.1)
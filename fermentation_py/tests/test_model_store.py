@@ -0,0 +1,80 @@
+import pytest
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from src.model_store import (
+    MANIFEST_FILENAME, commit_directory, recover_directory, staged_directory,
+    verify_manifest, write_manifest
+)
+
+class TestModelStore:
+
+    @pytest.fixture
+    def parent(self):
+        """Temporary directory holding a model directory with one file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_dir = Path(temp_dir) / 'models'
+            model_dir.mkdir()
+            (model_dir / 'old.joblib').write_bytes(b'old')
+            yield Path(temp_dir)
+
+    def test_manifest_detects_changes(self, parent):
+        """Test the manifest lists every file and catches missing or altered files."""
+        model_dir = parent / 'models'
+        (model_dir / 'b.npz').write_bytes(b'x' * 5000)
+        manifest = write_manifest(str(model_dir))
+
+        assert set(manifest['files']) == {'old.joblib', 'b.npz'}
+        assert manifest['files']['b.npz']['size'] == 5000
+        assert json.loads((model_dir / MANIFEST_FILENAME).read_text()) == manifest
+        assert verify_manifest(str(model_dir))
+
+        (model_dir / 'b.npz').write_bytes(b'y' * 5000)
+        assert verify_manifest(str(model_dir), checksums=False)
+        with pytest.raises(ValueError, match='Checksum of b.npz'):
+            verify_manifest(str(model_dir))
+        (model_dir / 'b.npz').write_bytes(b'y')
+        with pytest.raises(ValueError, match='Size of b.npz'):
+            verify_manifest(str(model_dir))
+        (model_dir / 'b.npz').unlink()
+        with pytest.raises(ValueError, match='missing b.npz'):
+            verify_manifest(str(model_dir))
+
+        (model_dir / MANIFEST_FILENAME).unlink()
+        assert not verify_manifest(str(model_dir))
+
+    def test_staged_directory_commits_whole(self, parent):
+        """Test a completed save replaces the directory and a failed one changes nothing."""
+        model_dir = parent / 'models'
+        with staged_directory(str(model_dir)) as staging:
+            (staging / 'new.joblib').write_bytes(b'new')
+            assert not (model_dir / 'new.joblib').exists()
+
+        assert sorted(os.listdir(model_dir)) == [MANIFEST_FILENAME, 'new.joblib']
+        assert verify_manifest(str(model_dir))
+
+        with pytest.raises(RuntimeError):
+            with staged_directory(str(model_dir)) as staging:
+                (staging / 'partial.joblib').write_bytes(b'partial')
+                raise RuntimeError("crashed mid-save")
+
+        assert sorted(os.listdir(model_dir)) == [MANIFEST_FILENAME, 'new.joblib']
+        assert os.listdir(parent) == ['models']
+
+    def test_recover_interrupted_commit(self, parent):
+        """Test the previous directory is restored if the swap stopped halfway."""
+        model_dir = parent / 'models'
+        os.rename(model_dir, parent / '.models.previous')
+
+        assert recover_directory(str(model_dir))
+        assert (model_dir / 'old.joblib').read_bytes() == b'old'
+        assert not recover_directory(str(model_dir))
+
+        staging = parent / 'staging'
+        staging.mkdir()
+        (staging / 'new.joblib').write_bytes(b'new')
+        commit_directory(str(staging), str(model_dir))
+        assert os.listdir(model_dir) == ['new.joblib']
+        assert sorted(os.listdir(parent)) == ['models']
@@ -5,8 +5,9 @@ import tempfile
 import os
 
 from src.models import (
-    LinearModel, PolynomialModel, RandomForestModel, 
-    ArrheniusModel, ModelManager
+    FermentationModel, LinearModel, PolynomialModel, RandomForestModel, 
+    ArrheniusModel, PowerLawModel, GridInterpolationModel, InterpolationSurrogate,
+    ModelManager, aggregate_dataset, prepare_datasets
 )
 
 class TestFermentationModels:
@@ -142,6 +143,170 @@ class TestArrheniusModel(TestFermentationModels):
         assert np.all(result > 0)
         assert np.all(np.isfinite(result))
 
+class TestGradients(TestFermentationModels):
+    
+    @pytest.mark.parametrize("model", [
+        LinearModel(), PolynomialModel(degree=2), PolynomialModel(degree=3),
+        ArrheniusModel(), PowerLawModel(smoothing_degree=1)
+    ], ids=lambda model: model.name)
+    def test_analytic_matches_central_differences(self, model):
+        """Test analytic gradients agree with the generic central differences."""
+        temps, yeast = np.meshgrid(np.arange(5.0, 31.0, 5.0), [0.02, 0.05, 0.1, 0.3],
+                                   indexing='ij')
+        X = np.column_stack([temps.ravel(), yeast.ravel()])
+        time = 100 / (X[:, 0] * X[:, 1])
+        model.fit(X, time)
+        
+        X_query = np.array([[8.0, 0.04], [21.0, 0.12], [28.0, 0.25]])
+        values, gradient = model.value_and_gradient(X_query)
+        _, numeric = FermentationModel.value_and_gradient(model, X_query)
+        
+        np.testing.assert_allclose(values, model.predict(X_query))
+        np.testing.assert_allclose(gradient, numeric, rtol=1e-4, atol=1e-6)
+    
+    def test_central_differences_single_predict(self, sample_data):
+        """Test numeric gradients use one predict call per batch."""
+        X, y = sample_data
+        model = RandomForestModel(n_estimators=10)
+        model.fit(X, y)
+        
+        calls = []
+        original = model.predict
+        model.predict = lambda X_batch: calls.append(len(X_batch)) or original(X_batch)
+        gradient = model.gradient(X[:20])
+        
+        assert gradient.shape == (20, 2)
+        assert calls == [100]
+
+class TestPowerLawModel(TestFermentationModels):
+    
+    def test_init(self):
+        """Test PowerLawModel initialization."""
+        model = PowerLawModel()
+        assert model.name == "PowerLaw"
+        assert model.smoothing_degree == 2
+        assert not model.is_fitted
+    
+    def test_recovers_power_law(self):
+        """Test exact recovery of a power law with smoothly varying parameters."""
+        temps, yeast = np.meshgrid(np.arange(5.0, 31.0, 5.0), [0.01, 0.03, 0.1, 0.3],
+                                   indexing='ij')
+        exponent = 0.6 + 0.01 * temps
+        time = np.exp(5.0 - 0.08 * temps) * yeast ** -exponent
+        X = np.column_stack([temps.ravel(), yeast.ravel()])
+        
+        model = PowerLawModel(smoothing_degree=1)
+        model.fit(X, time.ravel())
+        
+        X_new = np.array([[12.0, 0.05], [27.5, 0.2]])
+        expected = np.exp(5.0 - 0.08 * X_new[:, 0]) * X_new[:, 1] ** -(0.6 + 0.01 * X_new[:, 0])
+        np.testing.assert_allclose(model.predict(X_new), expected, rtol=1e-9)
+        np.testing.assert_allclose(model.model['exponent'], [0.01, 0.6], atol=1e-9)
+    
+    def test_scattered_inputs_rejected(self, fermentation_data):
+        """Test inputs without repeated temperatures raise an error."""
+        X, time = fermentation_data
+        with pytest.raises(ValueError, match="temperatures"):
+            PowerLawModel().fit(X, time)
+
+class TestGridInterpolationModel(TestFermentationModels):
+    
+    @pytest.fixture
+    def grid_data(self):
+        """Power-law table time = 2 * yeast^-0.8 * exp(-0.07 * temp) with blanks."""
+        temps, yeast = np.meshgrid([5.0, 10.0, 15.0, 20.0, 25.0], [0.01, 0.02, 0.05, 0.1, 0.2],
+                                   indexing='ij')
+        time = 2 * yeast ** -0.8 * np.exp(-0.07 * temps)
+        observed = np.ones(temps.shape, dtype=bool)
+        observed[0, :2] = observed[3, 4] = observed[4, 0] = False
+        X = np.column_stack([temps[observed], yeast[observed]])
+        return X, time[observed], (temps, yeast, time)
+    
+    def test_init(self):
+        """Test GridInterpolationModel initialization."""
+        model = GridInterpolationModel()
+        assert model.name == "GridInterpolation"
+        assert not model.is_fitted
+    
+    def test_exact_on_grid_and_fills_blanks(self, grid_data):
+        """Test observed cells are reproduced and power-law blanks are filled exactly."""
+        X, time, (temps, yeast, full_time) = grid_data
+        model = GridInterpolationModel()
+        model.fit(X, time)
+        
+        np.testing.assert_allclose(model.predict(X), time)
+        full_X = np.column_stack([temps.ravel(), yeast.ravel()])
+        np.testing.assert_allclose(model.predict(full_X), full_time.ravel(), rtol=1e-9)
+    
+    def test_interpolates_in_log_space(self, grid_data):
+        """Test interpolation between cells is exact for a log-log power law."""
+        X, time, _ = grid_data
+        model = GridInterpolationModel()
+        model.fit(X, time)
+        
+        X_new = np.array([[12.5, 0.03], [7.0, 0.15], [40.0, 0.5]])
+        expected = 2 * X_new[:2, 1] ** -0.8 * np.exp(-0.07 * X_new[:2, 0])
+        predictions = model.predict(X_new)
+        
+        # Linear in temperature, so only approximately exponential between rows
+        np.testing.assert_allclose(predictions[:2], expected, rtol=0.01)
+        # Clamped to the table corner outside
+        assert predictions[2] == pytest.approx(2 * 0.2 ** -0.8 * np.exp(-0.07 * 25))
+    
+    def test_sparse_inputs_rejected(self, fermentation_data):
+        """Test scattered inputs that are not a grid raise an error."""
+        X, time = fermentation_data
+        with pytest.raises(ValueError, match="sparse"):
+            GridInterpolationModel().fit(X, time)
+
+class TestInterpolationSurrogate(TestFermentationModels):
+    
+    def test_matches_smooth_source(self, fermentation_data):
+        """Test the table reproduces a smooth model within its error bound."""
+        X, time = fermentation_data
+        source = ArrheniusModel()
+        source.fit(X, time)
+        
+        surrogate = InterpolationSurrogate().build(source, X, 'time', resolution=128)
+        
+        assert surrogate.name == 'Surrogate_Arrhenius'
+        assert surrogate.relative_error_bound < 0.01
+        rng = np.random.default_rng(0)
+        X_new = np.column_stack([rng.uniform(X[:, 0].min(), X[:, 0].max(), 500),
+                                 rng.uniform(X[:, 1].min(), X[:, 1].max(), 500)])
+        error = np.abs(surrogate.predict(X_new) - source.predict(X_new))
+        assert error.max() <= surrogate.error_bound * 1.5
+    
+    def test_clamps_outside_box(self, fermentation_data):
+        """Test inputs outside the observed box use the edge of the table."""
+        X, time = fermentation_data
+        source = LinearModel()
+        source.fit(X, time)
+        surrogate = InterpolationSurrogate().build(source, X, 'time', resolution=16)
+        
+        corner = np.array([[X[:, 0].max(), X[:, 1].min()]])
+        beyond = np.array([[X[:, 0].max() + 10, X[:, 1].min() / 10]])
+        np.testing.assert_allclose(surrogate.predict(beyond), surrogate.predict(corner))
+    
+    def test_save_load_memory_mapped(self, fermentation_data):
+        """Test the table is saved as .npy and loaded memory-mapped."""
+        X, time = fermentation_data
+        source = ArrheniusModel()
+        source.fit(X, time)
+        surrogate = InterpolationSurrogate().build(source, X, 'time', resolution=32)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'time_surrogate.npy')
+            surrogate.save(path)
+            
+            loaded = InterpolationSurrogate()
+            loaded.load(path)
+            
+            assert isinstance(loaded.table, np.memmap)
+            assert loaded.source_name == 'Arrhenius'
+            assert loaded.error_bound == surrogate.error_bound
+            np.testing.assert_allclose(loaded.predict(X), surrogate.predict(X))
+
 class TestModelManager(TestFermentationModels):
     
     def test_init(self):
@@ -208,4 +373,72 @@ class TestModelManager(TestFermentationModels):
                 for model in new_manager.models[target].values():
                     assert model.is_fitted
 
+    
+    def test_load_models_parallel(self, fermentation_data):
+        """Test models loaded on several threads register in file order and predict like the originals."""
+        X, time = fermentation_data
+        manager = ModelManager()
+        manager.train_all_models(X[:, 0], X[:, 1], time, targets=['time'])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager.save_models(temp_dir)
+            loaded = ModelManager()
+            loaded.load_models(temp_dir, n_jobs=4)
+            
+            assert list(loaded.models['time']) == sorted(manager.models['time'])
+            for name, model in manager.models['time'].items():
+                np.testing.assert_allclose(loaded.models['time'][name].predict(X), model.predict(X))
+    
+    def test_surrogate_selection(self, fermentation_data):
+        """Test surrogates replace the best model only within tolerance."""
+        X, time = fermentation_data
+        datasets = {'time': prepare_datasets(X[:, 0], X[:, 1], time)['time']}
+        
+        manager = ModelManager(surrogate_tolerance=0.05)
+        manager.train_all_models(X[:, 0], X[:, 1], time, targets=['time'])
+        manager.best_models['time'] = manager.models['time']['Arrhenius']
+        manager.compile_surrogates(datasets)
+        assert manager.get_best_model('time') is manager.surrogates['time']
+        
+        # A loose bound keeps the source model
+        manager.surrogates['time'].relative_error_bound = 0.5
+        manager.select_surrogates()
+        assert manager.get_best_model('time') is manager.models['time']['Arrhenius']
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager.save_models(temp_dir)
+            loaded = ModelManager(surrogate_tolerance=0.05)
+            loaded.load_models(temp_dir)
+            assert loaded.surrogates['time'].source_name == 'Arrhenius'
+    
+    def test_aggregated_training_matches_full(self):
+        """Test models fitted on aggregated duplicates match the fits on every observation."""
+        rng = np.random.default_rng(0)
+        temp, yeast = np.meshgrid([10.0, 17.5, 24.0, 31.0], [0.05, 0.1, 0.2, 0.4])
+        rows = rng.integers(0, temp.size, 2000)
+        temp, yeast = temp.ravel()[rows], yeast.ravel()[rows]
+        time = 200 / (temp * yeast ** 0.8) * rng.lognormal(0, 0.05, len(rows))
+        
+        data = aggregate_dataset(np.column_stack([temp, yeast]), time)
+        assert data.X.dtype == np.float32 and len(data.X) == 16
+        assert data.n_observations == 2000
+        first = (temp == 10.0) & (yeast == 0.05)
+        assert data.counts[0] == first.sum()
+        np.testing.assert_allclose(data.y[0], time[first].mean())
+        np.testing.assert_allclose(data.variance[0], time[first].var(), rtol=1e-5)
+        
+        full, aggregated = ModelManager(), ModelManager()
+        full.train_all_models(temp, yeast, time, targets=['time'])
+        aggregated.train_all_models(temp, yeast, time, targets=['time'], aggregate=True)
+        
+        X = np.column_stack([temp, yeast])[:50]
+        for name in ['Linear', 'Polynomial_degree_2', 'Arrhenius']:
+            np.testing.assert_allclose(aggregated.models['time'][name].predict(X),
+                                       full.models['time'][name].predict(X), rtol=1e-4)
+        # Log-space models average the log of the means, which is close for small noise
+        for name in ['PowerLaw', 'GridInterpolation']:
+            np.testing.assert_allclose(aggregated.models['time'][name].predict(X),
+                                       full.models['time'][name].predict(X), rtol=1e-2)
+
+
 from pathlib import Path
\ No newline at end of file
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+
+from src.models import ArrheniusModel
+from src.monte_carlo import MonteCarloPropagator
+
+class TestMonteCarloPropagator:
+
+    @pytest.fixture
+    def time_model(self):
+        """Arrhenius time model with fixed parameters."""
+        model = ArrheniusModel()
+        model.params = [1e-6, 50000, 0.8]
+        model.is_fitted = True
+        return model
+
+    def test_no_uncertainty_is_point_prediction(self, time_model):
+        """Test zero tolerances reproduce the point prediction."""
+        expected = time_model.predict(np.array([[20.0, 0.1]]))[0]
+        samples = MonteCarloPropagator(time_model).sample_completion_times(
+            20.0, 0.1, n_samples=1000, temperature_tolerance=0, yeast_tolerance=0
+        )
+        np.testing.assert_allclose(samples, expected)
+
+    def test_reproducible_across_jobs(self, time_model):
+        """Test a fixed seed gives identical samples regardless of parallelism."""
+        serial = MonteCarloPropagator(time_model, block_size=1000)
+        parallel = MonteCarloPropagator(time_model, block_size=1000, n_jobs=2)
+
+        a = serial.sample_completion_times(20.0, 0.1, n_samples=5500, seed=7)
+        b = parallel.sample_completion_times(20.0, 0.1, n_samples=5500, seed=7)
+        c = serial.sample_completion_times(20.0, 0.1, n_samples=5500, seed=8)
+
+        np.testing.assert_array_equal(a, b)
+        assert not np.array_equal(a, c)
+
+    def test_quantiles_match_unquantized(self, time_model):
+        """Test quantized evaluation matches exact sampling."""
+        exact = MonteCarloPropagator(time_model, temperature_resolution=None, yeast_resolution=None)
+        fast = MonteCarloPropagator(time_model)
+
+        kwargs = dict(n_samples=200_000, distribution='normal', temperature_tolerance=1.0)
+        q_exact = exact.completion_time_quantiles(20.0, 0.1, **kwargs)
+        q_fast = fast.completion_time_quantiles(20.0, 0.1, **kwargs)
+
+        for key in ['q5', 'q50', 'q95']:
+            assert q_fast[key] == pytest.approx(q_exact[key], rel=1e-3)
+        assert q_fast['q5'] < q_fast['q50'] < q_fast['q95']
+        assert q_fast['n_samples'] == 200_000
+
+    def test_residual_noise_widens(self, time_model):
+        """Test adding model residuals widens the distribution."""
+        residuals = np.random.default_rng(0).normal(0, 0.1, 500)
+        propagator = MonteCarloPropagator(time_model, relative_residuals=residuals)
+
+        without = propagator.completion_time_quantiles(20.0, 0.1, n_samples=50_000, residual_noise=False)
+        with_noise = propagator.completion_time_quantiles(20.0, 0.1, n_samples=50_000)
+        assert with_noise['std'] > without['std']
+
+    def test_invalid_arguments(self, time_model):
+        """Test invalid distributions and sample counts raise errors."""
+        propagator = MonteCarloPropagator(time_model)
+        with pytest.raises(ValueError, match="Unknown distribution"):
+            propagator.sample_completion_times(20.0, 0.1, distribution='triangular')
+        with pytest.raises(ValueError):
+            propagator.sample_completion_times(20.0, 0.1, n_samples=0)
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.observation_store import ObservationStore, is_store_path, to_timestamp
+
+class TestObservationStore:
+
+    @pytest.fixture
+    def store(self):
+        """Store with two strains observed over a year."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ObservationStore(str(Path(temp_dir) / 'observations.sqlite'))
+            now = time.time()
+            store.append([10.0, 20.0, 24.0, 28.0, 30.0], [0.1, 0.2, 0.3, 0.4, 0.5],
+                         [40.0, 12.0, 8.0, 6.0, 5.0], strain='instant',
+                         observed_at=now - np.array([300, 60, 30, 10, 1]) * 86400.0)
+            store.append([22.0], [0.2], [9.0], strain='fresh', observed_at=now)
+            yield store
+
+    def test_query_filters(self, store):
+        """Test range, strain and time filters select the matching rows as arrays."""
+        result = store.query(temperature_range=(20, 28), last_days=90)
+
+        assert set(result) == {'temperature', 'yeast_concentration', 'fermentation_time'}
+        assert result['temperature'].dtype == np.float64
+        np.testing.assert_array_equal(result['temperature'], [20.0, 24.0, 28.0, 22.0])
+        np.testing.assert_array_equal(result['fermentation_time'], [12.0, 8.0, 6.0, 9.0])
+
+        assert store.count(strain='fresh') == 1
+        assert store.count(yeast_range=(0.25, 1.0), time_range=(0, 7)) == 2
+        assert store.count(until=time.time() - 45 * 86400) == 2
+        assert store.strains() == ['fresh', 'instant']
+        assert len(store.query(['observed_at'], strain='nope')['observed_at']) == 0
+        with pytest.raises(ValueError, match='Unknown observation columns'):
+            store.query(['strain'])
+
+    def test_indexes_used(self, store):
+        """Test range filters are answered through the column indexes."""
+        with sqlite3.connect(store.path) as conn:
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(observations)")}
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT temperature FROM observations "
+                                "WHERE temperature BETWEEN 20 AND 28").fetchall()
+        assert indexes == {'idx_observations_temperature', 'idx_observations_yeast',
+                           'idx_observations_strain', 'idx_observations_observed_at'}
+        assert 'idx_observations_temperature' in plan[0][-1]
+
+    def test_add_is_batched(self, store):
+        """Test single observations are written once a batch is full or on flush."""
+        store.batch_size = 3
+        with store:
+            store.add(15.0, 0.1, 20.0, observed_at='2026-01-01T12:00:00')
+            store.add(16.0, 0.1, 18.0)
+            assert store.count() == 6
+            store.add(17.0, 0.1, 16.0)
+            assert store.count() == 9
+            store.add(18.0, 0.1, 14.0)
+        assert store.count() == 10
+        assert store.count(since='2026-01-01', until='2026-01-02') == 1
+
+    def test_helpers(self):
+        """Test store path detection and timestamp conversion."""
+        assert is_store_path('data/observations.sqlite')
+        assert is_store_path('history.DB')
+        assert not is_store_path('data/fermentation_analysis.csv')
+        assert to_timestamp(1.5e9) == 1.5e9
+        assert to_timestamp('2026-01-01T00:00:00+00:00') == 1767225600.0
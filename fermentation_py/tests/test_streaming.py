@@ -0,0 +1,156 @@
+import pytest
+import numpy as np
+import pandas as pd
+import tempfile
+import os
+from unittest import mock
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from scipy import stats
+
+from src.models import ModelManager
+from src.streaming import RunningMetrics, StreamingEvaluator
+from src.validator import selection_rmse
+
+class TestRunningMetrics:
+
+    @pytest.fixture
+    def predictions(self):
+        """Create noisy predictions."""
+        rng = np.random.default_rng(42)
+        y = rng.uniform(5, 150, 1000)
+        y_pred = y + rng.gamma(2.0, 2.0, 1000) - 4.0
+        return y, y_pred
+
+    def test_matches_sklearn(self, predictions):
+        """Test single-chunk metrics match sklearn and scipy."""
+        y, y_pred = predictions
+        metrics = RunningMetrics.from_arrays(y, y_pred)
+        residuals = y - y_pred
+
+        assert metrics.rmse == pytest.approx(np.sqrt(mean_squared_error(y, y_pred)))
+        assert metrics.mae == pytest.approx(mean_absolute_error(y, y_pred))
+        assert metrics.r2 == pytest.approx(r2_score(y, y_pred))
+        assert metrics.residual_skew == pytest.approx(stats.skew(residuals))
+        assert metrics.residual_kurtosis == pytest.approx(stats.kurtosis(residuals))
+
+    def test_merge_matches_full(self, predictions):
+        """Test merging uneven chunks gives the same result as one pass."""
+        y, y_pred = predictions
+        full = RunningMetrics.from_arrays(y, y_pred)
+
+        merged = RunningMetrics()
+        for start, stop in [(0, 7), (7, 400), (400, 401), (401, 1000)]:
+            merged.merge(RunningMetrics.from_arrays(y[start:stop], y_pred[start:stop]))
+
+        assert merged.count == full.count
+        for key, value in full.to_metrics().items():
+            assert merged.to_metrics()[key] == pytest.approx(value, nan_ok=True)
+
+    def test_empty(self):
+        """Test empty statistics merge as identity."""
+        metrics = RunningMetrics().merge(RunningMetrics.from_arrays(np.array([1.0, 2.0]),
+                                                                   np.array([1.0, 2.0])))
+        assert metrics.count == 2
+        assert metrics.rmse == 0.0
+        assert RunningMetrics().rmse == float('inf')
+
+    def test_failure_survives_merge(self, predictions):
+        """Test a failed chunk marks the merged statistics as failed."""
+        y, y_pred = predictions
+        merged = RunningMetrics.from_arrays(y, y_pred).merge(RunningMetrics.failure())
+        merged.merge(RunningMetrics.from_arrays(y, y_pred))
+
+        assert merged.failed
+        assert merged.to_metrics()['rmse'] == float('inf')
+        assert merged.to_metrics()['cv_rmse'] == float('inf')
+
+class TestStreamingEvaluator:
+
+    @pytest.fixture
+    def trained_manager(self):
+        """Train models on fermentation-like data."""
+        rng = np.random.default_rng(0)
+        temp = rng.uniform(5, 35, 60)
+        yeast = rng.uniform(0.01, 0.5, 60)
+        time = 100 / (temp * yeast) + rng.normal(0, 5, 60)
+
+        manager = ModelManager()
+        manager.train_all_models(temp, yeast, np.maximum(time, 1))
+        return manager
+
+    @pytest.fixture
+    def holdout_file(self):
+        """Create a long-format holdout CSV."""
+        rng = np.random.default_rng(1)
+        temp = rng.uniform(5, 35, 500)
+        yeast = rng.uniform(0.01, 0.5, 500)
+        df = pd.DataFrame({
+            'timestamp': np.arange(500),
+            'temperature': temp,
+            'yeast_concentration': yeast,
+            'fermentation_time': np.maximum(100 / (temp * yeast), 1)
+        })
+        df.loc[3, 'fermentation_time'] = np.nan
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            df.to_csv(f, index=False)
+            temp_path = f.name
+
+        yield temp_path, df
+        os.unlink(temp_path)
+
+    def test_matches_in_memory_metrics(self, trained_manager, holdout_file):
+        """Test chunked parallel evaluation matches full-array metrics."""
+        path, df = holdout_file
+        evaluator = StreamingEvaluator(trained_manager, chunk_size=64, n_jobs=2)
+        results = evaluator.validate_file(path)
+
+        complete = df.dropna()
+        X = complete[['temperature', 'yeast_concentration']].values
+        y = complete['fermentation_time'].values
+
+        for model_name, model in trained_manager.models['time'].items():
+            y_pred = model.predict(X)
+            metrics = results['time'][model_name]
+            assert metrics['n_samples'] == len(y)
+            assert metrics['rmse'] == pytest.approx(np.sqrt(mean_squared_error(y, y_pred)))
+            assert metrics['r2'] == pytest.approx(r2_score(y, y_pred))
+
+        # Rows missing only the time value still count for the other targets
+        assert results['temperature']['Linear']['n_samples'] == len(df) - 1
+
+    def test_failing_model(self, trained_manager, holdout_file):
+        """Test a model raising on one chunk is reported as failed, not on partial data."""
+        path, _ = holdout_file
+        model = trained_manager.models['time']['Linear']
+        predict = model.predict
+        calls = []
+
+        def flaky_predict(X):
+            calls.append(len(X))
+            if len(calls) == 2:
+                raise RuntimeError("bad chunk")
+            return predict(X)
+
+        with mock.patch.object(model, 'predict', side_effect=flaky_predict):
+            results = StreamingEvaluator(trained_manager, chunk_size=100).validate_file(path)
+
+        assert results['time']['Linear']['rmse'] == float('inf')
+        assert np.isfinite(results['time']['RandomForest']['rmse'])
+        # Holdout metrics have no out-of-fold score, so ranking uses the holdout RMSE
+        assert np.isnan(results['time']['RandomForest']['cv_rmse'])
+        assert selection_rmse(results['time']['RandomForest']) == \
+            results['time']['RandomForest']['rmse']
+
+    def test_generate_report(self, trained_manager, holdout_file):
+        """Test report generation from a streamed file."""
+        path, _ = holdout_file
+        report = StreamingEvaluator(trained_manager, chunk_size=100).generate_report(path)
+
+        assert "FERMENTATION MODEL VALIDATION REPORT" in report
+        assert "BEST MODEL" in report
+
+    def test_missing_file(self, trained_manager):
+        """Test streaming a non-existent file raises error."""
+        with pytest.raises(FileNotFoundError):
+            StreamingEvaluator(trained_manager).validate_file("nonexistent.csv")
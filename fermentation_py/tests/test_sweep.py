@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+import tempfile
+import os
+
+from src.data_loader import FermentationDataLoader
+from src.sweep import GridSweep, parameter_grid
+
+def product_model(parameter, inputs):
+    """Predict the missing parameter as 100 / (product of the inputs)."""
+    a, b = inputs.values()
+    return 100.0 / (a * b)
+
+class TestGridSweep:
+
+    def test_parameter_grid(self):
+        """Test grids include the stop value without float drift."""
+        np.testing.assert_array_equal(parameter_grid(0.1, 0.5, 0.1), [0.1, 0.2, 0.3, 0.4, 0.5])
+        assert len(parameter_grid(2, 35, 0.5)) == 67
+        with pytest.raises(ValueError):
+            parameter_grid(1, 0, 0.1)
+
+    def test_layout_and_chunking(self):
+        """Test chunked evaluation matches the full Cartesian product."""
+        calls = []
+
+        def predict(parameter, inputs):
+            calls.append(len(next(iter(inputs.values()))))
+            return product_model(parameter, inputs)
+
+        temperatures = np.array([5.0, 10.0, 20.0])
+        yeast = np.array([0.1, 0.2, 0.5, 1.0])
+        sweep = GridSweep(predict, {'yeast_concentration': yeast, 'temperature': temperatures},
+                          chunk_size=8)
+
+        assert (sweep.row_parameter, sweep.column_parameter, sweep.predicted_parameter) == \
+            ('temperature', 'yeast_concentration', 'fermentation_time')
+        np.testing.assert_allclose(sweep.evaluate(), 100.0 / np.outer(temperatures, yeast))
+        assert calls == [8, 4]
+
+    def test_invalid_ranges(self):
+        """Test exactly two known parameters must be swept."""
+        with pytest.raises(ValueError, match="Exactly 2"):
+            GridSweep(product_model, {'temperature': [1.0]})
+        with pytest.raises(ValueError, match="Unknown"):
+            GridSweep(product_model, {'temperature': [1.0], 'salt': [2.0]})
+
+    def test_csv_roundtrip(self):
+        """Test CSV output is readable by the data loader."""
+        temperatures = parameter_grid(10, 20, 5)
+        yeast = parameter_grid(0.1, 0.3, 0.1)
+        sweep = GridSweep(product_model, {'temperature': temperatures, 'yeast_concentration': yeast},
+                          chunk_size=3)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'sweep.csv')
+            sweep.to_csv(path)
+            with open(path, encoding='utf-8') as f:
+                assert f.readline().strip() == '°C,0.1%,0.2%,0.3%'
+
+            data = FermentationDataLoader(path).preprocess_data()
+            np.testing.assert_allclose(
+                data['fermentation_time'],
+                100.0 / (data['temperature'] * data['yeast_concentration']), rtol=1e-5
+            )
+
+            npz_path = os.path.join(temp_dir, 'sweep.npz')
+            sweep.to_npz(npz_path)
+            with np.load(npz_path) as arrays:
+                assert list(arrays['layout']) == ['temperature', 'yeast_concentration',
+                                                  'fermentation_time']
+                assert arrays['fermentation_time'].shape == (3, 3)
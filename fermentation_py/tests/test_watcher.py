@@ -0,0 +1,173 @@
+import pytest
+import numpy as np
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.predictor import FermentationPredictor
+from src.watcher import RetrainWatcher, check_validation, count_data_rows, fingerprint
+
+SAMPLE_CSV = """°C,0.004%,0.008%,0.013%,0.021%,0.032%
+1.7,,,167,136,115
+2.2,,,149,121,103
+2.8,,,133,108,92
+3.3,,161,120,97,82
+3.9,,159,108,87,74
+4.4,,144,97,79,67
+5.0,,130,88,71,61
+6.1,,107,72,59,50
+7.2,,100,60,49,41
+8.3,,83,50,41,35
+9.4,,70,42,34,29
+10.0,,64,39,32,27
+15.0,,32,19,16,13
+20.0,,17,10,8,7
+25.0,,9,5,4,3
+30.0,,5,3,2,2
+"""
+
+class TestRetrainWatcher:
+
+    @pytest.fixture
+    def workdir(self):
+        """Temporary directory with the data file and a model directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, 'data.csv').write_text(SAMPLE_CSV)
+            yield Path(temp_dir)
+
+    @pytest.fixture
+    def predictor(self, workdir):
+        """Predictor trained on the initial data file."""
+        predictor = FermentationPredictor(str(workdir / 'data.csv'), str(workdir / 'models'))
+        predictor.train_models()
+        return predictor
+
+    def _wait(self, watcher, timeout=300):
+        """Poll until the running retrain has finished, returning its record."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            record = watcher.poll()
+            if record is not None:
+                return record
+            time.sleep(0.05)
+        raise TimeoutError("Retrain did not finish")
+
+    def test_fingerprint_prefix_and_rows(self, workdir):
+        """Test the prefix digest detects appends and only appended rows are counted."""
+        path = str(workdir / 'data.csv')
+        before, _ = fingerprint(path)
+        with open(path, 'a') as f:
+            f.write("12.0,,50,30,25,20\n# comment\n,,,\n")
+
+        after, prefix = fingerprint(path, before.size)
+        assert after.digest != before.digest
+        assert prefix == before.digest
+        assert count_data_rows(path, before.size) == 1
+        assert count_data_rows(path, 0) == 17
+
+    def test_check_validation(self):
+        """Test the gate requires a time model and rejects large RMSE regressions."""
+        serving = {'time': {'Linear': {'rmse': 2.0}}}
+        candidate = {'performance': {'time': {'Linear': {'rmse': 2.2}}},
+                     'best_models': {'time': 'Linear'}}
+
+        assert check_validation(candidate, serving, {'time': 'Linear'})[0]
+        assert not check_validation(candidate, serving, {'time': 'Linear'},
+                                    max_rmse_increase=0.05)[0]
+        assert check_validation(candidate, {}, {})[0]
+        assert not check_validation({'performance': {}, 'best_models': {}}, {}, {})[0]
+        candidate['performance']['time']['Linear']['rmse'] = np.nan
+        assert not check_validation(candidate, {}, {})[0]
+
+        # Cross-validated RMSE is compared when present, not a zero in-sample RMSE
+        serving = {'time': {'GridInterpolation': {'rmse': 0.0, 'cv_rmse': 1.83}}}
+        candidate = {'performance': {'time': {'GridInterpolation': {'rmse': 0.1, 'cv_rmse': 1.65}}},
+                     'best_models': {'time': 'GridInterpolation'}}
+        assert check_validation(candidate, serving, {'time': 'GridInterpolation'})[0]
+        candidate['performance']['time']['GridInterpolation']['cv_rmse'] = 2.5
+        assert not check_validation(candidate, serving, {'time': 'GridInterpolation'})[0]
+
+    def test_retrain_published_in_background(self, workdir, predictor):
+        """Test an append is debounced, retrained in a worker process and swapped in."""
+        records = []
+        watcher = RetrainWatcher(predictor, debounce=0.0, on_retrain=records.append)
+        first = predictor.snapshot
+        assert watcher.poll() is None
+        assert not watcher.busy
+
+        with open(workdir / 'data.csv', 'a') as f:
+            f.write("12.0,,50,30,25,20\n")
+        watcher.poll()   # change seen
+        watcher.poll()   # settled: retrain starts
+        assert watcher.busy
+        assert predictor.snapshot is first
+
+        record = self._wait(watcher)
+        watcher.stop()
+        assert record['outcome'] == 'published', record['reason']
+        assert record['n_samples'] > 0
+        assert record['duration_s'] > 0
+        assert records == [record]
+        assert predictor.snapshot is not first
+        assert record['model_version'] == predictor.model_version
+
+        stats = watcher.stats()
+        assert stats['retrains'] == 1 and stats['published'] == 1
+        assert stats['last_retrain'] is record
+        assert not list(workdir.glob('retrain-*'))
+        assert (workdir / 'models' / 'compact_models.arena').exists()
+        assert predictor.predict(temperature=12.0, yeast_concentration=0.013)['predicted_value'] > 0
+
+    def test_duplicate_observations_published(self, workdir, predictor):
+        """Test appending a repeat measurement of an existing setting passes the gate."""
+        watcher = RetrainWatcher(predictor, debounce=0.0, use_processes=False)
+        first = predictor.snapshot
+        watcher.poll()
+        with open(workdir / 'data.csv', 'a') as f:
+            f.write("20.0,,18,11,9,8\n")
+        watcher.poll()
+        watcher.poll()
+
+        record = self._wait(watcher)
+        watcher.stop()
+        assert record['outcome'] == 'published', record['reason']
+        assert predictor.snapshot is not first
+
+    def test_touch_and_empty_append_skip_retrain(self, workdir, predictor):
+        """Test touching the file or appending no data rows does not retrain."""
+        watcher = RetrainWatcher(predictor, debounce=0.0, use_processes=False)
+        path = workdir / 'data.csv'
+        watcher.poll()
+
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        watcher.poll()
+        watcher.poll()
+        with open(path, 'a') as f:
+            f.write("\n,,,\n")
+        watcher.poll()
+        watcher.poll()
+
+        assert not watcher.busy
+        assert watcher.stats()['retrains'] == 0
+        assert watcher.stats()['skipped'] == 1
+
+    def test_failed_validation_keeps_models(self, workdir, predictor):
+        """Test a retrain that fails the gate is not published and not retried."""
+        watcher = RetrainWatcher(predictor, debounce=0.0, max_rmse_increase=-1.0,
+                                 use_processes=False)
+        first = predictor.snapshot
+        watcher.poll()
+        with open(workdir / 'data.csv', 'a') as f:
+            f.write("12.0,,50,30,25,20\n")
+        watcher.poll()
+        watcher.poll()
+
+        record = self._wait(watcher)
+        assert record['outcome'] == 'rejected'
+        assert predictor.snapshot is first
+
+        watcher.poll()
+        assert not watcher.busy
+        assert watcher.stats()['rejected'] == 1
+        watcher.stop()